@@ -3,7 +3,7 @@ from PyInstaller.utils.hooks import collect_all
 
 datas = [('templates', 'templates'), ('static', 'static'), ('current_day.json', '.'), ('Logo.jpg', '.')]
 binaries = []
-hiddenimports = []
+hiddenimports = ['waitress']
 tmp_ret = collect_all('nextcord')
 datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
 tmp_ret = collect_all('reportlab')
@@ -1,21 +1,29 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file, session
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file, session, Response
 from datetime import datetime, timezone
+import hashlib
 import json
 import os
+import threading
+import time
 from utils.database import (
-    load_services, save_service, update_service, delete_service, 
-    save_logs, db, get_pc_sessions, get_service_logs, get_expense_logs,
+    load_services, get_service, services_count, save_service, update_service, delete_service, 
     update_pc_session, update_service_log, update_expense_log,
     delete_pc_session, delete_service_log, delete_expense_log,
-    save_pc_session, save_service_log, save_expense_log,
-    create_user, verify_user_credentials, get_user_by_username,
-    users_count, set_user_role, update_user_password, update_user_fields, rename_user, delete_user, reset_all_users
+    get_records_page, get_record, get_day_logs, close_day, month_bounds, report_range, rollup_report, reconcile,
+    create_user, verify_user_credentials, get_user_by_username, authenticate, get_user_role, list_users,
+    set_user_role, update_user_password, update_user_fields, rename_user, delete_user, reset_all_users
 )
-from utils.utils import load_data, save_data, calc_totals, cost_to_time, get_current_period
+from utils.utils import load_data, cost_to_time, get_current_period
+from utils.day_store import get_store
+from utils import search, change_bus, jobs, reports
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this in production
 
+# Indexes and search terms, then the background workers for day close / reports (see utils.jobs)
+reconcile()
+jobs.start()
+
 # ==================== AUTH HELPERS ====================
 def login_required(view_func):
     def wrapper(*args, **kwargs):
@@ -29,6 +37,12 @@ def login_required(view_func):
 def admin_required(view_func):
     def wrapper(*args, **kwargs):
         user = session.get('user')
+        if user:
+            # Pick up role changes made since login (cached lookup)
+            role = get_user_role(user.get('username')) or user.get('role')
+            if role != user.get('role'):
+                user = dict(user, role=role)
+                session['user'] = user
         if not user or user.get('role') not in ['admin', 'owner']:
             flash('Admin access required', 'error')
             return redirect(url_for('dashboard'))
@@ -47,16 +61,9 @@ def login():
     if request.method == 'POST':
         username = request.form.get('username', '').strip()
         password = request.form.get('password', '')
-        if verify_user_credentials(username, password):
-            user_doc = get_user_by_username(username) or {"username": username, "role": "user"}
-            # If there is exactly one user in the system and no owner exists, assign this user as owner
-            try:
-                no_owner_exists = db.cyber.users.count_documents({"role": "owner"}) == 0
-            except Exception:
-                no_owner_exists = True
-            if users_count() == 1 and no_owner_exists and user_doc.get('role') != 'owner':
-                set_user_role(username, 'owner')
-                user_doc['role'] = 'owner'
+        # One query; the only user is promoted to owner while no owner exists
+        user_doc = authenticate(username, password)
+        if user_doc:
             session['user'] = {"username": user_doc.get('username'), "role": user_doc.get('role', 'user')}
             flash('Logged in successfully', 'success')
             next_url = request.args.get('next') or url_for('dashboard')
@@ -156,7 +163,7 @@ def admin_users():
             session.pop('user', None)
             flash('All users have been reset' if ok else 'Failed to reset users', 'success' if ok else 'error')
     # List users
-    users = list(db.cyber.users.find({}, {"_id": 0, "password_hash": 0}).sort("username", 1))
+    users = list_users()
     return render_template('admin_users.html', users=users)
 
 # ==================== ADMIN: USER DETAILS (WORKERS) ====================
@@ -208,33 +215,28 @@ def admin_user_detail(username):
 @login_required
 def dashboard():
     """Main dashboard showing summary and quick actions"""
-    data = load_data()
-    services = load_services()
+    store = get_store()
     
-    # Calculate totals
-    pcs_total, services_total, expenses_total, total_all = calc_totals(data)
+    # Running totals kept by the day store
+    totals = store.totals()
     
     # Recent activities (last 5 of each type)
     user = session.get('user') or {}
-    if user.get('role') == 'admin':
-        recent_pcs = data.get('pcs', [])[-5:]
-        recent_services = data.get('services', [])[-5:]
-        recent_expenses = data.get('expenses', [])[-5:]
-    else:
-        username = user.get('username')
-        recent_pcs = [r for r in data.get('pcs', []) if r.get('staff') == username][-5:]
-        recent_services = [r for r in data.get('services', []) if r.get('staff') == username][-5:]
-        recent_expenses = [r for r in data.get('expenses', []) if r.get('staff') == username][-5:]
+    staff = None if user.get('role') == 'admin' else user.get('username')
+    recent_pcs = store.recent('pcs', 5, staff=staff)
+    recent_services = store.recent('services', 5, staff=staff)
+    recent_expenses = store.recent('expenses', 5, staff=staff)
     
     return render_template('dashboard.html', 
-                         pcs_total=pcs_total,
-                         services_total=services_total,
-                         expenses_total=expenses_total,
-                         total_all=total_all,
+                         pcs_total=totals['pcs'],
+                         services_total=totals['services'],
+                         expenses_total=totals['expenses'],
+                         total_all=totals['all'],
                          recent_pcs=recent_pcs,
                          recent_services=recent_services,
                          recent_expenses=recent_expenses,
-                         services_count=len(services))
+                         services_count=services_count(),
+                         job_id=request.args.get('job'))
 
 @app.route('/pc-logging')
 @login_required
@@ -262,7 +264,7 @@ def log_pc():
         
         # Log each selected PC
         import uuid
-        data = load_data()
+        store = get_store()
         today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
         for pc in pc_numbers:
             session_id = str(uuid.uuid4())
@@ -276,18 +278,7 @@ def log_pc():
             }
             if notes:
                 session_data['notes'] = notes
-            data["pcs"].append(session_data)
-        
-        # Update totals
-        pcs_total, services_total, expenses_total, total_all = calc_totals(data)
-        data["totals"] = {
-            "pcs": pcs_total,
-            "services": services_total,
-            "expenses": expenses_total,
-            "all": total_all
-        }
-        
-        save_data(data)
+            store.add("pcs", session_data)
         
         session_time = cost_to_time(cost)
         if len(pc_numbers) == 1:
@@ -354,12 +345,7 @@ def add_service():
 def edit_service_form(service_name):
     """Show edit form for a specific service"""
     try:
-        services_list = load_services()
-        service = None
-        for s in services_list:
-            if s['name'] == service_name:
-                service = s
-                break
+        service = get_service(service_name)
         
         if not service:
             flash('Service not found', 'error')
@@ -379,12 +365,7 @@ def update_service_route(service_name):
         
         if action == 'toggle':
             # Toggle availability
-            services_list = load_services()
-            current_service = None
-            for service in services_list:
-                if service['name'] == service_name:
-                    current_service = service
-                    break
+            current_service = get_service(service_name)
             
             if current_service:
                 new_availability = not current_service['available']
@@ -473,12 +454,7 @@ def log_service():
             return redirect(url_for('service_logging'))
         
         # Get service details
-        services_list = load_services()
-        selected_service = None
-        for service in services_list:
-            if service['name'] == service_name:
-                selected_service = service
-                break
+        selected_service = get_service(service_name)
         
         if not selected_service:
             flash('Service not found', 'error')
@@ -495,10 +471,9 @@ def log_service():
         log_id = str(uuid.uuid4())
         
         # Log the service to JSON only
-        data = load_data()
         today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
         
-        data["services"].append({
+        get_store().add("services", {
             "log_id": log_id,
             "service": service_name,
             "amount": cost,
@@ -507,17 +482,6 @@ def log_service():
             "period": get_current_period()
         })
         
-        # Update totals
-        pcs_total, services_total, expenses_total, total_all = calc_totals(data)
-        data["totals"] = {
-            "pcs": pcs_total,
-            "services": services_total,
-            "expenses": expenses_total,
-            "all": total_all
-        }
-        
-        save_data(data)
-        
         flash(f'Service "{service_name}" logged successfully! Cost: {cost} EGP', 'success')
         
     except ValueError:
@@ -557,10 +521,9 @@ def log_expense():
         log_id = str(uuid.uuid4())
         
         # Log the expense to JSON only
-        data = load_data()
         today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
         
-        data["expenses"].append({
+        get_store().add("expenses", {
             "log_id": log_id,
             "name": expense_name,
             "amount": cost,
@@ -569,17 +532,6 @@ def log_expense():
             "period": get_current_period()
         })
         
-        # Update totals
-        pcs_total, services_total, expenses_total, total_all = calc_totals(data)
-        data["totals"] = {
-            "pcs": pcs_total,
-            "services": services_total,
-            "expenses": expenses_total,
-            "all": total_all
-        }
-        
-        save_data(data)
-        
         flash(f'Expense "{expense_name}" logged successfully! Cost: {cost} EGP', 'success')
         
     except ValueError:
@@ -592,124 +544,87 @@ def log_expense():
 @app.route('/history')
 @login_required
 def history():
-    """View historical logs from database - current month only"""
+    """View historical logs from database, one month at a time (?month=YYYY-MM, default current)"""
+    now = datetime.now()
     try:
-        from datetime import datetime
-        
-        # Get current month and year
-        now = datetime.now()
-        current_month = now.month
-        current_year = now.year
-        
-        # Create date range for current month
-        start_date = f"{current_year}-{current_month:02d}-01"
-        end_date = f"{current_year}-{current_month:02d}-31"
-        
-        # Get logs from database filtered by current month
-        logs = list(db.cyber.logs.find({
-            "date": {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        }, {"_id": 0}).sort("date", -1))
-        
-        # Ensure all logs have required fields with defaults
-        for log in logs:
-            # Ensure expenses field exists
-            if 'expenses' not in log:
-                log['expenses'] = []
-            
-            # Ensure totals has all required fields
-            if 'totals' not in log:
-                log['totals'] = {}
-            
-            # Set default values for missing totals
-            if 'expenses' not in log['totals']:
-                log['totals']['expenses'] = 0
-            if 'pcs' not in log['totals']:
-                log['totals']['pcs'] = 0
-            if 'services' not in log['totals']:
-                log['totals']['services'] = 0
-            if 'all' not in log['totals']:
-                log['totals']['all'] = log['totals']['pcs'] + log['totals']['services'] - log['totals']['expenses']
-        
-        return render_template('history.html', logs=logs)
+        year, month = (int(part) for part in request.args.get('month', '').split('-'))
+        if not 1 <= month <= 12:
+            raise ValueError
+    except ValueError:
+        year, month = now.year, now.month
+    start_date, end_date = month_bounds(year, month)
+    prev_month = f"{year - 1}-12" if month == 1 else f"{year}-{month - 1:02d}"
+    next_month = f"{year + 1}-01" if month == 12 else f"{year}-{month + 1:02d}"
+    try:
+        # Get logs from database filtered by month (totals filled in server-side)
+        logs = get_day_logs(start_date, end_date)
     except Exception as e:
         flash(f'Error loading history: {str(e)}', 'error')
-        return render_template('history.html', logs=[])
+        logs = []
+    return render_template('history.html', logs=logs, month=start_date[:7],
+                           month_label=datetime(year, month, 1).strftime('%B %Y'),
+                           prev_month=prev_month, next_month=next_month)
+
+def _report_args():
+    period = request.args.get('period', 'month')
+    return report_range(period, ref=request.args.get('date') or None,
+                        date_from=request.args.get('from'), date_to=request.args.get('to'))
+
+@app.route('/api/reports')
+@login_required
+def api_reports():
+    """Consolidated report from the rollups: ?period=day|week|month|year&date=YYYY-MM-DD
+    or ?period=range&from=YYYY-MM-DD&to=YYYY-MM-DD"""
+    try:
+        date_from, date_to = _report_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(rollup_report(date_from, date_to))
+
+@app.route('/reports/pdf')
+@login_required
+def report_pdf():
+    """Same parameters as /api/reports, rendered as a PDF"""
+    try:
+        date_from, date_to = _report_args()
+    except ValueError as e:
+        flash(f'Invalid report range: {str(e)}', 'error')
+        return redirect(url_for('history'))
+    filename = reports.generate_range_pdf_report(rollup_report(date_from, date_to))
+    if not filename:
+        flash('Error generating the report PDF', 'error')
+        return redirect(url_for('history'))
+    return send_file(filename, as_attachment=True)
 
 @app.route('/save-logs', methods=['POST'])
 @login_required
 def save_logs_route():
-    """Save current day logs to database and reset"""
+    """Reset the current day and archive it (records, daily log, PDF) in the background"""
     try:
-        # Get current day data
-        data = load_data()
-        
-        # Move records from JSON to MongoDB
-        for pc_record in data.get('pcs', []):
-            mongo_data = {
-                "session_id": pc_record.get('session_id'),
-                "pc": pc_record.get('pc'),
-                "amount": pc_record.get('amount'),
-                "staff": pc_record.get('staff'),
-                "time": pc_record.get('time'),
-                "notes": pc_record.get('notes'),
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "timestamp": datetime.now()
-            }
-            save_pc_session(mongo_data)
-        
-        for service_record in data.get('services', []):
-            mongo_data = {
-                "log_id": service_record.get('log_id'),
-                "service": service_record.get('service'),
-                "amount": service_record.get('amount'),
-                "staff": service_record.get('staff'),
-                "time": service_record.get('time'),
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "timestamp": datetime.now()
-            }
-            save_service_log(mongo_data)
-        
-        for expense_record in data.get('expenses', []):
-            mongo_data = {
-                "log_id": expense_record.get('log_id'),
-                "name": expense_record.get('name'),
-                "amount": expense_record.get('amount'),
-                "staff": expense_record.get('staff'),
-                "time": expense_record.get('time'),
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "timestamp": datetime.now()
-            }
-            save_expense_log(mongo_data)
-        
-        # Save to logs collection and generate PDF
-        save_logs()
-        
-        flash('Daily logs saved and archived successfully! PDF report generated.', 'success')
+        job_id = close_day()
+        flash('Day closed. Archiving and the PDF report continue in the background.', 'success')
+        return redirect(url_for('dashboard', job=job_id))
     except Exception as e:
         flash(f'Error saving logs: {str(e)}', 'error')
     
     return redirect(url_for('dashboard'))
 
+@app.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """Status and progress of a background job"""
+    job = jobs.public(jobs.get(job_id))
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
 @app.route('/download-pdf/<date>')
 @login_required
 def download_pdf(date):
     """Download PDF report for a specific date"""
     try:
-        base_dir = None
-        try:
-            import sys
-            if getattr(sys, 'frozen', False):
-                base_dir = os.path.dirname(sys.executable)
-            else:
-                base_dir = os.path.abspath(os.path.dirname(__file__))
-        except Exception:
-            base_dir = os.getcwd()
-
-        reports_dir = os.path.join(base_dir, 'reports')
-        filename = os.path.join(reports_dir, f"daily_report_{date}.pdf")
+        # Same folder the close-day job writes to (utils.reports)
+        filename = reports.daily_report_path(date)
         if os.path.exists(filename):
             return send_file(filename, as_attachment=True)
         else:
@@ -719,22 +634,187 @@ def download_pdf(date):
         flash(f'Error downloading PDF: {str(e)}', 'error')
         return redirect(url_for('history'))
 
+# Seconds between checks for writes made by the bot process, and between keep-alives
+STREAM_POLL_INTERVAL = 2
+STREAM_KEEPALIVE = 15
+# Each open stream holds a server worker thread, so streams end after this many
+# seconds; EventSource reconnects and resumes from Last-Event-ID (the day version)
+STREAM_LIFETIME = 300
+STREAM_RETRY_MS = 1000
+# Set by serve.py on shutdown so open streams end and free their worker threads
+stream_shutdown = threading.Event()
+
+def _summary_payload(totals, counts=None):
+    payload = {
+        'pcs_total': totals.get('pcs', 0),
+        'services_total': totals.get('services', 0),
+        'expenses_total': totals.get('expenses', 0),
+        'total_all': totals.get('all', 0),
+    }
+    if counts is not None:
+        payload.update({
+            'pcs_count': counts['pcs'],
+            'services_count': counts['services'],
+            'expenses_count': counts['expenses'],
+        })
+    return payload
+
+def _sse(event, data, event_id=None):
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def day_versioned(view_func):
+    """Conditional GET for JSON built from the current day: the ETag is the day store
+    version plus the user (some payloads are per staff) and the query arguments (e.g.
+    /api/changes?since=), so an unchanged day answers If-None-Match with 304 before
+    the view runs. If-Modified-Since is only used when no ETag is sent."""
+    def wrapper(*args, **kwargs):
+        store = get_store()
+        version = store.version
+        modified = store.last_modified()
+        username = (session.get('user') or {}).get('username', '')
+        etag = f"day-{version}-{username}"
+        if request.args:
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+            etag += "-" + hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+        # Last-Modified has one-second granularity: only send it once that second is
+        # over, so a write later in the same second cannot be answered with a 304
+        if modified and (datetime.now(timezone.utc) - modified).total_seconds() < 1:
+            modified = None
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        else:
+            since = request.if_modified_since
+            if since and since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            not_modified = bool(since and modified and modified.replace(microsecond=0) <= since)
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = app.make_response(view_func(*args, **kwargs))
+        response.set_etag(etag)
+        if modified:
+            response.last_modified = modified
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    wrapper.__name__ = view_func.__name__
+    return wrapper
+
 @app.route('/api/summary')
 @login_required
+@day_versioned
 def api_summary():
     """API endpoint for summary data (for dynamic updates)"""
-    data = load_data()
-    pcs_total, services_total, expenses_total, total_all = calc_totals(data)
+    aggs = get_store().aggregates()
+    totals = aggs['totals']
+    counts = aggs['counts']
     
-    return jsonify({
-        'pcs_total': pcs_total,
-        'services_total': services_total,
-        'expenses_total': expenses_total,
-        'total_all': total_all,
-        'pcs_count': len(data.get('pcs', [])),
-        'services_count': len(data.get('services', [])),
-        'expenses_count': len(data.get('expenses', []))
-    })
+    return jsonify(dict(_summary_payload(totals, counts), by_period=aggs['by_period'], version=aggs['version']))
+
+@app.route('/api/changes')
+@login_required
+@day_versioned
+def api_changes():
+    """Records added, edited or deleted today since ?since=<version> (latest state per record).
+    "reset": true means the client's version is too old and it should reload everything."""
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({'error': 'since must be an integer version'}), 400
+    user = session.get('user') or {}
+    staff = None if user.get('role') == 'admin' else user.get('username')
+    result = get_store().changes_since(since)
+    if staff:
+        result['changes'] = [c for c in result['changes']
+                             if c['op'] == 'delete' or (c['record'] or {}).get('staff') == staff]
+    return jsonify(result)
+
+@app.route('/api/stream')
+@login_required
+def api_stream():
+    """Server-Sent Events: "totals" after every change (with the delta), "record" for
+    each added/edited/deleted record the user may see, "reset" when the day was replaced.
+    The stream ends after STREAM_LIFETIME seconds and the browser reconnects."""
+    user = session.get('user') or {}
+    staff = None if user.get('role') == 'admin' else user.get('username')
+    store = get_store()
+    bus = change_bus.attach(store)
+
+    try:
+        resume_from = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        resume_from = None
+
+    def visible(record):
+        return not staff or (record or {}).get('staff') == staff
+
+    def generate():
+        last = bus.seq
+        aggs = store.aggregates()
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        if resume_from is not None:
+            # Reconnect: replay what changed while the client was away
+            missed = store.changes_since(resume_from)
+            if missed['reset']:
+                yield _sse('reset', {'version': missed['version']})
+            for change in missed['changes']:
+                # Deletes carry no record, only the id
+                if change['op'] == 'delete' or visible(change['record']):
+                    yield _sse('record', change)
+        yield _sse('totals', dict(_summary_payload(aggs['totals'], aggs['counts']), version=aggs['version'], delta={}),
+                   aggs['version'])
+        idle = 0.0
+        deadline = time.monotonic() + STREAM_LIFETIME
+        while not stream_shutdown.is_set() and time.monotonic() < deadline:
+            events, last = bus.wait(last, timeout=STREAM_POLL_INTERVAL)
+            if not events:
+                # Writes from the bot process reach the bus when the store catches up
+                store.refresh()
+                events, last = bus.wait(last, timeout=0)
+            if not events:
+                idle += STREAM_POLL_INTERVAL
+                if idle >= STREAM_KEEPALIVE:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+                continue
+            idle = 0.0
+            for event in events:
+                if event['op'] == 'reset':
+                    yield _sse('reset', {'version': event.get('version')})
+                else:
+                    record = event.get('record') or {}
+                    if visible(record):
+                        yield _sse('record', {'op': event['op'], 'kind': event['kind'], 'id': event['id'],
+                                              'record': record, 'version': event['version']})
+                yield _sse('totals', dict(_summary_payload(event.get('totals') or {}),
+                                          version=event.get('version'), delta=event.get('delta', {})),
+                           event.get('version'))
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/records/<record_type>')
+@login_required
+def api_records(record_type):
+    """Keyset-paginated archived records: ?cursor=&page_size=&date_from=&date_to=&staff="""
+    if record_type not in ('pc_session', 'service_log', 'expense_log'):
+        return jsonify({'error': 'Unknown record type'}), 404
+    try:
+        page_size = min(max(int(request.args.get('page_size', 25)), 1), 100)
+    except ValueError:
+        page_size = 25
+    staff = request.args.get('staff') or None
+    # Non-admin users only ever see their own records
+    user = session.get('user') or {}
+    if user.get('role') != 'admin':
+        staff = user.get('username')
+    page = get_records_page(record_type,
+                            page_size=page_size,
+                            cursor=request.args.get('cursor') or None,
+                            date_from=request.args.get('date_from') or None,
+                            date_to=request.args.get('date_to') or None,
+                            staff=staff)
+    return jsonify(page)
 
 # ==================== EDIT CURRENT DAY RECORDS ====================
 
@@ -743,12 +823,7 @@ def api_summary():
 def edit_current_pc_form(session_id):
     """Edit current day PC session form"""
     try:
-        data = load_data()
-        session = None
-        for s in data.get('pcs', []):
-            if s.get('session_id') == session_id:
-                session = s
-                break
+        session = get_store().get('pcs', session_id)
         
         if not session:
             flash('PC session not found', 'error')
@@ -774,20 +849,12 @@ def update_current_pc_route(session_id):
             return redirect(url_for('edit_current_pc_form', session_id=session_id))
         
         # Update in JSON file
-        data = load_data()
-        for i, session in enumerate(data.get('pcs', [])):
-            if session.get('session_id') == session_id:
-                data['pcs'][i].update({
-                    "pc": pc,
-                    "amount": amount,
-                    "notes": notes,
-                    "staff": staff
-                })
-                break
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().update('pcs', session_id, {
+            "pc": pc,
+            "amount": amount,
+            "notes": notes,
+            "staff": staff
+        })
         
         flash(f'PC session updated successfully!', 'success')
         
@@ -803,12 +870,7 @@ def update_current_pc_route(session_id):
 def edit_current_service_form(log_id):
     """Edit current day service log form"""
     try:
-        data = load_data()
-        log = None
-        for l in data.get('services', []):
-            if l.get('log_id') == log_id:
-                log = l
-                break
+        log = get_store().get('services', log_id)
         
         if not log:
             flash('Service log not found', 'error')
@@ -833,19 +895,11 @@ def update_current_service_route(log_id):
             return redirect(url_for('edit_current_service_form', log_id=log_id))
         
         # Update in JSON file
-        data = load_data()
-        for i, log in enumerate(data.get('services', [])):
-            if log.get('log_id') == log_id:
-                data['services'][i].update({
-                    "service": service,
-                    "amount": amount,
-                    "staff": staff
-                })
-                break
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().update('services', log_id, {
+            "service": service,
+            "amount": amount,
+            "staff": staff
+        })
         
         flash(f'Service log updated successfully!', 'success')
         
@@ -861,12 +915,7 @@ def update_current_service_route(log_id):
 def edit_current_expense_form(log_id):
     """Edit current day expense log form"""
     try:
-        data = load_data()
-        log = None
-        for l in data.get('expenses', []):
-            if l.get('log_id') == log_id:
-                log = l
-                break
+        log = get_store().get('expenses', log_id)
         
         if not log:
             flash('Expense log not found', 'error')
@@ -891,19 +940,11 @@ def update_current_expense_route(log_id):
             return redirect(url_for('edit_current_expense_form', log_id=log_id))
         
         # Update in JSON file
-        data = load_data()
-        for i, log in enumerate(data.get('expenses', [])):
-            if log.get('log_id') == log_id:
-                data['expenses'][i].update({
-                    "name": name,
-                    "amount": amount,
-                    "staff": staff
-                })
-                break
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().update('expenses', log_id, {
+            "name": name,
+            "amount": amount,
+            "staff": staff
+        })
         
         flash(f'Expense log updated successfully!', 'success')
         
@@ -921,12 +962,7 @@ def update_current_expense_route(log_id):
 def delete_current_pc_route(session_id):
     """Delete current day PC session"""
     try:
-        data = load_data()
-        data['pcs'] = [s for s in data.get('pcs', []) if s.get('session_id') != session_id]
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().delete('pcs', session_id)
         
         flash('PC session deleted successfully!', 'success')
         
@@ -940,12 +976,7 @@ def delete_current_pc_route(session_id):
 def delete_current_service_route(log_id):
     """Delete current day service log"""
     try:
-        data = load_data()
-        data['services'] = [s for s in data.get('services', []) if s.get('log_id') != log_id]
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().delete('services', log_id)
         
         flash('Service log deleted successfully!', 'success')
         
@@ -959,12 +990,7 @@ def delete_current_service_route(log_id):
 def delete_current_expense_route(log_id):
     """Delete current day expense log"""
     try:
-        data = load_data()
-        data['expenses'] = [e for e in data.get('expenses', []) if e.get('log_id') != log_id]
-        
-        # Recalculate totals
-        data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-        save_data(data)
+        get_store().delete('expenses', log_id)
         
         flash('Expense log deleted successfully!', 'success')
         
@@ -979,10 +1005,12 @@ def delete_current_expense_route(log_id):
 @login_required
 def edit_records():
     """Main edit records page - ONLY today's records from current_day.json"""
-    data = load_data()
+    store = get_store()
+    data = store.snapshot()
     pc_records = data.get('pcs', [])
     service_records = data.get('services', [])
     expense_records = data.get('expenses', [])
+    totals = data['totals']
     
     # Restrict visibility for non-admin users
     user = session.get('user') or {}
@@ -991,11 +1019,12 @@ def edit_records():
         pc_records = [r for r in pc_records if r.get('staff') == username]
         service_records = [r for r in service_records if r.get('staff') == username]
         expense_records = [r for r in expense_records if r.get('staff') == username]
+        totals = store.aggregates()['by_staff'].get(username, {'pcs': 0, 'services': 0, 'expenses': 0, 'all': 0})
     
-    pc_total = sum(record.get('amount', 0) for record in pc_records)
-    service_total = sum(record.get('amount', 0) for record in service_records)
-    expense_total = sum(record.get('amount', 0) for record in expense_records)
-    net_total = pc_total + service_total - expense_total
+    pc_total = totals['pcs']
+    service_total = totals['services']
+    expense_total = totals['expenses']
+    net_total = totals['all']
     
     return render_template('edit_records.html',
                          pc_records=pc_records,
@@ -1015,12 +1044,7 @@ def edit_pc_session_form(session_id):
     """Edit PC session form"""
     try:
         # Get the specific PC session
-        pc_sessions = get_pc_sessions()
-        session = None
-        for s in pc_sessions:
-            if s.get('session_id') == session_id:
-                session = s
-                break
+        session = get_record('pc_session', session_id)
         
         if not session:
             flash('PC session not found', 'error')
@@ -1056,15 +1080,7 @@ def update_pc_session_route(session_id):
         
         if success:
             # Update in JSON file
-            data = load_data()
-            for i, session in enumerate(data.get('pcs', [])):
-                if session.get('session_id') == session_id:
-                    data['pcs'][i].update(update_data)
-                    break
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().update('pcs', session_id, update_data)
             
             flash(f'PC session updated successfully!', 'success')
         else:
@@ -1083,12 +1099,7 @@ def edit_service_log_form(log_id):
     """Edit service log form"""
     try:
         # Get the specific service log
-        service_logs = get_service_logs()
-        log = None
-        for l in service_logs:
-            if l.get('log_id') == log_id:
-                log = l
-                break
+        log = get_record('service_log', log_id)
         
         if not log:
             flash('Service log not found', 'error')
@@ -1122,15 +1133,7 @@ def update_service_log_route(log_id):
         
         if success:
             # Update in JSON file
-            data = load_data()
-            for i, log in enumerate(data.get('services', [])):
-                if log.get('log_id') == log_id:
-                    data['services'][i].update(update_data)
-                    break
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().update('services', log_id, update_data)
             
             flash(f'Service log updated successfully!', 'success')
         else:
@@ -1149,12 +1152,7 @@ def edit_expense_log_form(log_id):
     """Edit expense log form"""
     try:
         # Get the specific expense log
-        expense_logs = get_expense_logs()
-        log = None
-        for l in expense_logs:
-            if l.get('log_id') == log_id:
-                log = l
-                break
+        log = get_record('expense_log', log_id)
         
         if not log:
             flash('Expense log not found', 'error')
@@ -1188,15 +1186,7 @@ def update_expense_log_route(log_id):
         
         if success:
             # Update in JSON file
-            data = load_data()
-            for i, log in enumerate(data.get('expenses', [])):
-                if log.get('log_id') == log_id:
-                    data['expenses'][i].update(update_data)
-                    break
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().update('expenses', log_id, update_data)
             
             flash(f'Expense log updated successfully!', 'success')
         else:
@@ -1220,12 +1210,7 @@ def delete_pc_session_route(session_id):
         
         if success:
             # Remove from JSON file
-            data = load_data()
-            data['pcs'] = [s for s in data.get('pcs', []) if s.get('session_id') != session_id]
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().delete('pcs', session_id)
             
             flash('PC session deleted successfully!', 'success')
         else:
@@ -1245,12 +1230,7 @@ def delete_service_log_route(log_id):
         
         if success:
             # Remove from JSON file
-            data = load_data()
-            data['services'] = [s for s in data.get('services', []) if s.get('log_id') != log_id]
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().delete('services', log_id)
             
             flash('Service log deleted successfully!', 'success')
         else:
@@ -1270,12 +1250,7 @@ def delete_expense_log_route(log_id):
         
         if success:
             # Remove from JSON file
-            data = load_data()
-            data['expenses'] = [e for e in data.get('expenses', []) if e.get('log_id') != log_id]
-            
-            # Recalculate totals
-            data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            get_store().delete('expenses', log_id)
             
             flash('Expense log deleted successfully!', 'success')
         else:
@@ -1288,73 +1263,34 @@ def delete_expense_log_route(log_id):
 
 # ==================== SEARCH FUNCTIONALITY ====================
 
+SEARCH_PAGE_SIZE = 30
+
 @app.route('/search-records')
 @login_required
 def search_records():
     """Search records page"""
     query = request.args.get('q', '')
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+    except ValueError:
+        page = 1
     results = {'pcs': [], 'services': [], 'expenses': []}
+    has_more = False
+    truncated = False
     
     if query:
-        # Get current day data from JSON file
-        data = load_data()
-        current_pcs = data.get('pcs', [])
-        current_services = data.get('services', [])
-        current_expenses = data.get('expenses', [])
-        
-        # Get all records from MongoDB
-        mongo_pc_records = get_pc_sessions()
-        mongo_service_records = get_service_logs()
-        mongo_expense_records = get_expense_logs()
-        
-        # Combine current day records with MongoDB records, avoiding duplicates
-        pc_records = current_pcs.copy()
-        service_records = current_services.copy()
-        expense_records = current_expenses.copy()
-        
-        # Add MongoDB records that aren't already in current day
-        current_pc_ids = {record.get('session_id') for record in current_pcs if record.get('session_id')}
-        current_service_ids = {record.get('log_id') for record in current_services if record.get('log_id')}
-        current_expense_ids = {record.get('log_id') for record in current_expenses if record.get('log_id')}
-        
-        for record in mongo_pc_records:
-            if record.get('session_id') not in current_pc_ids:
-                pc_records.append(record)
-        
-        for record in mongo_service_records:
-            if record.get('log_id') not in current_service_ids:
-                service_records.append(record)
-        
-        for record in mongo_expense_records:
-            if record.get('log_id') not in current_expense_ids:
-                expense_records.append(record)
-        
         # Restrict visibility for non-admin users
         user = session.get('user') or {}
-        if user.get('role') != 'admin':
-            username = user.get('username')
-            pc_records = [r for r in pc_records if r.get('staff') == username]
-            service_records = [r for r in service_records if r.get('staff') == username]
-            expense_records = [r for r in expense_records if r.get('staff') == username]
-        
-        search_lower = query.lower()
-        
-        results['pcs'] = [r for r in pc_records if 
-                         search_lower in r.get('pc', '').lower() or 
-                         search_lower in r.get('staff', '').lower() or
-                         search_lower in str(r.get('amount', 0))]
-        
-        results['services'] = [r for r in service_records if 
-                             search_lower in r.get('service', '').lower() or 
-                             search_lower in r.get('staff', '').lower() or
-                             search_lower in str(r.get('amount', 0))]
-        
-        results['expenses'] = [r for r in expense_records if 
-                             search_lower in r.get('name', '').lower() or 
-                             search_lower in r.get('staff', '').lower() or
-                             search_lower in str(r.get('amount', 0))]
+        staff = None if user.get('role') == 'admin' else user.get('username')
+        
+        # Indexed search over today's ledger and the archived collections
+        found = search.search(query, limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE, staff=staff)
+        results = {'pcs': found['pcs'], 'services': found['services'], 'expenses': found['expenses']}
+        has_more = found['has_more']
+        truncated = found['truncated']
     
-    return render_template('search_records.html', query=query, results=results)
+    return render_template('search_records.html', query=query, results=results, page=page, has_more=has_more,
+                           truncated=truncated, max_candidates=search.MAX_CANDIDATES)
 
 if __name__ == '__main__':
     try:
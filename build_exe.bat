@@ -35,7 +35,7 @@ REM Ensure pywebview is installed
 pip show pywebview >nul 2>&1 || pip install pywebview --quiet
 
 REM Build one-file windowed exe using the GUI launcher
-pyinstaller --noconfirm --clean %ICON% %DATAS% --name CyberCafe --collect-all nextcord --collect-all reportlab --collect-all dotenv --collect-all webview --onefile --windowed gui_launcher.py
+pyinstaller --noconfirm --clean %ICON% %DATAS% --name CyberCafe --collect-all nextcord --collect-all reportlab --collect-all dotenv --collect-all webview --collect-all waitress --onefile --windowed gui_launcher.py
 
 if errorlevel 1 (
     echo Build failed.
@@ -1,8 +1,7 @@
-import json, os, nextcord
 from nextcord.ext import commands
-from nextcord import Color, Embed, InteractionResponded, slash_command, Interaction
+from nextcord import Color, Embed, slash_command, Interaction
 from nextcord import SlashOption
-import utils.database as db
+from utils import async_db
 
 class AddService(commands.Cog):
     def __init__(self, client):
@@ -35,7 +34,7 @@ class AddService(commands.Cog):
         )
     ):
         await interaction.response.defer(ephemeral=True)
-        services = db.load_services()
+        services = await async_db.db.load_services()
 
         for service in services:
             if service_name == service['name']:
@@ -51,7 +50,7 @@ class AddService(commands.Cog):
             "available": True if availability == "true" else False,
             "custom_cost": True if is_custom == 'true' else False
         }
-        db.save_service(service_doc)
+        await async_db.db.save_service(service_doc)
 
         embed = Embed(
             title = "✅ Service added",
@@ -1,6 +1,6 @@
 from nextcord.ext import commands
 from nextcord import Interaction,Embed, SlashOption,slash_command
-import utils.database as db
+from utils import async_db, autocomplete
 
 class DeleteService(commands.Cog):
      def __init__(self,client):
@@ -16,7 +16,7 @@ class DeleteService(commands.Cog):
      )
      ):
           await interaction.response.defer(ephemeral=True)
-          db.delete_service(service_name)
+          await async_db.db.delete_service(service_name)
           embed = Embed(
                title="🗑️ Service Deleted",
                description=f"Service **{service_name}** is deleted",
@@ -26,10 +26,7 @@ class DeleteService(commands.Cog):
      @delete.on_autocomplete("service_name")
      async def service_name_autocomplete(self, interaction: Interaction, string: str):
         try:
-            cursor = db.db.cyber.services.find({}, {"_id": 0, "name": 1})
-            names = [doc.get("name") for doc in cursor if doc.get("name")]
-            query = (string or "").lower()
-            filtered = [n for n in names if query in n.lower()][:25]
+            filtered = await async_db.run(autocomplete.suggest, "services", string)
             await interaction.response.send_autocomplete(filtered)
         except Exception:
             await interaction.response.send_autocomplete([])
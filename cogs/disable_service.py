@@ -1,7 +1,7 @@
 import json, os, nextcord
 from nextcord.ext import commands
 from nextcord import Color, Embed, SlashOption, slash_command, Interaction
-import utils.database as db
+from utils import async_db, autocomplete
 
 class DisableService(commands.Cog):
     def __init__(self, client):
@@ -17,7 +17,7 @@ class DisableService(commands.Cog):
     )
     ):
         await interaction.response.defer(ephemeral=True)
-        db.update_service({"name": service_name, "available":False})
+        await async_db.db.update_service({"name": service_name, "available":False})
         embed = Embed(
             title="❌ Service Disabled",
             description=f"Service **{service_name}** is now unavailable",
@@ -28,10 +28,7 @@ class DisableService(commands.Cog):
     @disable_service.on_autocomplete("service_name")
     async def service_name_autocomplete(self, interaction: Interaction, string: str):
         try:
-            cursor = db.db.cyber.services.find({}, {"_id": 0, "name": 1})
-            names = [doc.get("name") for doc in cursor if doc.get("name")]
-            query = (string or "").lower()
-            filtered = [n for n in names if query in n.lower()][:25]
+            filtered = await async_db.run(autocomplete.suggest, "services", string)
             await interaction.response.send_autocomplete(filtered)
         except Exception:
             await interaction.response.send_autocomplete([])
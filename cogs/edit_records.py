@@ -2,7 +2,7 @@ from nextcord.ext import commands
 from nextcord import Embed, Interaction, slash_command, SlashOption, Color
 from nextcord.ui import Select, View, Modal, TextInput, Button, ButtonStyle
 from nextcord import SelectOption, TextInputStyle
-import utils.database as db
+from utils import search, async_db, autocomplete
 from datetime import datetime
 import nextcord
 
@@ -73,7 +73,7 @@ class EditRecordModal(Modal):
                     "amount": amount,
                     "notes": notes
                 }
-                success = db.update_pc_session(self.record_id, update_data)
+                success = await async_db.db.update_pc_session(self.record_id, update_data)
                 
             elif self.record_type == "service_log":
                 service = self.children[0].value
@@ -83,7 +83,7 @@ class EditRecordModal(Modal):
                     "service": service,
                     "amount": amount
                 }
-                success = db.update_service_log(self.record_id, update_data)
+                success = await async_db.db.update_service_log(self.record_id, update_data)
                 
             elif self.record_type == "expense_log":
                 name = self.children[0].value
@@ -93,7 +93,7 @@ class EditRecordModal(Modal):
                     "name": name,
                     "amount": amount
                 }
-                success = db.update_expense_log(self.record_id, update_data)
+                success = await async_db.db.update_expense_log(self.record_id, update_data)
             
             if success:
                 embed = Embed(
@@ -173,10 +173,27 @@ class RecordSelector(Select):
         except (ValueError, IndexError) as e:
             await interaction.response.send_message("❌ Invalid selection.", ephemeral=True)
 
+class NextPageButton(Button):
+    """Swaps the selector for the next page of records using the continuation cursor"""
+    def __init__(self, view_cls, record_type, cursor):
+        super().__init__(label="Older records", style=ButtonStyle.secondary, emoji="➡️")
+        self.view_cls = view_cls
+        self.record_type = record_type
+        self.cursor = cursor
+
+    async def callback(self, interaction: Interaction):
+        page = await async_db.db.get_records_page(self.record_type, cursor=self.cursor)
+        if not page["records"]:
+            await interaction.response.send_message("No older records.", ephemeral=True)
+            return
+        await interaction.response.edit_message(view=self.view_cls(page["records"], self.record_type, page["next_cursor"]))
+
 class RecordSelectorView(View):
-    def __init__(self, records, record_type):
+    def __init__(self, records, record_type, next_cursor=None):
         super().__init__(timeout=60)
         self.add_item(RecordSelector(records, record_type))
+        if next_cursor:
+            self.add_item(NextPageButton(RecordSelectorView, record_type, next_cursor))
 
 class UniversalEditView(View):
     def __init__(self):
@@ -186,7 +203,8 @@ class UniversalEditView(View):
     async def edit_pc_sessions(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_pc_sessions()
+        page = await async_db.db.get_records_page("pc_session")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No PC Sessions Found",
@@ -198,18 +216,19 @@ class UniversalEditView(View):
         
         embed = Embed(
             title="💻 Edit PC Sessions",
-            description=f"**Found {len(records)} PC sessions**\nSelect one to edit:",
+            description=f"**Showing the latest {len(records)} PC sessions**\nSelect one to edit:",
             color=Color.blue()
         )
         
-        view = RecordSelectorView(records, "pc_session")
+        view = RecordSelectorView(records, "pc_session", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛠️ Service Logs", style=ButtonStyle.orange, emoji="🛠️")
     async def edit_service_logs(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_service_logs()
+        page = await async_db.db.get_records_page("service_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Service Logs Found",
@@ -221,18 +240,19 @@ class UniversalEditView(View):
         
         embed = Embed(
             title="🛠️ Edit Service Logs",
-            description=f"**Found {len(records)} service logs**\nSelect one to edit:",
+            description=f"**Showing the latest {len(records)} service logs**\nSelect one to edit:",
             color=Color.orange()
         )
         
-        view = RecordSelectorView(records, "service_log")
+        view = RecordSelectorView(records, "service_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛒 Expense Logs", style=ButtonStyle.red, emoji="🛒")
     async def edit_expense_logs(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_expense_logs()
+        page = await async_db.db.get_records_page("expense_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Expense Logs Found",
@@ -244,11 +264,11 @@ class UniversalEditView(View):
         
         embed = Embed(
             title="🛒 Edit Expense Logs",
-            description=f"**Found {len(records)} expense logs**\nSelect one to edit:",
+            description=f"**Showing the latest {len(records)} expense logs**\nSelect one to edit:",
             color=Color.red()
         )
         
-        view = RecordSelectorView(records, "expense_log")
+        view = RecordSelectorView(records, "expense_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
 class AllRecordsView(View):
@@ -259,12 +279,9 @@ class AllRecordsView(View):
     async def edit_records(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        # Get all types of records
-        pc_records = db.get_pc_sessions()
-        service_records = db.get_service_logs()
-        expense_records = db.get_expense_logs()
-        
-        total_records = len(pc_records) + len(service_records) + len(expense_records)
+        # Get record counts for all types
+        totals = await async_db.db.record_totals()
+        total_records = totals["count"]
         
         if total_records == 0:
             embed = Embed(
@@ -278,9 +295,9 @@ class AllRecordsView(View):
         embed = Embed(
             title="📝 Edit Any Record",
             description=f"**Total Records Available:** {total_records}\n\n"
-                       f"💻 **PC Sessions:** {len(pc_records)}\n"
-                       f"🛠️ **Service Logs:** {len(service_records)}\n"
-                       f"🛒 **Expense Logs:** {len(expense_records)}\n\n"
+                       f"💻 **PC Sessions:** {totals['pc_session']['count']}\n"
+                       f"🛠️ **Service Logs:** {totals['service_log']['count']}\n"
+                       f"🛒 **Expense Logs:** {totals['expense_log']['count']}\n\n"
                        f"Choose what type of record you want to edit:",
             color=Color.blue()
         )
@@ -306,9 +323,9 @@ class AllRecordsView(View):
         await interaction.response.defer(ephemeral=True)
         
         # Get recent records (last 10 of each type)
-        pc_records = db.get_pc_sessions()[:10]
-        service_records = db.get_service_logs()[:10]
-        expense_records = db.get_expense_logs()[:10]
+        pc_records = (await async_db.db.get_records_page("pc_session", page_size=5))["records"]
+        service_records = (await async_db.db.get_records_page("service_log", page_size=5))["records"]
+        expense_records = (await async_db.db.get_records_page("expense_log", page_size=5))["records"]
         
         embed = Embed(
             title="📊 Recent Records Details",
@@ -347,7 +364,8 @@ class DeleteRecordsView(View):
     async def delete_pc_sessions(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_pc_sessions()
+        page = await async_db.db.get_records_page("pc_session")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No PC Sessions Found",
@@ -359,18 +377,19 @@ class DeleteRecordsView(View):
         
         embed = Embed(
             title="🗑️ Delete PC Sessions",
-            description=f"**Found {len(records)} PC sessions**\nSelect one to delete:",
+            description=f"**Showing the latest {len(records)} PC sessions**\nSelect one to delete:",
             color=Color.red()
         )
         
-        view = DeleteRecordSelectorView(records, "pc_session")
+        view = DeleteRecordSelectorView(records, "pc_session", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛠️ Delete Service Logs", style=ButtonStyle.danger, emoji="🛠️")
     async def delete_service_logs(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_service_logs()
+        page = await async_db.db.get_records_page("service_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Service Logs Found",
@@ -382,18 +401,19 @@ class DeleteRecordsView(View):
         
         embed = Embed(
             title="🗑️ Delete Service Logs",
-            description=f"**Found {len(records)} service logs**\nSelect one to delete:",
+            description=f"**Showing the latest {len(records)} service logs**\nSelect one to delete:",
             color=Color.red()
         )
         
-        view = DeleteRecordSelectorView(records, "service_log")
+        view = DeleteRecordSelectorView(records, "service_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛒 Delete Expense Logs", style=ButtonStyle.danger, emoji="🛒")
     async def delete_expense_logs(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_expense_logs()
+        page = await async_db.db.get_records_page("expense_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Expense Logs Found",
@@ -405,17 +425,19 @@ class DeleteRecordsView(View):
         
         embed = Embed(
             title="🗑️ Delete Expense Logs",
-            description=f"**Found {len(records)} expense logs**\nSelect one to delete:",
+            description=f"**Showing the latest {len(records)} expense logs**\nSelect one to delete:",
             color=Color.red()
         )
         
-        view = DeleteRecordSelectorView(records, "expense_log")
+        view = DeleteRecordSelectorView(records, "expense_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
 class DeleteRecordSelectorView(View):
-    def __init__(self, records, record_type):
+    def __init__(self, records, record_type, next_cursor=None):
         super().__init__(timeout=60)
         self.add_item(DeleteRecordSelector(records, record_type))
+        if next_cursor:
+            self.add_item(NextPageButton(DeleteRecordSelectorView, record_type, next_cursor))
 
 class DeleteRecordSelector(Select):
     def __init__(self, records, record_type):
@@ -463,11 +485,11 @@ class DeleteRecordSelector(Select):
             # Delete the record
             success = False
             if self.record_type == "pc_session":
-                success = db.delete_pc_session(record_id)
+                success = await async_db.db.delete_pc_session(record_id)
             elif self.record_type == "service_log":
-                success = db.delete_service_log(record_id)
+                success = await async_db.db.delete_service_log(record_id)
             elif self.record_type == "expense_log":
-                success = db.delete_expense_log(record_id)
+                success = await async_db.db.delete_expense_log(record_id)
             
             if success:
                 embed = Embed(
@@ -487,6 +509,9 @@ class DeleteRecordSelector(Select):
         except (ValueError, IndexError) as e:
             await interaction.response.send_message("❌ Invalid selection.", ephemeral=True)
 
+# Best matches returned to the search panel (selectors show up to 25 per type)
+SEARCH_LIMIT = 75
+
 class EditRecords(commands.Cog):
     def __init__(self, client):
         self.client = client
@@ -495,12 +520,9 @@ class EditRecords(commands.Cog):
     async def edit_any_record(self, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        # Get all types of records
-        pc_records = db.get_pc_sessions()
-        service_records = db.get_service_logs()
-        expense_records = db.get_expense_logs()
-        
-        total_records = len(pc_records) + len(service_records) + len(expense_records)
+        # Get record counts for all types
+        totals = await async_db.db.record_totals()
+        total_records = totals["count"]
         
         if total_records == 0:
             embed = Embed(
@@ -515,9 +537,9 @@ class EditRecords(commands.Cog):
         embed = Embed(
             title="📝 Edit Any Record",
             description=f"**Total Records Available:** {total_records}\n\n"
-                       f"💻 **PC Sessions:** {len(pc_records)}\n"
-                       f"🛠️ **Service Logs:** {len(service_records)}\n"
-                       f"🛒 **Expense Logs:** {len(expense_records)}\n\n"
+                       f"💻 **PC Sessions:** {totals['pc_session']['count']}\n"
+                       f"🛠️ **Service Logs:** {totals['service_log']['count']}\n"
+                       f"🛒 **Expense Logs:** {totals['expense_log']['count']}\n\n"
                        f"Choose what type of record you want to edit:",
             color=Color.blue()
         )
@@ -530,7 +552,8 @@ class EditRecords(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         # Get recent PC sessions
-        records = db.get_pc_sessions()
+        page = await async_db.db.get_records_page("pc_session")
+        records = page["records"]
         
         if not records:
             embed = Embed(
@@ -543,11 +566,11 @@ class EditRecords(commands.Cog):
         
         embed = Embed(
             title="💻 Edit PC Session",
-            description=f"**Found {len(records)} PC sessions**\nSelect a PC session to edit from the dropdown below.",
+            description=f"**Showing the latest {len(records)} PC sessions**\nSelect a PC session to edit from the dropdown below.",
             color=Color.blue()
         )
         
-        view = RecordSelectorView(records, "pc_session")
+        view = RecordSelectorView(records, "pc_session", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
     @slash_command(name="edit_service_log", description="Edit a service log record")
@@ -555,7 +578,8 @@ class EditRecords(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         # Get recent service logs
-        records = db.get_service_logs()
+        page = await async_db.db.get_records_page("service_log")
+        records = page["records"]
         
         if not records:
             embed = Embed(
@@ -568,11 +592,11 @@ class EditRecords(commands.Cog):
         
         embed = Embed(
             title="🛠️ Edit Service Log",
-            description=f"**Found {len(records)} service logs**\nSelect a service log to edit from the dropdown below.",
+            description=f"**Showing the latest {len(records)} service logs**\nSelect a service log to edit from the dropdown below.",
             color=Color.orange()
         )
         
-        view = RecordSelectorView(records, "service_log")
+        view = RecordSelectorView(records, "service_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
     @slash_command(name="edit_expense_log", description="Edit an expense log record")
@@ -580,7 +604,8 @@ class EditRecords(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         # Get recent expense logs
-        records = db.get_expense_logs()
+        page = await async_db.db.get_records_page("expense_log")
+        records = page["records"]
         
         if not records:
             embed = Embed(
@@ -593,23 +618,20 @@ class EditRecords(commands.Cog):
         
         embed = Embed(
             title="🛒 Edit Expense Log",
-            description=f"**Found {len(records)} expense logs**\nSelect an expense log to edit from the dropdown below.",
+            description=f"**Showing the latest {len(records)} expense logs**\nSelect an expense log to edit from the dropdown below.",
             color=Color.red()
         )
         
-        view = RecordSelectorView(records, "expense_log")
+        view = RecordSelectorView(records, "expense_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
     @slash_command(name="view_all_records", description="View all records with edit options")
     async def view_all_records(self, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        # Get all records
-        pc_records = db.get_pc_sessions()
-        service_records = db.get_service_logs()
-        expense_records = db.get_expense_logs()
-        
-        total_records = len(pc_records) + len(service_records) + len(expense_records)
+        # Get record counts and totals for all types
+        totals = await async_db.db.record_totals()
+        total_records = totals["count"]
         
         if total_records == 0:
             embed = Embed(
@@ -620,19 +642,19 @@ class EditRecords(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             return
         
-        # Calculate totals
-        pc_total = sum(record.get('amount', 0) for record in pc_records)
-        service_total = sum(record.get('amount', 0) for record in service_records)
-        expense_total = sum(record.get('amount', 0) for record in expense_records)
-        net_total = pc_total + service_total - expense_total
+        # Totals computed by MongoDB
+        pc_total = totals['pc_session']['amount']
+        service_total = totals['service_log']['amount']
+        expense_total = totals['expense_log']['amount']
+        net_total = totals['net']
         
         embed = Embed(
             title="📊 All Records Summary",
             description=f"**Total Records:** {total_records}\n\n"
                        f"**Financial Summary:**\n"
-                       f"💻 PC Sessions: {len(pc_records)} records - {pc_total:,} EGP\n"
-                       f"🛠️ Service Logs: {len(service_records)} records - {service_total:,} EGP\n"
-                       f"🛒 Expense Logs: {len(expense_records)} records - {expense_total:,} EGP\n"
+                       f"💻 PC Sessions: {totals['pc_session']['count']} records - {pc_total:,} EGP\n"
+                       f"🛠️ Service Logs: {totals['service_log']['count']} records - {service_total:,} EGP\n"
+                       f"🛒 Expense Logs: {totals['expense_log']['count']} records - {expense_total:,} EGP\n"
                        f"💰 **Net Total:** {net_total:,} EGP\n\n"
                        f"Choose what you want to do:",
             color=Color.green()
@@ -661,11 +683,11 @@ class EditRecords(commands.Cog):
         try:
             success = False
             if record_type == "pc_session":
-                success = db.delete_pc_session(record_id)
+                success = await async_db.db.delete_pc_session(record_id)
             elif record_type == "service_log":
-                success = db.delete_service_log(record_id)
+                success = await async_db.db.delete_service_log(record_id)
             elif record_type == "expense_log":
-                success = db.delete_expense_log(record_id)
+                success = await async_db.db.delete_expense_log(record_id)
             
             if success:
                 embed = Embed(
@@ -694,32 +716,16 @@ class EditRecords(commands.Cog):
     async def search_records(self, interaction: Interaction,
                            search_term: str = SlashOption(
                                name="term",
-                               description="Search term (PC number, service name, expense name, or staff name)"
+                               description="Search term (PC number, service name, expense name, or staff name)",
+                               autocomplete=True
                            )):
         await interaction.response.defer(ephemeral=True)
         
-        # Search in all record types
-        pc_records = db.get_pc_sessions()
-        service_records = db.get_service_logs()
-        expense_records = db.get_expense_logs()
-        
-        # Filter records based on search term
-        search_lower = search_term.lower()
-        
-        matching_pcs = [r for r in pc_records if 
-                       search_lower in r.get('pc', '').lower() or 
-                       search_lower in r.get('staff', '').lower() or
-                       search_lower in str(r.get('amount', 0))]
-        
-        matching_services = [r for r in service_records if 
-                           search_lower in r.get('service', '').lower() or 
-                           search_lower in r.get('staff', '').lower() or
-                           search_lower in str(r.get('amount', 0))]
-        
-        matching_expenses = [r for r in expense_records if 
-                           search_lower in r.get('name', '').lower() or 
-                           search_lower in r.get('staff', '').lower() or
-                           search_lower in str(r.get('amount', 0))]
+        # Indexed search over today's ledger and the archived records (best matches first)
+        found = await async_db.run(search.search, search_term, limit=SEARCH_LIMIT)
+        matching_pcs = found['pcs']
+        matching_services = found['services']
+        matching_expenses = found['expenses']
         
         total_matches = len(matching_pcs) + len(matching_services) + len(matching_expenses)
         
@@ -734,7 +740,7 @@ class EditRecords(commands.Cog):
         
         embed = Embed(
             title=f"🔍 Search Results for '{search_term}'",
-            description=f"**Found {total_matches} matching records:**\n\n"
+            description=f"**Found {total_matches}{'+' if found['has_more'] else ''} matching records:**\n\n"
                        f"💻 **PC Sessions:** {len(matching_pcs)}\n"
                        f"🛠️ **Service Logs:** {len(matching_services)}\n"
                        f"🛒 **Expense Logs:** {len(matching_expenses)}\n\n"
@@ -745,6 +751,14 @@ class EditRecords(commands.Cog):
         view = SearchResultsView(matching_pcs, matching_services, matching_expenses)
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
+    @search_records.on_autocomplete("search_term")
+    async def search_term_autocomplete(self, interaction: Interaction, string: str):
+        try:
+            suggestions = await async_db.run(autocomplete.suggest_any, string)
+            await interaction.response.send_autocomplete(suggestions)
+        except Exception:
+            await interaction.response.send_autocomplete([])
+
     @slash_command(name="bulk_edit", description="Edit multiple records at once")
     async def bulk_edit(self, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
@@ -818,7 +832,8 @@ class BulkEditView(View):
     async def bulk_edit_pcs(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_pc_sessions()
+        page = await async_db.db.get_records_page("pc_session")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No PC Sessions Found",
@@ -830,19 +845,20 @@ class BulkEditView(View):
         
         embed = Embed(
             title="💻 Bulk Edit PC Sessions",
-            description=f"**Found {len(records)} PC sessions**\n"
+            description=f"**Showing the latest {len(records)} PC sessions**\n"
                        f"Select multiple PC sessions to edit (up to 10):",
             color=Color.blue()
         )
         
-        view = BulkEditSelectorView(records, "pc_session")
+        view = BulkEditSelectorView(records, "pc_session", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛠️ Bulk Edit Service Logs", style=ButtonStyle.orange, emoji="🛠️")
     async def bulk_edit_services(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_service_logs()
+        page = await async_db.db.get_records_page("service_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Service Logs Found",
@@ -854,19 +870,20 @@ class BulkEditView(View):
         
         embed = Embed(
             title="🛠️ Bulk Edit Service Logs",
-            description=f"**Found {len(records)} service logs**\n"
+            description=f"**Showing the latest {len(records)} service logs**\n"
                        f"Select multiple service logs to edit (up to 10):",
             color=Color.orange()
         )
         
-        view = BulkEditSelectorView(records, "service_log")
+        view = BulkEditSelectorView(records, "service_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
     
     @Button(label="🛒 Bulk Edit Expense Logs", style=ButtonStyle.red, emoji="🛒")
     async def bulk_edit_expenses(self, button: Button, interaction: Interaction):
         await interaction.response.defer(ephemeral=True)
         
-        records = db.get_expense_logs()
+        page = await async_db.db.get_records_page("expense_log")
+        records = page["records"]
         if not records:
             embed = Embed(
                 title="No Expense Logs Found",
@@ -878,18 +895,20 @@ class BulkEditView(View):
         
         embed = Embed(
             title="🛒 Bulk Edit Expense Logs",
-            description=f"**Found {len(records)} expense logs**\n"
+            description=f"**Showing the latest {len(records)} expense logs**\n"
                        f"Select multiple expense logs to edit (up to 10):",
             color=Color.red()
         )
         
-        view = BulkEditSelectorView(records, "expense_log")
+        view = BulkEditSelectorView(records, "expense_log", page["next_cursor"])
         await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
 class BulkEditSelectorView(View):
-    def __init__(self, records, record_type):
+    def __init__(self, records, record_type, next_cursor=None):
         super().__init__(timeout=60)
         self.add_item(BulkEditSelector(records, record_type))
+        if next_cursor:
+            self.add_item(NextPageButton(BulkEditSelectorView, record_type, next_cursor))
 
 class BulkEditSelector(Select):
     def __init__(self, records, record_type):
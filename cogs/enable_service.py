@@ -1,7 +1,7 @@
 from random import choice
 from nextcord.ext import commands
 from nextcord import Color, Embed, SlashOption, slash_command, Interaction
-import utils.database as db
+from utils import async_db, autocomplete
 
 class EnableService(commands.Cog):
     def __init__(self, client):
@@ -16,7 +16,7 @@ class EnableService(commands.Cog):
         required=True
     )):
         await interaction.response.defer(ephemeral=True)
-        db.update_service({"name": service_name, "available": True})
+        await async_db.db.update_service({"name": service_name, "available": True})
         embed = Embed(
             title="✅ Service Enabled",
             description=f"Service **{service_name}** is now available",
@@ -27,10 +27,7 @@ class EnableService(commands.Cog):
     @enable_service.on_autocomplete("service_name")
     async def service_name_autocomplete(self, interaction: Interaction, string: str):
         try:
-            cursor = db.db.cyber.services.find({}, {"_id": 0, "name": 1})
-            names = [doc.get("name") for doc in cursor if doc.get("name")]
-            query = (string or "").lower()
-            filtered = [n for n in names if query in n.lower()][:25]
+            filtered = await async_db.run(autocomplete.suggest, "services", string)
             await interaction.response.send_autocomplete(filtered)
         except Exception:
             await interaction.response.send_autocomplete([])
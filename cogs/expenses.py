@@ -2,6 +2,7 @@ from nextcord.ext import commands
 from nextcord import ButtonStyle, Color, Interaction,Embed, TextInputStyle,slash_command
 from nextcord.ui import Modal, TextInput,Button, button,View
 import utils.utils as use
+from utils import interactions
 
 class ExpenseModal(Modal):
     def __init__(self):
@@ -10,23 +11,26 @@ class ExpenseModal(Modal):
         self.add_item(TextInput(label="💷 Cost",style=TextInputStyle.short,required=True))
     
     async def callback(self, interaction: Interaction):
-        data = use.load_data()
         expense = self.children[0].value
         cost = self.children[1].value
 
         if not cost.isdigit():
             return await interaction.response.send_message('❌ Cost must be an integer 🔢', ephemeral=True)
         guild = interaction.guild
-        await use.log_expense(guild,cost,expense,interaction.user.display_name)
+        staff = interaction.user.display_name
 
-        embed = Embed(
-            title = "Expense Logged Successfully ✅",
-            color = Color.green()
-        )
-        embed.add_field(name='🛍 Expense Name',value=expense)
-        embed.add_field(name='💷 Cost',value=f'{cost} EGP')
+        async def work(timings):
+            await use.log_expense(guild,cost,expense,staff,timings=timings)
+            embed = Embed(
+                title = "Expense Logged Successfully ✅",
+                color = Color.green()
+            )
+            embed.add_field(name='🛍 Expense Name',value=expense)
+            embed.add_field(name='💷 Cost',value=f'{cost} EGP')
+            return {"embed": embed}
 
-        await interaction.response.send_message(embed=embed,ephemeral=True)
+        # Acknowledge now, log in the background, then confirm
+        await interactions.fast_ack(interaction, "expense", work)
 
 class Expense(View):
     def __init__(self):
@@ -0,0 +1,52 @@
+from nextcord.ext import commands
+from nextcord import Embed, Interaction, slash_command
+from utils import log_queue, interactions
+
+class LogQueue(commands.Cog):
+    def __init__(self, client):
+        self.client = client
+
+    @slash_command(name='log_queue', description='shows the log message queue depth and send latency')
+    async def log_queue_stats(self, interaction: Interaction):
+        stats = log_queue.stats()
+        embed = Embed(
+            title='📮 Log Queue',
+            description=f"Waiting to be sent: {log_queue.depth()}" if stats else "Nothing has been logged since the bot started.",
+            color=0x7289DA
+        )
+        # Embeds hold at most 25 fields; the newest channels are the interesting ones
+        for channel_stats in list(stats.values())[-25:]:
+            latency = channel_stats['latency_ms']
+            send = channel_stats['send_ms']
+            embed.add_field(
+                name=f"#{channel_stats['channel']}",
+                value=(
+                    f"📥 Queued: {channel_stats['depth']}\n"
+                    f"📤 Sent: {channel_stats['sent_records']} records in {channel_stats['sent_messages']} messages\n"
+                    f"⏱️ Latency avg/p95/max: {latency['avg']}/{latency['p95']}/{latency['max']} ms\n"
+                    f"📡 Send avg/p95/max: {send['avg']}/{send['p95']}/{send['max']} ms\n"
+                    f"🔁 Retries: {channel_stats['retries']} | ❌ Failed: {channel_stats['failed_records']}"
+                ),
+                inline=False
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @slash_command(name='interaction_timings', description='shows how long each stage of logging interactions takes')
+    async def interaction_timings(self, interaction: Interaction):
+        stats = interactions.stats()
+        embed = Embed(
+            title='⏱️ Interaction Timings',
+            description="avg / p95 / max per stage, in ms" if stats else "No interactions handled since the bot started.",
+            color=0x7289DA
+        )
+        for name, pipeline in list(stats.items())[:25]:
+            lines = [f"{stage}: {t['avg']}/{t['p95']}/{t['max']}" for stage, t in pipeline['stages'].items()]
+            embed.add_field(
+                name=f"{name} ({pipeline['runs']} runs, {pipeline['failures']} failed)",
+                value="\n".join(lines) or "-",
+                inline=False
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+def setup(client):
+    client.add_cog(LogQueue(client))
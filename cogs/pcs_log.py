@@ -3,14 +3,21 @@ from nextcord import Embed, Interaction, TextInputStyle, slash_command, SelectOp
 from nextcord.ui import Select, View, Modal, button, TextInput
 import utils.utils as use
 from datetime import datetime
-import utils.database as db
+from utils import async_db, jobs, interactions
+import asyncio
 import nextcord
 
+# How often / how long the Save Logs button follows the close-day job
+JOB_POLL_SECONDS = 3
+JOB_FOLLOW_LIMIT = 14 * 60
+_follow_tasks = set()
+
 class PCLog(Modal):
-    def __init__(self, pc):
+    def __init__(self, pcs):
         super().__init__(title='Bill')
-        self.pc = pc
-        self.add_item(TextInput(label='💷 Cost (EGP)', style=TextInputStyle.short, required=True))
+        self.pcs = pcs
+        label = '💷 Cost (EGP)' if len(pcs) == 1 else f'💷 Cost per PC (EGP) · {len(pcs)} PCs'
+        self.add_item(TextInput(label=label, style=TextInputStyle.short, required=True))
         self.add_item(TextInput(label="📝 Notes",style=TextInputStyle.paragraph,required=False))
 
     async def callback(self, interaction: Interaction):
@@ -19,7 +26,24 @@ class PCLog(Modal):
         if not cost.isdigit():
             return await interaction.response.send_message('❌ Cost must be an integer 🔢', ephemeral=True)
         guild = interaction.guild
-        await use.log_session(guild, int(cost), self.pc,interaction.user.display_name,notes)
+        staff = interaction.user.display_name
+
+        async def work(timings):
+            if len(self.pcs) == 1:
+                await use.log_session(guild, int(cost), self.pcs[0], staff, notes, timings=timings)
+            else:
+                # Whole batch: one day-state write, one bulk insert, one summary message
+                await use.log_sessions(guild, int(cost), self.pcs, staff, notes, timings=timings)
+            embed = Embed(
+                title='PC Session Logged Successfully ✅' if len(self.pcs) == 1 else f'{len(self.pcs)} PC Sessions Logged Successfully ✅',
+                color=nextcord.Color.green()
+            )
+            embed.add_field(name='🖥️ PC' if len(self.pcs) == 1 else '🖥️ PCs', value=', '.join(self.pcs), inline=True)
+            embed.add_field(name='💷 Cost', value=f'{cost} EGP' if len(self.pcs) == 1 else f'{cost} EGP each', inline=True)
+            return {"embed": embed}
+
+        # Acknowledge now, log in the background, then confirm
+        await interactions.fast_ack(interaction, "pc_log" if len(self.pcs) == 1 else "pc_log_batch", work)
 
 class PCsDropDown(Select):
     def __init__(self):
@@ -27,11 +51,12 @@ class PCsDropDown(Select):
             SelectOption(label=f'PC {i}', value=f'PC {i}', emoji='💻')
             for i in range(1, 15)
         ]
-        super().__init__(placeholder='Select a PC...', min_values=1, max_values=1, options=options)
+        super().__init__(placeholder='Select one or more PCs...', min_values=1, max_values=len(options), options=options)
 
     async def callback(self, interaction: Interaction):
-        pc = self.values[0]
-        await interaction.response.send_modal(PCLog(pc))
+        # Keep the panel's order (PC 2 before PC 10) whatever order they were picked in
+        pcs = sorted(self.values, key=lambda pc: int(pc.split()[-1]))
+        await interaction.response.send_modal(PCLog(pcs))
 
 class PCv(View):
     def __init__(self):
@@ -40,7 +65,7 @@ class PCv(View):
 
     @button(label="View Summary", style=ButtonStyle.blurple,emoji='📊')
     async def summary(self, button, interaction: Interaction):
-        pcs, services, total = use.get_summary()
+        pcs, services, total = await async_db.run(use.get_summary)
         bot_user = interaction.client.user
 
         embed = Embed(title="⚡ Quick Summary", color=0x7289DA)
@@ -56,10 +81,11 @@ class PCv(View):
 
     @button(label="Save Logs", style=ButtonStyle.green,emoji='💾')
     async def reset(self, button, interaction: Interaction):
-        data = use.load_data()
-        pcs_total = data["totals"]["pcs"]
-        services_total = data["totals"]["services"]
-        total = data["totals"]["all"]
+        await interaction.response.defer(ephemeral=True)
+        totals = await async_db.store.totals()
+        pcs_total = totals["pcs"]
+        services_total = totals["services"]
+        total = totals["all"]
         date_str = datetime.now().strftime("%d %b %Y")
         bot_user = interaction.client.user
 
@@ -74,14 +100,31 @@ class PCv(View):
         embed.set_footer(text=f"Day has been closed and archived | {bot_user.name}")
 
         # Send to the correct log channel
-        log_channel_id = data.get("log_channel_id")
+        log_channel_id = await async_db.store.get_meta("log_channel_id")
         if log_channel_id:
             channel = interaction.client.get_channel(log_channel_id)
             if channel:
                 await channel.send(embed=embed)
 
-        db.save_logs()
-        await interaction.response.send_message("✅ Logs have been reset and archived.", ephemeral=True)
+        # Reset now; archive + PDF run as a background job
+        job_id = await async_db.db.close_day()
+        await interaction.followup.send("✅ Logs have been reset. Archiving in the background... 🔃", ephemeral=True)
+        task = asyncio.create_task(self.report_job(interaction, job_id))
+        _follow_tasks.add(task)
+        task.add_done_callback(_follow_tasks.discard)
+
+    async def report_job(self, interaction: Interaction, job_id):
+        # Interaction tokens last 15 minutes; stop following a bit before that
+        for _ in range(JOB_FOLLOW_LIMIT // JOB_POLL_SECONDS):
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            job = await async_db.run(jobs.get, job_id)
+            if not job or job["status"] not in ("done", "failed"):
+                continue
+            if job["status"] == "done":
+                await interaction.followup.send("📄 Day archived and PDF report generated.", ephemeral=True)
+            else:
+                await interaction.followup.send(f"❌ Archiving failed after {job['attempts']} attempts\nError: ```{job['error']}```", ephemeral=True)
+            return
 
 class PC(commands.Cog):
     def __init__(self, client):
@@ -95,7 +138,7 @@ class PC(commands.Cog):
             description="> Use this panel to log any PC session.\n> Select the PC below and enter session details when prompted.",
             color=0x001DA3
         )
-        embed.add_field(name='PC Selection', value='Choose from the dropdown list below.')
+        embed.add_field(name='PC Selection', value='Choose one or more PCs from the dropdown list below.')
         embed.set_footer(text=f'{bot.name} | Daily logs')
         embed.set_thumbnail(url=bot.display_avatar.url)
         
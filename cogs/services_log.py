@@ -1,11 +1,8 @@
-import json
-import os
-import nextcord
 from nextcord.ext import commands
 from nextcord import Embed, Interaction, slash_command, SelectOption,TextInputStyle,Color
 from nextcord.ui import View, Select,Modal,TextInput
 import utils.utils as use
-import utils.database as db
+from utils import async_db, interactions
 
 class CustomServiceCost(Modal):
     def __init__(self, service,emoji):
@@ -19,22 +16,26 @@ class CustomServiceCost(Modal):
         if not cost.isdigit():
             return await interaction.response.send_message('❌ Cost must be an integer 🔢', ephemeral=True)
         guild = interaction.guild
-        await use.log_service(guild,cost,self.service,self.emoji,staff=interaction.user.display_name)
+        staff = interaction.user.display_name
 
-       # Confirmation Message
-        embed = Embed(
-            title='Serivce Logged Successfully ✅',
-            color=Color.green()
-        )
-        embed.add_field(name='Service Name',value=f'{self.emoji} {self.service}',inline=True)
-        embed.add_field(name='Cost',value=f'💷 {cost} EGP')
+        async def work(timings):
+            await use.log_service(guild,cost,self.service,self.emoji,staff=staff,timings=timings)
+            return {"embed": service_logged_embed(self.service, self.emoji, cost)}
+
+        # Acknowledge now, log in the background, then confirm
+        await interactions.fast_ack(interaction, "custom_service", work)
 
-        # ✅ Always respond to the dropdown interaction
-        await interaction.response.send_message(embed=embed,ephemeral=True)
+def service_logged_embed(service_name, emoji, cost):
+    embed = Embed(
+        title='Serivce Logged Successfully ✅',
+        color=Color.green()
+    )
+    embed.add_field(name='Service Name',value=f'{emoji} {service_name}',inline=True)
+    embed.add_field(name='Cost',value=f'💷 {cost} EGP')
+    return embed
 
 class ServiceDropdown(Select):
-    def __init__(self):
-        services = db.load_services()
+    def __init__(self, services):
         options = []
         for service in services:
             name = service['name']
@@ -65,7 +66,9 @@ class ServiceDropdown(Select):
             await interaction.response.send_message("⚠️ No services available.", ephemeral=True)
             return
 
-        service = db.db.cyber.services.find_one({"name": service_name})
+        timings = interactions.Timings("service")
+        with timings.stage("lookup"):
+            service = await async_db.db.get_service(service_name)
         if service is None:
             await interaction.response.send_message("❌ Selected service not found.", ephemeral=True)
             return
@@ -78,31 +81,22 @@ class ServiceDropdown(Select):
             await interaction.response.send_modal(CustomServiceCost(service_name,emoji))
             return
 
-        # ✅ Log the service in utils.py
-        await use.log_service(
-            interaction.guild,
-            cost,
-            service_name,
-            emoji,
-            staff=interaction.user.display_name
-        )
+        guild = interaction.guild
+        staff = interaction.user.display_name
 
-        # Confirmation Message
-        embed = Embed(
-            title='Serivce Logged Successfully ✅',
-            color=Color.green()
-        )
-        embed.add_field(name='Service Name',value=f'{emoji} {service_name}',inline=True)
-        embed.add_field(name='Cost',value=f'💷 {cost} EGP')
+        async def work(timings):
+            # ✅ Log the service in utils.py
+            await use.log_service(guild, cost, service_name, emoji, staff=staff, timings=timings)
+            return {"embed": service_logged_embed(service_name, emoji, cost)}
 
-        # ✅ Always respond to the dropdown interaction
-        await interaction.response.send_message(embed=embed,ephemeral=True)
+        # ✅ Always respond to the dropdown interaction: acknowledge now, confirm when logged
+        await interactions.fast_ack(interaction, "service", work, timings=timings)
 
 
 class ServicePanel(View):
-    def __init__(self):
+    def __init__(self, services):
         super().__init__(timeout=None)
-        self.add_item(ServiceDropdown())
+        self.add_item(ServiceDropdown(services))
 
 
 class ServiceCog(commands.Cog):
@@ -120,7 +114,8 @@ class ServiceCog(commands.Cog):
         embed.set_thumbnail(url=bot.display_avatar.url)
         embed.set_footer(text=f"{bot.name} | Daily logs")
         
-        await interaction.channel.send(embed=embed, view=ServicePanel())
+        services = await async_db.db.load_services()
+        await interaction.channel.send(embed=embed, view=ServicePanel(services))
         await interaction.response.send_message("✅ Service panel created", ephemeral=True)
 
 
@@ -4,7 +4,7 @@ import socket
 
 import webview
 
-from app import app
+import serve
 
 
 def _is_port_open(host: str, port: int) -> bool:
@@ -15,12 +15,16 @@ def _is_port_open(host: str, port: int) -> bool:
 		return False
 
 
-def run_server():
-	app.run(debug=False, host='127.0.0.1', port=5000)
+def run_server(server):
+	try:
+		server.run()
+	except Exception as e:
+		print(f'[Launcher] Server stopped: {e}')
 
 
 def main():
-	server_thread = threading.Thread(target=run_server, daemon=True)
+	server = serve.build_server(host='127.0.0.1', port=5000)
+	server_thread = threading.Thread(target=run_server, args=(server,), daemon=True)
 	server_thread.start()
 
 	for _ in range(200):
@@ -31,6 +35,9 @@ def main():
 	webview.create_window('Leader', 'http://127.0.0.1:5000', width=1200, height=800, resizable=True)
 	webview.start()
 
+	# Window closed: stop serving and flush the day state before exiting
+	serve.stop(server)
+
 
 if __name__ == '__main__':
 	main()
@@ -3,7 +3,9 @@ from nextcord.ext import commands
 from nextcord import Intents
 from dotenv import load_dotenv
 import os
-from utils.database import db
+from utils.database import db, reconcile
+from utils import jobs, log_channels
+import utils.utils as use
 
 intents = Intents.default()
 intents.messages = True
@@ -19,6 +21,11 @@ for filename in os.listdir('./cogs'):
     if filename.endswith('.py'):
         client.load_extension(f'cogs.{filename[:-3]}')
 
+# Keep the cached daily log channels in step with channel deletes/renames
+log_channels.attach(client)
+# Edit / Delete buttons of log messages (routed by custom_id, survive restarts)
+client.add_listener(use.on_record_button, 'on_interaction')
+
 @client.event
 async def on_ready():
     print(f'Logged in as {client.user} (ID: {client.user.id})')
@@ -32,4 +39,8 @@ async def on_ready():
         print(f"❌ Database Connection: Failed - {str(e)}")
         print("=" * 50)
 
+# Indexes and search terms, then the background workers for day close / reports (see utils.jobs)
+reconcile()
+jobs.start()
+
 client.run(TOKEN)
\ No newline at end of file
@@ -0,0 +1,114 @@
+import argparse
+import os
+import signal
+import threading
+
+from waitress import create_server
+
+from app import app, stream_shutdown
+from utils.day_store import get_store
+from utils import jobs
+
+# Production entry point for the web dashboard: the Flask app on waitress, a
+# pure-Python multi-threaded WSGI server (no compiler needed, works in the
+# PyInstaller build). Every knob can come from the command line or from the
+# environment / .env:
+#   CYBER_HOST, CYBER_PORT          listen address (default 127.0.0.1:5000)
+#   CYBER_THREADS                   request worker threads; each open live
+#                                   dashboard (/api/stream) holds one for up to
+#                                   app.STREAM_LIFETIME seconds before it
+#                                   reconnects, so keep this well above the
+#                                   number of open dashboards
+#   CYBER_CONNECTION_LIMIT          open connections before new ones wait; live
+#                                   dashboards count too
+#   CYBER_BACKLOG                   pending connections the OS will queue
+#   CYBER_KEEPALIVE_TIMEOUT         seconds an idle keep-alive connection is kept
+# On Ctrl+C / SIGTERM the server stops accepting, live streams are told to
+# finish, in-flight requests get a few seconds, running background jobs finish
+# and the day state is compacted into current_day.json before the process exits.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5000
+DEFAULT_THREADS = 48
+DEFAULT_BACKLOG = 1024
+DEFAULT_CONNECTION_LIMIT = 200
+DEFAULT_KEEPALIVE_TIMEOUT = 120
+
+
+def _env(name, default, cast=int):
+    value = os.getenv(name)
+    return cast(value) if value else default
+
+
+def build_server(host=None, port=None, threads=None, backlog=None, connection_limit=None,
+                 keepalive_timeout=None):
+    return create_server(
+        app,
+        host=host or _env("CYBER_HOST", DEFAULT_HOST, str),
+        port=port or _env("CYBER_PORT", DEFAULT_PORT),
+        threads=threads or _env("CYBER_THREADS", DEFAULT_THREADS),
+        backlog=backlog or _env("CYBER_BACKLOG", DEFAULT_BACKLOG),
+        connection_limit=connection_limit or _env("CYBER_CONNECTION_LIMIT", DEFAULT_CONNECTION_LIMIT),
+        channel_timeout=keepalive_timeout or _env("CYBER_KEEPALIVE_TIMEOUT", DEFAULT_KEEPALIVE_TIMEOUT),
+        ident="CyberCafe",
+    )
+
+
+def flush_day_state():
+    """Let running background jobs finish, then fold the day journal into a fresh
+    snapshot so the next start loads one file"""
+    jobs.stop()
+    try:
+        get_store().compact()
+        print("[Serve] Day state flushed")
+    except Exception as e:
+        print(f"[Serve] Error flushing day state: {e}")
+
+
+def stop(server):
+    """Stop a server started with build_server() from any thread, then flush"""
+    stream_shutdown.set()
+    try:
+        server.close()
+        server.task_dispatcher.shutdown()
+    except Exception as e:
+        print(f"[Serve] Error stopping server: {e}")
+    flush_day_state()
+
+
+def serve(**options):
+    server = build_server(**options)
+
+    def _terminate(signum, frame):
+        # Let /api/stream generators finish, then unwind server.run()
+        stream_shutdown.set()
+        raise SystemExit(0)
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _terminate)
+        signal.signal(signal.SIGINT, _terminate)
+
+    print(f"[Serve] Listening on http://{server.effective_host}:{server.effective_port} "
+          f"({server.adj.threads} threads, backlog {server.adj.backlog})")
+    try:
+        # waitress shuts its task dispatcher down (waiting on in-flight requests)
+        # when run() is interrupted
+        server.run()
+    finally:
+        flush_day_state()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Cyber Cafe dashboard on a production WSGI server")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--backlog", type=int)
+    parser.add_argument("--connection-limit", type=int)
+    parser.add_argument("--keepalive-timeout", type=int)
+    args = parser.parse_args(argv)
+    serve(host=args.host, port=args.port, threads=args.threads, backlog=args.backlog,
+          connection_limit=args.connection_limit, keepalive_timeout=args.keepalive_timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,4 +41,4 @@ echo 📱 Open your browser to: http://localhost:5000
 echo 🛑 Press Ctrl+C to stop the server
 echo.
 
-python app.py
+python serve.py
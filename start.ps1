@@ -50,4 +50,4 @@ Write-Host "🛑 Press Ctrl+C to stop the server" -ForegroundColor Yellow
 Write-Host ""
 
 # Start the application
-python app.py
+python serve.py
@@ -2,6 +2,7 @@
 
 // Global variables
 let refreshInterval;
+let liveStream;
 const API_BASE_URL = window.location.origin;
 
 // Document ready
@@ -22,6 +23,9 @@ function initializeApp() {
         startAutoRefresh();
     }
     
+    // Follow a background job (e.g. day close) if the page shows one
+    initializeJobStatus();
+    
     // Initialize keyboard shortcuts
     initializeKeyboardShortcuts();
     
@@ -80,15 +84,39 @@ function validateNumberInput(input) {
     }
 }
 
-// Auto-refresh dashboard data
+// Live dashboard updates: pushed over /api/stream, polling only as a fallback
 function startAutoRefresh() {
-    refreshInterval = setInterval(refreshDashboardData, 30000); // Refresh every 30 seconds
+    if (window.EventSource) {
+        startLiveUpdates();
+    } else {
+        refreshInterval = setInterval(refreshDashboardData, 30000); // Refresh every 30 seconds
+    }
 }
 
 function stopAutoRefresh() {
     if (refreshInterval) {
         clearInterval(refreshInterval);
     }
+    if (liveStream) {
+        liveStream.close();
+        liveStream = null;
+    }
+}
+
+function startLiveUpdates() {
+    liveStream = new EventSource(`${API_BASE_URL}/api/stream`);
+    liveStream.addEventListener('totals', function(e) {
+        updateDashboardCards(JSON.parse(e.data));
+    });
+    liveStream.addEventListener('record', function(e) {
+        updateRecentList(JSON.parse(e.data));
+    });
+    liveStream.addEventListener('reset', function() {
+        // The whole day was replaced (e.g. archived): re-render from the server
+        window.location.reload();
+    });
+    // EventSource reconnects on its own after errors and when the server ends the
+    // stream (retry sent by the server), resuming from the last totals version
 }
 
 // Refresh dashboard data
@@ -106,22 +134,122 @@ async function refreshDashboardData() {
 
 // Update dashboard cards with new data
 function updateDashboardCards(data) {
-    // Update summary cards if they exist
-    const cards = document.querySelectorAll('.h5');
-    cards.forEach(card => {
-        const text = card.textContent;
-        if (text.includes('PC Sessions')) {
-            card.textContent = `💷 ${data.pcs_total} EGP`;
-        } else if (text.includes('Services')) {
-            card.textContent = `💷 ${data.services_total} EGP`;
-        } else if (text.includes('Expenses')) {
-            card.textContent = `💷 ${data.expenses_total} EGP`;
-        } else if (text.includes('Net Total')) {
-            card.textContent = `💷 ${data.total_all} EGP`;
+    const values = {
+        pcs: data.pcs_total,
+        services: data.services_total,
+        expenses: data.expenses_total,
+        all: data.total_all
+    };
+    document.querySelectorAll('[data-total]').forEach(card => {
+        const value = values[card.dataset.total];
+        if (value !== undefined) {
+            card.textContent = `💷 ${value} EGP`;
         }
     });
 }
 
+const RECENT_LIMIT = 5;
+const RECENT_STYLE = {
+    pcs: { icon: 'fa-desktop text-primary', label: 'pc', sign: '' },
+    services: { icon: 'fa-cogs text-success', label: 'service', sign: '' },
+    expenses: { icon: 'fa-receipt text-warning', label: 'name', sign: '-' }
+};
+
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML;
+}
+
+function renderRecentItem(kind, record) {
+    const style = RECENT_STYLE[kind];
+    const amountClass = kind === 'expenses' ? 'font-weight-bold text-danger' : 'font-weight-bold';
+    return `
+        <div class="mr-3">
+            <i class="fas ${style.icon}"></i>
+        </div>
+        <div class="flex-grow-1">
+            <div class="small">${escapeHtml(record[style.label])}</div>
+            <div class="text-xs text-gray-500">${escapeHtml(record.time || 'N/A')}</div>
+        </div>
+        <div class="${amountClass}">
+            ${style.sign}💷 ${escapeHtml(record.amount)} EGP
+        </div>`;
+}
+
+// Apply one pushed record change to the matching "Recent ..." card
+function updateRecentList(change) {
+    const list = document.querySelector(`[data-recent="${change.kind}"]`);
+    if (!list || !RECENT_STYLE[change.kind]) {
+        return;
+    }
+    const existing = change.id ? list.querySelector(`[data-id="${CSS.escape(change.id)}"]`) : null;
+
+    if (change.op === 'delete') {
+        if (existing) existing.remove();
+    } else if (change.op === 'update' || (change.op === 'upsert' && existing)) {
+        // "upsert" comes from the changes replayed after a reconnect
+        if (existing) existing.innerHTML = renderRecentItem(change.kind, change.record);
+    } else if (change.op === 'add' || change.op === 'upsert') {
+        const placeholder = list.querySelector('p.text-muted');
+        if (placeholder) placeholder.remove();
+        const item = document.createElement('div');
+        item.className = 'd-flex align-items-center mb-2';
+        item.dataset.id = change.id || '';
+        item.innerHTML = renderRecentItem(change.kind, change.record);
+        list.prepend(item);
+    }
+
+    // Keep the newest RECENT_LIMIT items, separated like the server-rendered list
+    list.querySelectorAll('hr').forEach(hr => hr.remove());
+    const items = list.querySelectorAll('[data-id]');
+    items.forEach((item, i) => {
+        if (i >= RECENT_LIMIT) {
+            item.remove();
+        } else if (i > 0) {
+            const hr = document.createElement('hr');
+            hr.className = 'my-2';
+            item.before(hr);
+        }
+    });
+}
+
+// Background job progress (/jobs/<id>)
+function initializeJobStatus() {
+    const box = document.getElementById('job-status');
+    if (!box) {
+        return;
+    }
+    const message = box.querySelector('.job-message');
+    const timer = setInterval(async function() {
+        try {
+            const response = await fetch(`${API_BASE_URL}/jobs/${encodeURIComponent(box.dataset.jobId)}`);
+            if (!response.ok) {
+                return;
+            }
+            const job = await response.json();
+            const progress = job.progress || {};
+            if (job.status === 'done') {
+                clearInterval(timer);
+                box.className = 'alert alert-success';
+                box.innerHTML = '<i class="fas fa-check"></i> Day archived and PDF report generated.';
+            } else if (job.status === 'failed') {
+                clearInterval(timer);
+                box.className = 'alert alert-danger';
+                box.textContent = `Archiving failed after ${job.attempts} attempts: ${job.error}`;
+            } else {
+                let text = progress.steps ? `Step ${progress.step}/${progress.steps}: ${progress.message}` : 'Waiting for a worker...';
+                if (job.attempts > 1) {
+                    text += ` (attempt ${job.attempts})`;
+                }
+                message.textContent = text;
+            }
+        } catch (error) {
+            console.error('Error fetching job status:', error);
+        }
+    }, 1000);
+}
+
 // Keyboard shortcuts
 function initializeKeyboardShortcuts() {
     document.addEventListener('keydown', function(e) {
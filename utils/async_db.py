@@ -0,0 +1,55 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+import utils.database as database
+from utils import day_store
+
+# Async facade over the blocking data layer for the Discord bot.
+# pymongo and the day store file lock block the calling thread, so every call
+# made from a coroutine runs on a small dedicated pool instead of the event loop.
+# The pool is bounded: a burst of interactions queues here rather than opening
+# more Mongo connections or piling threads on the day store lock.
+#   await async_db.db.save_pc_session(data)
+#   await async_db.store.add("pcs", record)
+DB_WORKERS = int(os.getenv("CYBER_DB_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="cyber-db")
+
+
+async def run(func, *args, **kwargs):
+    """Run a blocking call on the data layer pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+class _AsyncProxy:
+    """Exposes every callable of `target` (or of `target()` when resolve=True) as a coroutine function"""
+
+    def __init__(self, target, resolve=False):
+        self._target = target
+        self._resolve = resolve
+
+    def _obj(self):
+        return self._target() if self._resolve else self._target
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj(), name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run(attr, *args, **kwargs)
+        return call
+
+
+# utils.database functions
+db = _AsyncProxy(database)
+
+# The shared DayStore (resolved on each call so a reset singleton is picked up)
+store = _AsyncProxy(day_store.get_store, resolve=True)
+
+
+def shutdown(wait=True):
+    _executor.shutdown(wait=wait)
@@ -0,0 +1,142 @@
+import threading
+import time
+from bisect import bisect_left
+import utils.database as db
+from utils import day_store
+
+# Suggestions for Discord slash options (25 choices max, answered inside the
+# 3 second interaction window). Each source keeps a sorted array of lowercase
+# suffixes, so any substring of a name is one bisect plus a short forward scan
+# instead of a Mongo query and a scan of every name per keystroke.
+MAX_CHOICES = 25
+SOURCE_TTL = 60
+RECENT_EXPENSES = 500
+PC_COUNT = 14
+
+
+class SuffixIndex:
+    """Substring lookup over a fixed set of names"""
+
+    def __init__(self, names=()):
+        self.names = sorted({n for n in names if n}, key=str.lower)
+        entries = []
+        for name in self.names:
+            lowered = name.lower()
+            for i in range(len(lowered)):
+                # Word starts rank before other infix matches
+                word_start = i == 0 or not lowered[i - 1].isalnum()
+                entries.append((lowered[i:], 0 if i == 0 else (1 if word_start else 2), name))
+        entries.sort()
+        self._entries = entries
+        self._keys = [e[0] for e in entries]
+
+    def __len__(self):
+        return len(self.names)
+
+    def matches(self, query):
+        """[(rank, name)] best first; rank 0 = name prefix, 1 = word start, 2 = other infix"""
+        query = (query or "").strip().lower()
+        if not query:
+            return [(0, name) for name in self.names]
+        best = {}
+        i = bisect_left(self._keys, query)
+        while i < len(self._keys) and self._keys[i].startswith(query):
+            _, rank, name = self._entries[i]
+            if rank < best.get(name, 3):
+                best[name] = rank
+            i += 1
+        return sorted(((rank, name) for name, rank in best.items()), key=lambda m: (m[0], m[1].lower()))
+
+    def search(self, query, limit=MAX_CHOICES):
+        return [name for _, name in self.matches(query)[:limit]]
+
+
+class _Source:
+    """A SuffixIndex rebuilt when its version changes, its TTL runs out or it is invalidated"""
+
+    def __init__(self, loader, version=None, ttl=None):
+        self._loader = loader
+        self._version_fn = version
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._index = None
+        self._version = None
+        self._built_at = 0.0
+
+    def _stale(self, version):
+        if self._index is None:
+            return True
+        if self._version_fn is not None and version != self._version:
+            return True
+        return self._ttl is not None and time.monotonic() - self._built_at > self._ttl
+
+    def index(self):
+        version = self._version_fn() if self._version_fn else None
+        with self._lock:
+            if self._stale(version):
+                try:
+                    self._index = SuffixIndex(self._loader())
+                    self._version = version
+                    self._built_at = time.monotonic()
+                except Exception as e:
+                    print(f"[Autocomplete] Error rebuilding index: {e}")
+                    if self._index is None:
+                        self._index = SuffixIndex()
+            return self._index
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+
+def _service_names():
+    return [s.get("name") for s in db.load_services()]
+
+
+def _staff_names():
+    names = {u.get("username") for u in db.db.cyber.users.find({}, {"_id": 0, "username": 1})}
+    names.update(day_store.get_store().aggregates().get("by_staff", {}).keys())
+    return names
+
+
+def _pc_names():
+    return [f"PC {i}" for i in range(1, PC_COUNT + 1)]
+
+
+def _expense_names():
+    names = {e.get("name") for e in day_store.get_store().snapshot().get("expenses", [])}
+    cursor = (db.db.cyber.expense_logs
+              .find({}, {"_id": 0, "name": 1})
+              .sort([("timestamp", -1), ("_id", -1)])
+              .limit(RECENT_EXPENSES))
+    names.update(e.get("name") for e in cursor)
+    return names
+
+
+SOURCES = {
+    "services": _Source(_service_names, version=lambda: db.service_catalog.version),
+    "staff": _Source(_staff_names, ttl=SOURCE_TTL),
+    "pcs": _Source(_pc_names),
+    "expenses": _Source(_expense_names, ttl=SOURCE_TTL),
+}
+
+
+def suggest(source, query, limit=MAX_CHOICES):
+    """Up to `limit` names from `source` containing `query` (name prefix first, then word starts)"""
+    return SOURCES[source].index().search(query, limit)
+
+
+def suggest_any(query, limit=MAX_CHOICES, sources=("services", "pcs", "staff", "expenses")):
+    """Merged suggestions across several sources, best rank first"""
+    best = {}
+    for position, name in enumerate(sources):
+        for rank, match in SOURCES[name].index().matches(query)[:limit]:
+            if match not in best:
+                best[match] = (rank, position, match.lower())
+    return sorted(best, key=best.get)[:limit]
+
+
+def invalidate(source=None):
+    for name, src in SOURCES.items():
+        if source is None or name == source:
+            src.invalidate()
@@ -0,0 +1,67 @@
+import threading
+from collections import deque
+from utils import day_store
+
+# In-process fan-out of day store changes to live clients (/api/stream).
+# Events sit in one bounded ring buffer with a sequence number; each client
+# remembers the last number it sent and blocks on the condition until newer
+# ones arrive, so publishing costs the same however many dashboards are open.
+# A client that falls more than BACKLOG events behind gets a "reset" instead.
+BACKLOG = 256
+
+
+class ChangeBus:
+    def __init__(self, backlog=BACKLOG):
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=backlog)
+        self._seq = 0
+        self._last_totals = None
+
+    @property
+    def seq(self):
+        with self._cond:
+            return self._seq
+
+    def publish(self, change):
+        """Store listener: turns a day store change into an event with the totals delta"""
+        totals = change.get("totals") or {}
+        previous = self._last_totals or {}
+        event = dict(change)
+        event["delta"] = {k: v - previous.get(k, 0) for k, v in totals.items() if v != previous.get(k, 0)}
+        with self._cond:
+            self._last_totals = dict(totals)
+            self._seq += 1
+            self._events.append((self._seq, event))
+            self._cond.notify_all()
+
+    def wait(self, after, timeout=None):
+        """Events newer than sequence `after` as (events, last_seq); waits up to `timeout`
+        seconds when there are none yet. A lone {"op": "reset"} event means the
+        caller missed events that are no longer buffered."""
+        with self._cond:
+            if self._seq <= after:
+                self._cond.wait(timeout)
+            if self._seq <= after:
+                return [], after
+            oldest = self._events[0][0]
+            if after + 1 < oldest:
+                return [{"op": "reset", "version": self._events[-1][1].get("version"),
+                         "totals": self._last_totals or {}}], self._seq
+            return [event for seq, event in self._events if seq > after], self._seq
+
+
+bus = ChangeBus()
+_attached = False
+_attach_lock = threading.Lock()
+
+
+def attach(store=None):
+    """Subscribe the bus to the shared day store (once per process)"""
+    global _attached
+    with _attach_lock:
+        if not _attached:
+            store = store or day_store.get_store()
+            bus._last_totals = store.totals()
+            store.add_listener(bus.publish)
+            _attached = True
+    return bus
@@ -1,17 +1,19 @@
-from pymongo import MongoClient
-from pymongo.errors import DuplicateKeyError
+from pymongo import MongoClient, InsertOne, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 import os
 from dotenv import load_dotenv
 from pprint import pprint
 import json
-from datetime import datetime, timezone
+import base64
+from datetime import datetime, timedelta, timezone
+import calendar
 import sys
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from werkzeug.security import generate_password_hash, check_password_hash
+import threading
+import time
+from bson import ObjectId
+from utils import day_store, passwords, jobs
+from utils.reports import generate_daily_pdf_report
+import uuid
 
 load_dotenv()
 DB_TOKEN = os.getenv('DB_TOKEN')
@@ -24,29 +26,304 @@ try:
     # Test connection
     db.admin.command('ping')
     print("Connected to MongoDB successfully!")
-    try:
-        db.cyber.users.create_index("username", unique=True)
-    except Exception:
-        pass
 except Exception as e:
     print(f"MongoDB connection failed: {e}")
     print("Please check your DB_TOKEN in the .env file")
     raise e
 
-def load_services():
+# ==================== SEARCH TERMS ====================
+# Archived records carry a lowercase "search_terms" array built from these
+# fields; an index on it turns prefix searches into index range scans.
+SEARCH_FIELDS = {
+    "pc_sessions": ("pc", "staff"),
+    "service_logs": ("service", "staff"),
+    "expense_logs": ("name", "staff"),
+}
+
+def search_terms_for(doc, fields):
+    terms = set()
+    for field in fields:
+        terms.update(str(doc.get(field) or "").lower().split())
+    return sorted(terms)
+
+def _search_terms_stage(collection_name):
+    # Same tokens as search_terms_for(), computed by MongoDB inside an update pipeline
+    parts = []
+    for field in SEARCH_FIELDS[collection_name]:
+        parts += [{"$toString": {"$ifNull": [f"${field}", ""]}}, " "]
+    return {"$set": {"search_terms": {"$setUnion": [{"$filter": {
+        "input": {"$split": [{"$toLower": {"$concat": parts}}, " "]},
+        "cond": {"$ne": ["$$this", ""]},
+    }}]}}}
+
+def _literal_set(fields):
+    # Values inside an update pipeline would otherwise be read as expressions ("$5" -> field path)
+    return {"$set": {k: {"$literal": v} for k, v in fields.items()}}
+
+def backfill_search_terms():
+    for collection_name in SEARCH_FIELDS:
+        try:
+            result = db.cyber[collection_name].update_many(
+                {"search_terms": {"$exists": False}}, [_search_terms_stage(collection_name)]
+            )
+            if result.modified_count:
+                print(f"[Search] Indexed {result.modified_count} older {collection_name} records")
+        except Exception as e:
+            print(f"[Search] Could not backfill {collection_name}: {e}")
+
+# ==================== INDEXES ====================
+# Every index the app relies on, per collection in the "cyber" database.
+# Record ids are only unique when present (older documents may lack them).
+# The old day close archived bot-logged records a second time, so existing
+# databases hold duplicate ids: those are removed (newest document kept) before
+# the unique index is built. Run reconcile() once at startup (app.py / main.py).
+def _unique_id(field):
+    return {"keys": [(field, 1)], "name": f"{field}_unique", "unique": True,
+            "partialFilterExpression": {field: {"$type": "string"}}, "dedupe": field}
+
+INDEX_SPECS = {
+    "users": [
+        {"keys": [("username", 1)], "name": "username_1", "unique": True},
+    ],
+    "pc_sessions": [
+        {"keys": [("date", 1), ("timestamp", -1)], "name": "date_timestamp"},
+        {"keys": [("timestamp", -1), ("_id", -1)], "name": "timestamp_id"},
+        {"keys": [("staff", 1), ("date", 1)], "name": "staff_date"},
+        _unique_id("session_id"),
+        {"keys": [("search_terms", 1)], "name": "search_terms"},
+        {"keys": [("amount", 1)], "name": "amount"},
+    ],
+    "service_logs": [
+        {"keys": [("date", 1), ("timestamp", -1)], "name": "date_timestamp"},
+        {"keys": [("timestamp", -1), ("_id", -1)], "name": "timestamp_id"},
+        {"keys": [("staff", 1), ("date", 1)], "name": "staff_date"},
+        _unique_id("log_id"),
+        {"keys": [("search_terms", 1)], "name": "search_terms"},
+        {"keys": [("amount", 1)], "name": "amount"},
+    ],
+    "expense_logs": [
+        {"keys": [("date", 1), ("timestamp", -1)], "name": "date_timestamp"},
+        {"keys": [("timestamp", -1), ("_id", -1)], "name": "timestamp_id"},
+        {"keys": [("staff", 1), ("date", 1)], "name": "staff_date"},
+        _unique_id("log_id"),
+        {"keys": [("search_terms", 1)], "name": "search_terms"},
+        {"keys": [("amount", 1)], "name": "amount"},
+    ],
+    "logs": [
+        {"keys": [("date", -1)], "name": "date"},
+        {"keys": [("close_id", 1)], "name": "close_id", "unique": True,
+         "partialFilterExpression": {"close_id": {"$type": "string"}}},
+    ],
+    "jobs": [
+        {"keys": [("status", 1), ("run_after", 1)], "name": "status_run_after"},
+        {"keys": [("status", 1), ("lease_until", 1)], "name": "status_lease"},
+    ],
+    "rollups": [
+        {"keys": [("period", 1), ("start", 1)], "name": "period_start"},
+    ],
+}
+
+def _index_options(spec):
+    return {k: v for k, v in spec.items() if k not in ("keys", "name", "dedupe")}
+
+def _duplicate_groups(collection, id_field):
+    return [
+        {"$match": {id_field: {"$type": "string"}}},
+        {"$sort": {"_id": -1}},
+        {"$group": {"_id": f"${id_field}", "docs": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+
+def count_duplicate_ids(collection_name, id_field):
+    """How many ids appear on more than one document"""
+    pipeline = _duplicate_groups(db.cyber[collection_name], id_field) + [{"$count": "ids"}]
+    result = list(db.cyber[collection_name].aggregate(pipeline, allowDiskUse=True))
+    return result[0]["ids"] if result else 0
+
+def dedupe_record_ids(collection_name, id_field):
+    """Delete all but the newest document per id; returns how many were deleted"""
+    collection = db.cyber[collection_name]
+    removed = 0
+    for group in collection.aggregate(_duplicate_groups(collection, id_field), allowDiskUse=True):
+        removed += collection.delete_many({"_id": {"$in": group["docs"][1:]}}).deleted_count
+    return removed
+
+def _index_matches(existing, spec):
+    if list(existing.get("key", [])) != [tuple(k) for k in spec["keys"]]:
+        return False
+    for option, value in _index_options(spec).items():
+        if existing.get(option) != value:
+            return False
+    return True
+
+def ensure_indexes(collections=None):
+    """Create missing indexes and rebuild ones whose definition drifted. Returns {collection: [actions]}"""
+    actions = {}
+    for name, specs in INDEX_SPECS.items():
+        if collections and name not in collections:
+            continue
+        collection = db.cyber[name]
+        done = actions.setdefault(name, [])
+        try:
+            existing = collection.index_information()
+        except Exception as e:
+            print(f"[Indexes] Could not read indexes of {name}: {e}")
+            continue
+        for spec in specs:
+            current = existing.get(spec["name"])
+            if current and _index_matches(current, spec):
+                continue
+            try:
+                if spec.get("dedupe"):
+                    removed = dedupe_record_ids(name, spec["dedupe"])
+                    if removed:
+                        done.append(f"removed {removed} duplicate {spec['dedupe']} documents")
+                if current:
+                    collection.drop_index(spec["name"])
+                    done.append(f"rebuilt {spec['name']}")
+                else:
+                    done.append(f"created {spec['name']}")
+                collection.create_index(spec["keys"], name=spec["name"], **_index_options(spec))
+            except Exception as e:
+                done[-1] = f"failed {spec['name']}: {e}"
+                print(f"[Indexes] Could not build {name}.{spec['name']}: {e}")
+    return actions
+
+def index_report():
+    """Declared indexes that are missing, plus existing ones that are undeclared or never used"""
+    report = {}
+    for name, specs in INDEX_SPECS.items():
+        collection = db.cyber[name]
+        try:
+            existing = collection.index_information()
+        except Exception as e:
+            report[name] = {"error": str(e)}
+            continue
+        declared = {spec["name"] for spec in specs}
+        usage = {}
+        try:
+            for stat in collection.aggregate([{"$indexStats": {}}]):
+                usage[stat["name"]] = stat.get("accesses", {}).get("ops", 0)
+        except Exception:
+            # $indexStats needs clusterMonitor on some hosted tiers
+            pass
+        missing = sorted(n for n in declared if n not in existing)
+        # Why a missing unique index cannot be built yet
+        blocked = {}
+        for spec in specs:
+            if spec.get("dedupe") and spec["name"] in missing:
+                try:
+                    duplicates = count_duplicate_ids(name, spec["dedupe"])
+                except Exception as e:
+                    blocked[spec["name"]] = f"could not check duplicates: {e}"
+                    continue
+                if duplicates:
+                    blocked[spec["name"]] = f"{duplicates} duplicate {spec['dedupe']} values"
+        report[name] = {
+            "missing": missing,
+            "blocked": blocked,
+            "undeclared": sorted(n for n in existing if n not in declared and n != "_id_"),
+            "unused": sorted(n for n, ops in usage.items() if ops == 0 and n != "_id_"),
+        }
+    return report
+
+def reconcile():
+    """Bring indexes and search terms up to date (called once at app / bot startup)"""
     try:
-        services = list(db.cyber.services.find({}, {"_id": 0}).sort("name", 1))  
-        if not services:
-            return []
-        return services
-        
+        for name, done in ensure_indexes().items():
+            for action in done:
+                print(f"[Indexes] {name}: {action}")
+        backfill_search_terms()
     except Exception as e:
-        print(f"[Services] Error loading file: {e}")
-        return []
+        print(f"[Indexes] Startup index check failed: {e}")
+
+# ==================== SERVICE CATALOG CACHE ====================
+# The catalog is read on every dashboard render, service panel, autocomplete and
+# service log, but only changes from the admin pages/commands. Readers share one
+# in-memory copy keyed by name. Writers bump a version stamp in cyber.meta; every
+# process (the bot and the web app run separately) compares its copy against the
+# stamp at most once per CATALOG_CHECK_INTERVAL seconds and reloads when it moved.
+CATALOG_CHECK_INTERVAL = float(os.getenv("CYBER_CATALOG_CHECK_INTERVAL", "2"))
+CATALOG_STAMP_ID = "service_catalog"
+
+
+class ServiceCatalog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name = None
+        self._ordered = []
+        self._version = None
+        self._checked_at = 0.0
+
+    def _remote_version(self):
+        doc = db.cyber.meta.find_one({"_id": CATALOG_STAMP_ID}, {"version": 1})
+        return (doc or {}).get("version", 0)
+
+    def _refresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._by_name is not None and now - self._checked_at < CATALOG_CHECK_INTERVAL:
+                return
+            try:
+                version = self._remote_version()
+                if self._by_name is None or version != self._version:
+                    # Read the stamp before the documents: a write racing with
+                    # this load leaves the stamp ahead, so the next check reloads
+                    services = list(db.cyber.services.find({}, {"_id": 0}).sort("name", 1))
+                    self._ordered = services
+                    self._by_name = {s["name"]: s for s in services if "name" in s}
+                    self._version = version
+                self._checked_at = now
+            except Exception as e:
+                # Keep serving the last good copy while MongoDB is unreachable
+                print(f"[Services] Error loading catalog: {e}")
+
+    @property
+    def version(self):
+        self._refresh()
+        return self._version
+
+    def all(self):
+        self._refresh()
+        return [dict(s) for s in self._ordered]
+
+    def get(self, name):
+        self._refresh()
+        service = (self._by_name or {}).get(name)
+        return dict(service) if service else None
+
+    def count(self):
+        self._refresh()
+        return len(self._ordered)
+
+    def invalidate(self):
+        """Drop the local copy and tell other processes to drop theirs"""
+        try:
+            db.cyber.meta.update_one({"_id": CATALOG_STAMP_ID}, {"$inc": {"version": 1}}, upsert=True)
+        except Exception as e:
+            print(f"[Services] Error bumping catalog version: {e}")
+        with self._lock:
+            self._checked_at = 0.0
+            self._version = None
+
+
+service_catalog = ServiceCatalog()
+
+
+def load_services():
+    """All services sorted by name (cached, see ServiceCatalog)"""
+    return service_catalog.all()
+
+def get_service(name):
+    return service_catalog.get(name)
+
+def services_count():
+    return service_catalog.count()
 
 def save_service(data):
     try:
         db.cyber.services.insert_one(data)
+        service_catalog.invalidate()
     except Exception as e:
         print(f"Error Saving Document\nError: {e}")
 
@@ -59,6 +336,8 @@ def update_service(update):
             return {"matched": 0, "modified": 0, "error": "no updatable fields provided"}
 
         result = db.cyber.services.update_one({"name": service_name}, {"$set": fields_to_set})
+        if result.modified_count:
+            service_catalog.invalidate()
         return {"matched": result.matched_count, "modified": result.modified_count}
     except Exception as e:
         print(f"Error updating service\nError: {e}")
@@ -67,47 +346,448 @@ def update_service(update):
 def delete_service(name):
     try:
         db.cyber.services.delete_one({"name": name})
+        service_catalog.invalidate()
     except Exception as e:
         print(f"Error deleting service\nError: {e}")
 
 
-def save_logs():
-    try:
-        with open('current_day.json','r',encoding='utf-8') as f:
-            doc = json.load(f)
-
-        now = datetime.now(timezone.utc)
-        doc["date"] = now.strftime("%Y-%m-%d")  # e.g. 2025-09-29
-        db.cyber.logs.insert_one(doc)
-        
-        # Generate PDF report
-        generate_daily_pdf_report(doc)
-        
-        default = {
-            "pcs": [],
-            "services": [],
-            "expenses":[],
-            "totals": {"pcs": 0, "services": 0,"expenses":0, "all": 0},
-            "log_channel_id": None
-        }
-        with open('current_day.json','w',encoding='utf-8') as f:
-            json.dump(default,f,indent=4)
+# ==================== DAY CLOSE ARCHIVE ====================
+ARCHIVE_BATCH_SIZE = 1000
+
+# Day record type -> (collection, id field, fields copied from the day record)
+ARCHIVE_COLLECTIONS = {
+    "pcs": ("pc_sessions", "session_id", ("pc", "amount", "staff", "time", "notes")),
+    "services": ("service_logs", "log_id", ("service", "amount", "staff", "time")),
+    "expenses": ("expense_logs", "log_id", ("name", "amount", "staff", "time")),
+}
+
+def _archive_ops(records, id_field, fields, search_fields, date, timestamp):
+    ops = []
+    for record in records:
+        doc = {field: record.get(field) for field in fields}
+        doc["search_terms"] = search_terms_for(doc, search_fields)
+        record_id = record.get(id_field)
+        if record_id:
+            # Records the bot already wrote keep their date/timestamp but take the
+            # ledger values from the day, which may have been edited since
+            ops.append(UpdateOne({id_field: record_id},
+                                 {"$set": doc, "$setOnInsert": {"date": date, "timestamp": timestamp}},
+                                 upsert=True))
+        else:
+            doc["date"] = date
+            doc["timestamp"] = timestamp
+            ops.append(InsertOne(doc))
+    return ops
+
+def archive_day(data, date=None, timestamp=None):
+    """Write every record of a day with a few unordered bulk_write calls per collection.
+    Returns {"pcs": {"inserted": n, "updated": n, "unchanged": n, "errors": n}, ...}"""
+    timestamp = timestamp or datetime.now()
+    date = date or timestamp.strftime("%Y-%m-%d")
+    summary = {}
+    for kind, (collection_name, id_field, fields) in ARCHIVE_COLLECTIONS.items():
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "errors": 0}
+        ops = _archive_ops(data.get(kind, []), id_field, fields, SEARCH_FIELDS[collection_name], date, timestamp)
+        collection = db.cyber[collection_name]
+        for start in range(0, len(ops), ARCHIVE_BATCH_SIZE):
+            batch = ops[start:start + ARCHIVE_BATCH_SIZE]
+            try:
+                result = collection.bulk_write(batch, ordered=False)
+                counts["inserted"] += result.upserted_count + result.inserted_count
+                counts["updated"] += result.modified_count
+                counts["unchanged"] += result.matched_count - result.modified_count
+            except BulkWriteError as e:
+                details = e.details
+                # Two upserts of the same id racing (a retried job): the other one wrote it
+                dup_errors = sum(1 for err in details.get("writeErrors", []) if err.get("code") == 11000)
+                counts["inserted"] += details.get("nUpserted", 0) + details.get("nInserted", 0)
+                counts["updated"] += details.get("nModified", 0)
+                counts["unchanged"] += details.get("nMatched", 0) - details.get("nModified", 0) + dup_errors
+                counts["errors"] += len(details.get("writeErrors", [])) - dup_errors
+            except Exception as e:
+                print(f"Error archiving {collection_name}: {e}")
+                counts["errors"] += len(batch)
+        summary[kind] = counts
+    return summary
+
+# ==================== ROLLUPS ====================
+# Pre-aggregated totals per day ("day:2025-09-29") and per month ("month:2025-09")
+# in cyber.rollups, bumped with $inc each time a day is closed. Range reports read
+# whole months from the month documents and only the ragged edges from day
+# documents, so a year-end report is a dozen small reads instead of a scan of
+# every archived record. A close is applied once: its close_id is added next to
+# the $inc and the filter skips documents that already list it.
+ROLLUP_FIELDS = ("totals", "counts", "by_staff", "by_pc", "by_service", "by_period")
+REPORT_PERIODS = ("day", "week", "month", "year", "range")
+
+def _rollup_key(name):
+    # Field names may not contain "." or start with "$"
+    return str(name).replace(".", "．").replace("$", "＄")
+
+def _rollup_name(key):
+    return key.replace("．", ".").replace("＄", "$")
+
+def _flatten(value, prefix, out):
+    for k, v in value.items():
+        path = f"{prefix}.{_rollup_key(k)}"
+        if isinstance(v, dict):
+            _flatten(v, path, out)
+        elif v:
+            out[path] = v
+    return out
+
+def rollup_increments(day):
+    """$inc document with one day's totals, counts and breakdowns"""
+    aggs = day_store.compute_aggregates(day)
+    inc = {}
+    for field in ROLLUP_FIELDS:
+        _flatten(aggs[field], field, inc)
+    return inc
+
+def _apply_rollup(key, period, start, inc, close_id, date):
+    update = {
+        "$addToSet": {"close_ids": close_id, "dates": date},
+        "$setOnInsert": {"period": period, "start": start},
+        "$set": {"updated_at": datetime.now(timezone.utc)},
+    }
+    if inc:
+        # An empty day has nothing to add; MongoDB before 5.0 rejects an empty $inc
+        update["$inc"] = inc
+    try:
+        db.cyber.rollups.update_one({"_id": key, "close_ids": {"$ne": close_id}}, update, upsert=True)
+    except DuplicateKeyError:
+        pass  # already applied (retried job): the filter missed and the upsert collided
+
+def update_rollups(day, date, close_id):
+    """Add a closed day to its day and month rollups (safe to call twice)"""
+    inc = rollup_increments(day)
+    _apply_rollup(f"day:{date}", "day", date, inc, close_id, date)
+    _apply_rollup(f"month:{date[:7]}", "month", date[:7], inc, close_id, date)
+
+def rebuild_rollups():
+    """Recompute every rollup from the archived daily logs (first run / repair).
+    Run it while nobody is closing the day."""
+    db.cyber.rollups.delete_many({})
+    count = 0
+    for doc in db.cyber.logs.find({"date": {"$type": "string"}}):
+        update_rollups(doc, doc["date"], doc.get("close_id") or str(doc["_id"]))
+        count += 1
+    return count
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def month_bounds(year, month):
+    """("YYYY-MM-01", "YYYY-MM-<last day>")"""
+    last = calendar.monthrange(year, month)[1]
+    return f"{year}-{month:02d}-01", f"{year}-{month:02d}-{last:02d}"
+
+def report_range(period, ref=None, date_from=None, date_to=None):
+    """(date_from, date_to) for a report period around `ref` (YYYY-MM-DD, default today).
+    Raises ValueError for unknown periods or bad dates."""
+    if period not in REPORT_PERIODS:
+        raise ValueError(f"Unknown report period: {period}")
+    if period == "range":
+        if not date_from or not date_to:
+            raise ValueError("A range report needs both from and to")
+        start, end = _parse_date(date_from), _parse_date(date_to)
+        if start > end:
+            raise ValueError("from must not be after to")
+        return start.isoformat(), end.isoformat()
+    day = _parse_date(ref) if ref else datetime.now().date()
+    if period == "day":
+        return day.isoformat(), day.isoformat()
+    if period == "week":
+        monday = day - timedelta(days=day.weekday())
+        return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+    if period == "month":
+        return month_bounds(day.year, day.month)
+    return f"{day.year}-01-01", f"{day.year}-12-31"
+
+def _rollup_query(date_from, date_to):
+    # Whole months come from month rollups, partial months from day rollups
+    start, end = _parse_date(date_from), _parse_date(date_to)
+    months, clauses = [], []
+    cursor = start
+    while cursor <= end:
+        last = cursor.replace(day=calendar.monthrange(cursor.year, cursor.month)[1])
+        if cursor.day == 1 and last <= end:
+            months.append(cursor.strftime("%Y-%m"))
+        else:
+            clauses.append({"period": "day", "start": {"$gte": cursor.isoformat(), "$lte": min(last, end).isoformat()}})
+        cursor = last + timedelta(days=1)
+    if months:
+        clauses.append({"period": "month", "start": {"$in": months}})
+    return {"$or": clauses}
+
+def _add_rollup(into, value):
+    for k, v in value.items():
+        name = _rollup_name(k)
+        if isinstance(v, dict):
+            _add_rollup(into.setdefault(name, {}), v)
+        else:
+            into[name] = into.get(name, 0) + v
+
+def _empty_totals():
+    return {kind: 0 for kind in (*day_store.KINDS, "all")}
+
+def rollup_report(date_from, date_to):
+    """Totals, counts and breakdowns (staff, PC, service, shift) for date_from..date_to
+    inclusive, plus one entry per day/month rollup read ("periods")"""
+    report = {"from": date_from, "to": date_to, "days": 0, "periods": []}
+    for field in ROLLUP_FIELDS:
+        report[field] = {}
+    report["totals"] = _empty_totals()
+    report["counts"] = {kind: 0 for kind in day_store.KINDS}
+    try:
+        docs = db.cyber.rollups.find(_rollup_query(date_from, date_to), {"close_ids": 0}).sort("start", 1)
+        for doc in docs:
+            for field in ROLLUP_FIELDS:
+                _add_rollup(report[field], doc.get(field) or {})
+            days = len(doc.get("dates") or [])
+            report["days"] += days
+            report["periods"].append({
+                "period": doc.get("period"),
+                "start": doc.get("start"),
+                "days": days,
+                "totals": dict(_empty_totals(), **(doc.get("totals") or {})),
+                "counts": doc.get("counts") or {},
+            })
+    except Exception as e:
+        print(f"Error building rollup report: {e}")
+    return report
+
+# ==================== DAY CLOSE ====================
+# Closing the day only snapshots and resets the day store (compare-and-swap on
+# the day version, so a record logged in between is never dropped); archiving the
+# records, storing the daily log, updating the rollups and rendering the PDF run as a "close_day"
+# background job (utils.jobs) so the staff member is answered immediately.
+# Every step is idempotent, so a retried job does not duplicate anything.
+CLOSE_DAY_STEPS = 4
+# Snapshot/reset rounds before giving up when records keep arriving mid-close
+CLOSE_DAY_ATTEMPTS = 5
+
+def _close_day_steps(payload, progress):
+    day = payload["day"]
+    job_key = payload["close_id"]
+
+    progress(1, CLOSE_DAY_STEPS, "Archiving records")
+    archived = archive_day(day, date=payload["local_date"], timestamp=payload["closed_at"])
+    errors = sum(counts["errors"] for counts in archived.values())
+    if errors:
+        raise RuntimeError(f"{errors} records could not be archived")
+
+    progress(2, CLOSE_DAY_STEPS, "Saving daily log")
+    doc = dict(day)
+    doc["date"] = payload["date"]
+    doc["close_id"] = job_key
+    db.cyber.logs.replace_one({"close_id": job_key}, doc, upsert=True)
+
+    progress(3, CLOSE_DAY_STEPS, "Updating rollups")
+    update_rollups(day, payload["date"], job_key)
+
+    progress(4, CLOSE_DAY_STEPS, "Rendering PDF report")
+    if not generate_daily_pdf_report(doc):
+        raise RuntimeError("PDF report could not be rendered")
+    return {"date": payload["date"], "archived": archived}
+
+def _close_day_payload():
+    now = datetime.now()
+    return {
+        "close_id": str(uuid.uuid4()),
+        "closed_at": now,
+        "local_date": now.strftime("%Y-%m-%d"),
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),  # e.g. 2025-09-29
+    }
+
+def _reset_if_unchanged(store, version):
+    """Reset the day unless something was logged since `version` (then False)"""
+    try:
+        store.replace(day_store.empty_day(), expected_version=version)
+        return True
+    except day_store.VersionConflict:
+        return False
+
+def close_day():
+    """Snapshot and reset the current day, then archive it in the background.
+    Returns the job id (see jobs.get / the /jobs/<id> route)."""
+    store = day_store.get_store()
+    for attempt in range(CLOSE_DAY_ATTEMPTS):
+        payload = _close_day_payload()
+        payload["day"], version = store.snapshot_versioned()
+        # Held until the reset: only reset once the day is safely in the job table,
+        # and only if nothing was logged while the job was being written
+        job_id = jobs.enqueue("close_day", payload, held=True)
+        if _reset_if_unchanged(store, version):
+            jobs.release(job_id)
+            return job_id
+        jobs.discard(job_id)
+    raise RuntimeError("The day kept changing while closing it, try again")
+
+jobs.register("close_day", _close_day_steps)
+
+# ==================== PAGINATED RECORD QUERIES ====================
+# Record type (as used by the edit/delete panels) -> (collection, id field)
+RECORD_TYPES = {
+    "pc_session": ("pc_sessions", "session_id"),
+    "service_log": ("service_logs", "log_id"),
+    "expense_log": ("expense_logs", "log_id"),
+}
+PAGE_SIZE = 25
+
+def _encode_cursor(doc):
+    ts = doc.get("timestamp")
+    payload = {"t": ts.isoformat() if isinstance(ts, datetime) else None, "id": str(doc["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+def _decode_cursor(cursor):
+    payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    ts = datetime.fromisoformat(payload["t"]) if payload.get("t") else None
+    return ts, ObjectId(payload["id"])
+
+def _records_query(date_from=None, date_to=None, staff=None):
+    query = {}
+    if date_from or date_to:
+        query["date"] = {}
+        if date_from:
+            query["date"]["$gte"] = date_from
+        if date_to:
+            query["date"]["$lte"] = date_to
+    if staff:
+        query["staff"] = staff
+    return query
+
+def get_records_page(record_type, page_size=PAGE_SIZE, cursor=None, date_from=None, date_to=None, staff=None):
+    """Newest-first page of archived records, keyset-paginated on (timestamp, _id).
+    Returns {"records": [...], "next_cursor": token or None}; pass the token back for the next page."""
+    try:
+        collection_name, _ = RECORD_TYPES[record_type]
+        query = _records_query(date_from, date_to, staff)
+        if cursor:
+            ts, oid = _decode_cursor(cursor)
+            if ts is None:
+                # Already in the tail of documents without a timestamp
+                query.update({"timestamp": None, "_id": {"$lt": oid}})
+            else:
+                query["$or"] = [
+                    {"timestamp": {"$lt": ts}},
+                    {"timestamp": ts, "_id": {"$lt": oid}},
+                    {"timestamp": None},
+                ]
+        docs = list(db.cyber[collection_name].find(query)
+                    .sort([("timestamp", -1), ("_id", -1)])
+                    .limit(page_size + 1))
+        next_cursor = _encode_cursor(docs[page_size - 1]) if len(docs) > page_size else None
+        records = docs[:page_size]
+        for doc in records:
+            doc.pop("_id", None)
+            doc.pop("search_terms", None)
+        return {"records": records, "next_cursor": next_cursor}
+    except Exception as e:
+        print(f"Error getting {record_type} page: {e}")
+        return {"records": [], "next_cursor": None}
+
+def get_record(record_type, record_id):
+    try:
+        collection_name, id_field = RECORD_TYPES[record_type]
+        return db.cyber[collection_name].find_one({id_field: record_id}, {"_id": 0, "search_terms": 0})
     except Exception as e:
-        print(f"Error Saving Logs\nError: {e}")
+        print(f"Error getting {record_type}: {e}")
+        return None
+
+# ==================== SERVER-SIDE SUMMARIES ====================
+SUMMARY_GROUPS = {
+    "staff": "$staff",
+    "date": "$date",
+    "month": {"$substrBytes": [{"$ifNull": ["$date", ""]}, 0, 7]},  # "YYYY-MM"
+}
+
+def summarize_records(group_by=None, date_from=None, date_to=None, staff=None):
+    """Counts and amount totals per record type computed by MongoDB.
+    Without group_by: {"pc_session": {"count", "amount"}, ...}
+    With group_by ("staff", "date" or "month"): {"pc_session": [{"key", "count", "amount"}, ...], ...}"""
+    summary = {}
+    match = _records_query(date_from, date_to, staff)
+    for record_type, (collection_name, _) in RECORD_TYPES.items():
+        pipeline = [{"$match": match}] if match else []
+        pipeline.append({"$group": {
+            "_id": SUMMARY_GROUPS[group_by] if group_by else None,
+            "count": {"$sum": 1},
+            "amount": {"$sum": {"$ifNull": ["$amount", 0]}},
+        }})
+        try:
+            rows = list(db.cyber[collection_name].aggregate(pipeline))
+        except Exception as e:
+            print(f"Error summarizing {collection_name}: {e}")
+            rows = []
+        if group_by:
+            rows.sort(key=lambda row: (row["_id"] is None, row["_id"] or ""))
+            summary[record_type] = [{"key": row["_id"], "count": row["count"], "amount": row["amount"]} for row in rows]
+        else:
+            row = rows[0] if rows else {}
+            summary[record_type] = {"count": row.get("count", 0), "amount": row.get("amount", 0)}
+    return summary
+
+def record_totals(date_from=None, date_to=None, staff=None):
+    """summarize_records() plus overall record count and net total (income - expenses)"""
+    totals = summarize_records(date_from=date_from, date_to=date_to, staff=staff)
+    totals["count"] = sum(totals[t]["count"] for t in RECORD_TYPES)
+    totals["net"] = totals["pc_session"]["amount"] + totals["service_log"]["amount"] - totals["expense_log"]["amount"]
+    return totals
+
+def get_day_logs(date_from, date_to):
+    """Archived day documents in a date range with missing totals filled in by MongoDB"""
+    totals = {
+        "pcs": {"$ifNull": ["$totals.pcs", 0]},
+        "services": {"$ifNull": ["$totals.services", 0]},
+        "expenses": {"$ifNull": ["$totals.expenses", 0]},
+    }
+    pipeline = [
+        {"$match": {"date": {"$gte": date_from, "$lte": date_to}}},
+        {"$sort": {"date": -1}},
+        {"$project": {
+            "_id": 0,
+            "date": 1,
+            "log_channel_id": 1,
+            "pcs": {"$ifNull": ["$pcs", []]},
+            "services": {"$ifNull": ["$services", []]},
+            "expenses": {"$ifNull": ["$expenses", []]},
+            "totals": dict(totals, all={"$ifNull": [
+                "$totals.all",
+                {"$subtract": [{"$add": [totals["pcs"], totals["services"]]}, totals["expenses"]]},
+            ]}),
+        }},
+    ]
+    try:
+        return list(db.cyber.logs.aggregate(pipeline))
+    except Exception as e:
+        print(f"Error getting day logs: {e}")
+        return []
 
 # MongoDB operations for PC sessions
 def save_pc_session(session_data):
     try:
+        session_data["search_terms"] = search_terms_for(session_data, SEARCH_FIELDS["pc_sessions"])
         db.cyber.pc_sessions.insert_one(session_data)
     except Exception as e:
         print(f"Error saving PC session: {e}")
 
+def save_pc_sessions(sessions):
+    """save_pc_session() for a batch with a single unordered insert_many"""
+    try:
+        for session_data in sessions:
+            session_data["search_terms"] = search_terms_for(session_data, SEARCH_FIELDS["pc_sessions"])
+        if sessions:
+            db.cyber.pc_sessions.insert_many(sessions, ordered=False)
+    except Exception as e:
+        print(f"Error saving PC sessions: {e}")
+
 def get_pc_sessions(date=None):
     try:
         query = {}
         if date:
             query["date"] = date
-        return list(db.cyber.pc_sessions.find(query, {"_id": 0}).sort("timestamp", -1))
+        return list(db.cyber.pc_sessions.find(query, {"_id": 0, "search_terms": 0}).sort("timestamp", -1))
     except Exception as e:
         print(f"Error getting PC sessions: {e}")
         return []
@@ -116,7 +796,7 @@ def update_pc_session(session_id, update_data):
     try:
         result = db.cyber.pc_sessions.update_one(
             {"session_id": session_id}, 
-            {"$set": update_data},
+            [_literal_set(update_data), _search_terms_stage("pc_sessions")],
             upsert=True
         )
         return (result.modified_count > 0) or (result.matched_count > 0) or (getattr(result, 'upserted_id', None) is not None)
@@ -135,6 +815,7 @@ def delete_pc_session(session_id):
 # MongoDB operations for service logs
 def save_service_log(service_data):
     try:
+        service_data["search_terms"] = search_terms_for(service_data, SEARCH_FIELDS["service_logs"])
         db.cyber.service_logs.insert_one(service_data)
     except Exception as e:
         print(f"Error saving service log: {e}")
@@ -144,7 +825,7 @@ def get_service_logs(date=None):
         query = {}
         if date:
             query["date"] = date
-        return list(db.cyber.service_logs.find(query, {"_id": 0}).sort("timestamp", -1))
+        return list(db.cyber.service_logs.find(query, {"_id": 0, "search_terms": 0}).sort("timestamp", -1))
     except Exception as e:
         print(f"Error getting service logs: {e}")
         return []
@@ -153,7 +834,7 @@ def update_service_log(log_id, update_data):
     try:
         result = db.cyber.service_logs.update_one(
             {"log_id": log_id}, 
-            {"$set": update_data},
+            [_literal_set(update_data), _search_terms_stage("service_logs")],
             upsert=True
         )
         return (result.modified_count > 0) or (result.matched_count > 0) or (getattr(result, 'upserted_id', None) is not None)
@@ -172,6 +853,7 @@ def delete_service_log(log_id):
 # MongoDB operations for expense logs
 def save_expense_log(expense_data):
     try:
+        expense_data["search_terms"] = search_terms_for(expense_data, SEARCH_FIELDS["expense_logs"])
         db.cyber.expense_logs.insert_one(expense_data)
     except Exception as e:
         print(f"Error saving expense log: {e}")
@@ -181,7 +863,7 @@ def get_expense_logs(date=None):
         query = {}
         if date:
             query["date"] = date
-        return list(db.cyber.expense_logs.find(query, {"_id": 0}).sort("timestamp", -1))
+        return list(db.cyber.expense_logs.find(query, {"_id": 0, "search_terms": 0}).sort("timestamp", -1))
     except Exception as e:
         print(f"Error getting expense logs: {e}")
         return []
@@ -190,7 +872,7 @@ def update_expense_log(log_id, update_data):
     try:
         result = db.cyber.expense_logs.update_one(
             {"log_id": log_id}, 
-            {"$set": update_data},
+            [_literal_set(update_data), _search_terms_stage("expense_logs")],
             upsert=True
         )
         return (result.modified_count > 0) or (result.matched_count > 0) or (getattr(result, 'upserted_id', None) is not None)
@@ -207,11 +889,92 @@ def delete_expense_log(log_id):
         return False
 
 # ==================== USER AUTH HELPERS ====================
+# User documents (without the password hash) are cached for USER_CACHE_TTL
+# seconds so role checks on every admin request and the admin pages do not go
+# back to MongoDB; every helper below that changes a user drops the cache.
+# Whether an owner exists is cached too: it only matters until the first owner
+# is assigned, after which login is a single find_one.
+USER_CACHE_TTL = float(os.getenv("CYBER_USER_CACHE_TTL", "30"))
+USER_CACHE_SIZE = 256
+_PUBLIC_USER_FIELDS = {"_id": 0, "password_hash": 0}
+
+_user_cache_lock = threading.Lock()
+_user_cache = {}
+_users_list_cache = None
+_owner_exists = None
+
+
+def _cached(key):
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+    return None
+
+def _remember(key, value):
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_SIZE:
+            _user_cache.clear()
+        _user_cache[key] = (time.monotonic() + USER_CACHE_TTL, value)
+
+def invalidate_users(owner_changed=False):
+    global _users_list_cache, _owner_exists
+    with _user_cache_lock:
+        _user_cache.clear()
+        _users_list_cache = None
+        if owner_changed:
+            _owner_exists = None
+
+def _public_user(user):
+    user = dict(user)
+    user.pop("_id", None)
+    user.pop("password_hash", None)
+    return user
+
+def owner_exists():
+    global _owner_exists
+    if _owner_exists:
+        return True
+    try:
+        _owner_exists = db.cyber.users.find_one({"role": "owner"}, {"_id": 1}) is not None
+    except Exception as e:
+        print(f"Error checking owner: {e}")
+        return True
+    return _owner_exists
+
+def authenticate(username: str, password: str):
+    """Verify credentials and return the user (no password hash) in one query, or None.
+    While no owner exists, the only user in the system is promoted to owner."""
+    global _owner_exists
+    try:
+        user = db.cyber.users.find_one({"username": username})
+        if not user or not passwords.verify_password(user.get("password_hash", ""), password):
+            return None
+        if passwords.needs_rehash(user.get("password_hash")):
+            # Hashing policy changed since this hash was stored: upgrade it now
+            # that the plain password is known (best effort)
+            try:
+                db.cyber.users.update_one(
+                    {"_id": user["_id"], "password_hash": user.get("password_hash")},
+                    {"$set": {"password_hash": passwords.hash_password(password)}})
+            except Exception as e:
+                print(f"Error rehashing password: {e}")
+        user = _public_user(user)
+        if user.get("role") != "owner" and not owner_exists() and users_count() == 1:
+            if set_user_role(username, "owner"):
+                user["role"] = "owner"
+                _owner_exists = True
+        _remember(username, user)
+        return user
+    except Exception as e:
+        print(f"Error authenticating user: {e}")
+        return None
+
 def create_user(username: str, password: str):
     try:
         if not username or not password:
             return False, "Username and password are required"
-        password_hash = generate_password_hash(password)
+        password_hash = passwords.hash_password(password)
         user_doc = {
             "username": username,
             "password_hash": password_hash,
@@ -219,6 +982,7 @@ def create_user(username: str, password: str):
             "role": "worker",
         }
         db.cyber.users.insert_one(user_doc)
+        invalidate_users()
         return True, None
     except DuplicateKeyError:
         return False, "Username already exists"
@@ -227,21 +991,40 @@ def create_user(username: str, password: str):
         return False, "Internal error"
 
 def get_user_by_username(username: str):
+    user = _cached(username)
+    if user is not None:
+        return dict(user)
     try:
-        return db.cyber.users.find_one({"username": username}, {"_id": 0})
+        user = db.cyber.users.find_one({"username": username}, _PUBLIC_USER_FIELDS)
+        if user:
+            _remember(username, user)
+            return dict(user)
+        return None
     except Exception as e:
         print(f"Error fetching user: {e}")
         return None
 
-def verify_user_credentials(username: str, password: str):
+def get_user_role(username: str):
+    """Current role of `username` (cached), None if the user no longer exists"""
+    return (get_user_by_username(username) or {}).get("role")
+
+def list_users():
+    global _users_list_cache
+    with _user_cache_lock:
+        cached = _users_list_cache
+    if cached and cached[0] > time.monotonic():
+        return [dict(u) for u in cached[1]]
     try:
-        user = db.cyber.users.find_one({"username": username})
-        if not user:
-            return False
-        return check_password_hash(user.get("password_hash", ""), password)
+        users = list(db.cyber.users.find({}, _PUBLIC_USER_FIELDS).sort("username", 1))
+        with _user_cache_lock:
+            _users_list_cache = (time.monotonic() + USER_CACHE_TTL, users)
+        return [dict(u) for u in users]
     except Exception as e:
-        print(f"Error verifying credentials: {e}")
-        return False
+        print(f"Error listing users: {e}")
+        return []
+
+def verify_user_credentials(username: str, password: str):
+    return authenticate(username, password) is not None
 
 def users_count():
     try:
@@ -254,10 +1037,8 @@ def reset_all_users():
         # Drop users collection entirely
         db.cyber.users.drop()
         # Recreate unique index on username
-        try:
-            db.cyber.users.create_index("username", unique=True)
-        except Exception:
-            pass
+        ensure_indexes(["users"])
+        invalidate_users(owner_changed=True)
         return True
     except Exception as e:
         print(f"Error resetting users: {e}")
@@ -266,6 +1047,7 @@ def reset_all_users():
 def set_user_role(username: str, role: str):
     try:
         result = db.cyber.users.update_one({"username": username}, {"$set": {"role": role}})
+        invalidate_users(owner_changed=True)
         return result.modified_count > 0
     except Exception as e:
         print(f"Error setting user role: {e}")
@@ -275,7 +1057,7 @@ def update_user_password(username: str, new_password: str):
     try:
         if not new_password:
             return False
-        password_hash = generate_password_hash(new_password)
+        password_hash = passwords.hash_password(new_password)
         result = db.cyber.users.update_one({"username": username}, {"$set": {"password_hash": password_hash}})
         return result.modified_count > 0
     except Exception as e:
@@ -288,10 +1070,11 @@ def update_user_fields(username: str, role: str | None = None, new_password: str
         if role:
             update_doc["role"] = role
         if new_password:
-            update_doc["password_hash"] = generate_password_hash(new_password)
+            update_doc["password_hash"] = passwords.hash_password(new_password)
         if not update_doc:
             return False
         result = db.cyber.users.update_one({"username": username}, {"$set": update_doc})
+        invalidate_users(owner_changed=bool(role))
         return result.modified_count > 0
     except Exception as e:
         print(f"Error updating user fields: {e}")
@@ -302,9 +1085,10 @@ def rename_user(old_username: str, new_username: str):
         if not new_username:
             return False, "New username required"
         # Ensure unique
-        if db.cyber.users.find_one({"username": new_username}):
+        if db.cyber.users.find_one({"username": new_username}, {"_id": 1}):
             return False, "Username already exists"
         result = db.cyber.users.update_one({"username": old_username}, {"$set": {"username": new_username}})
+        invalidate_users()
         return result.modified_count > 0, None
     except Exception as e:
         print(f"Error renaming user: {e}")
@@ -313,166 +1097,17 @@ def rename_user(old_username: str, new_username: str):
 def delete_user(username: str):
     try:
         result = db.cyber.users.delete_one({"username": username})
+        invalidate_users(owner_changed=True)
         return result.deleted_count > 0
     except Exception as e:
         print(f"Error deleting user: {e}")
         return False
 
-# PDF Report Generation
-def _get_app_base_dir():
-    try:
-        if getattr(sys, 'frozen', False):
-            return os.path.dirname(sys.executable)
-        return os.path.abspath(os.path.dirname(__file__))
-    except Exception:
-        return os.getcwd()
-
-
-def generate_daily_pdf_report(data):
-    try:
-        date_str = data.get("date", datetime.now().strftime("%Y-%m-%d"))
-        base_dir = _get_app_base_dir()
-        reports_dir = os.path.join(base_dir, "reports")
-        os.makedirs(reports_dir, exist_ok=True)
-        filename = os.path.join(reports_dir, f"daily_report_{date_str}.pdf")
-        
-        doc = SimpleDocTemplate(filename, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            textColor=colors.darkblue
-        )
-        story.append(Paragraph(f"Daily Report - {date_str}", title_style))
-        story.append(Spacer(1, 20))
-        
-        # Summary section
-        totals = data.get("totals", {})
-        summary_data = [
-            ['Category', 'Amount (EGP)'],
-            ['PC Sessions', f"{totals.get('pcs', 0):,}"],
-            ['Services', f"{totals.get('services', 0):,}"],
-            ['Expenses', f"{totals.get('expenses', 0):,}"],
-            ['Total Income', f"{totals.get('all', 0):,}"]
-        ]
-        
-        summary_table = Table(summary_data, colWidths=[2*inch, 1.5*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(Paragraph("Daily Summary", styles['Heading2']))
-        story.append(summary_table)
-        story.append(Spacer(1, 20))
-        
-        # PC Sessions details
-        pcs = data.get("pcs", [])
-        if pcs:
-            story.append(Paragraph("PC Sessions", styles['Heading2']))
-            pc_data = [['PC', 'Amount', 'Staff', 'Time']]
-            for pc in pcs:
-                pc_data.append([
-                    pc.get('pc', 'N/A'),
-                    f"{pc.get('amount', 0):,} EGP",
-                    pc.get('staff', 'N/A'),
-                    pc.get('time', 'N/A')
-                ])
-            
-            pc_table = Table(pc_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            pc_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(pc_table)
-            story.append(Spacer(1, 20))
-        
-        # Services details
-        services = data.get("services", [])
-        if services:
-            story.append(Paragraph("Services", styles['Heading2']))
-            service_data = [['Service', 'Amount', 'Staff', 'Time']]
-            for service in services:
-                service_data.append([
-                    service.get('service', 'N/A'),
-                    f"{service.get('amount', 0):,} EGP",
-                    service.get('staff', 'N/A'),
-                    service.get('time', 'N/A')
-                ])
-            
-            service_table = Table(service_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            service_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(service_table)
-            story.append(Spacer(1, 20))
-        
-        # Expenses details
-        expenses = data.get("expenses", [])
-        if expenses:
-            story.append(Paragraph("Expenses", styles['Heading2']))
-            expense_data = [['Expense', 'Amount', 'Staff', 'Time']]
-            for expense in expenses:
-                expense_data.append([
-                    expense.get('name', 'N/A'),
-                    f"{expense.get('amount', 0):,} EGP",
-                    expense.get('staff', 'N/A'),
-                    expense.get('time', 'N/A')
-                ])
-            
-            expense_table = Table(expense_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            expense_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.red),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(expense_table)
-        
-        # Footer
-        story.append(Spacer(1, 30))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,
-            textColor=colors.grey
-        )
-        story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", footer_style))
-        
-        doc.build(story)
-        print(f"PDF report generated: {filename}")
-        return filename
-        
-    except Exception as e:
-        print(f"Error generating PDF report: {e}")
-        return None
+if __name__ == "__main__":
+    # python -m utils.database --index-report
+    if "--index-report" in sys.argv:
+        for name, info in index_report().items():
+            print(f"{name}: {info}")
+    # python -m utils.database --rebuild-rollups
+    if "--rebuild-rollups" in sys.argv:
+        print(f"Rebuilt rollups from {rebuild_rollups()} daily logs")
@@ -0,0 +1,688 @@
+import copy
+import json
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, time, timezone
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# The current day lives in two files:
+#   current_day.json    -> compact snapshot (same layout the app always used)
+#   current_day.journal -> one JSON line per change made since that snapshot
+# A write only appends a line to the journal; the snapshot is rewritten every
+# COMPACT_EVERY journal entries (or on save_data / reset).
+#
+# The bot (main.py) and the web app (app.py) each keep the day in memory and
+# share these files. Every write takes current_day.lock, catches up on the
+# journal tail written by the other process, applies the change and appends it,
+# so no update is lost. Reads only stat the files and replay new lines.
+SNAPSHOT_FILE = "current_day.json"
+COMPACT_EVERY = 200
+# Deleted records are left as tombstones (None) so positions in the id index
+# stay valid; the lists are squeezed once this many have piled up
+TOMBSTONE_LIMIT = 64
+# Set CYBER_VERIFY_AGGREGATES=1 to check the running aggregates against a full
+# recompute after every write (slow, meant for debugging)
+VERIFY_AGGREGATES = os.getenv("CYBER_VERIFY_AGGREGATES", "").lower() in ("1", "true", "yes")
+# How many (version, kind, id) change markers are kept for changes_since()
+CHANGE_LOG_SIZE = 2048
+
+# by_period bucket for records with neither a period nor a readable time
+UNKNOWN_PERIOD = "unknown"
+
+KINDS = ("pcs", "services", "expenses")
+ID_FIELDS = {"pcs": "session_id", "services": "log_id", "expenses": "log_id"}
+
+# Bookkeeping keys stored in the snapshot but never handed to callers.
+# day_id changes only when the day is replaced (save_data / reset), so a
+# reload after the other process merely compacted is not mistaken for a reset.
+INTERNAL_KEYS = ("version", "index", "day_id")
+
+
+class VersionConflict(Exception):
+    """Raised when a compare-and-swap write sees a newer day version.
+    Closing the day relies on it: snapshot_versioned(), then
+    replace(empty_day(), expected_version=version), retried on conflict."""
+
+    def __init__(self, expected, actual):
+        super().__init__(f"Day state changed (expected version {expected}, found {actual})")
+        self.expected = expected
+        self.actual = actual
+
+
+def empty_day():
+    return {
+        "pcs": [],
+        "services": [],
+        "expenses": [],
+        "totals": {"pcs": 0, "services": 0, "expenses": 0, "all": 0},
+        "log_channel_id": None,
+    }
+
+
+def period_at(t):
+    # Morning: 08:00 <= t < 16:00, everything else counts as evening
+    if time(8, 0) <= t < time(16, 0):
+        return 'morning'
+    return 'evening'
+
+
+def record_period(record, default=UNKNOWN_PERIOD):
+    """The record's shift; `default` when it has none and its time cannot be parsed.
+    Aggregates keep the fixed default so recomputing them never moves a record."""
+    if record.get("period"):
+        return record["period"]
+    try:
+        return period_at(datetime.strptime(record.get("time", ""), "%d %b %Y %I:%M %p").time())
+    except (TypeError, ValueError):
+        return default
+
+
+def _bucket():
+    return {"pcs": 0, "services": 0, "expenses": 0, "all": 0}
+
+
+def _net(bucket):
+    return bucket["pcs"] + bucket["services"] - bucket["expenses"]
+
+
+def compute_aggregates(data):
+    """Full recompute of the running aggregates, used to seed and to verify them"""
+    aggs = {
+        "totals": _bucket(),
+        "counts": {kind: 0 for kind in KINDS},
+        "by_staff": {},
+        "by_pc": {},
+        "by_service": {},
+        "by_period": {},
+    }
+    for kind in KINDS:
+        for record in data.get(kind, []):
+            if record is not None:
+                _account(aggs, kind, record, 1)
+    return aggs
+
+
+def _account(aggs, kind, record, sign):
+    amount = sign * int(record.get("amount") or 0)
+    aggs["counts"][kind] += sign
+    for bucket in (
+        aggs["totals"],
+        aggs["by_staff"].setdefault(record.get("staff") or "Unknown", _bucket()),
+        aggs["by_period"].setdefault(record_period(record), _bucket()),
+    ):
+        bucket[kind] += amount
+        bucket["all"] = _net(bucket)
+    if kind == "pcs":
+        pc = record.get("pc") or "Unknown"
+        aggs["by_pc"][pc] = aggs["by_pc"].get(pc, 0) + amount
+    elif kind == "services":
+        name = record.get("service") or "Unknown"
+        aggs["by_service"][name] = aggs["by_service"].get(name, 0) + amount
+
+
+def _prune(value):
+    # Buckets that dropped back to zero after edits/deletes are equivalent to missing ones
+    if not isinstance(value, dict):
+        return value
+    pruned = {k: _prune(v) for k, v in value.items()}
+    return {k: v for k, v in pruned.items() if v}
+
+
+def journal_path_for(snapshot_path):
+    return os.path.splitext(snapshot_path)[0] + ".journal"
+
+
+def lock_path_for(snapshot_path):
+    return os.path.splitext(snapshot_path)[0] + ".lock"
+
+
+class _FileLock:
+    """Exclusive lock on a side file, shared by every process using the day store"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fh = None
+        self._depth = 0
+
+    def acquire(self):
+        # Only ever called while holding the store's thread lock, so the depth counter is safe
+        if self._depth:
+            self._depth += 1
+            return
+        fh = open(self.path, "a+")
+        if os.name == "nt":
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10s; keep waiting for the other process
+                    continue
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        self._fh = fh
+        self._depth = 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth:
+            return
+        fh, self._fh = self._fh, None
+        try:
+            if os.name == "nt":
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+        finally:
+            fh.close()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class DayStore:
+    def __init__(self, snapshot_path=SNAPSHOT_FILE, journal_path=None, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or journal_path_for(snapshot_path)
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._file_lock = _FileLock(lock_path_for(snapshot_path))
+        self._data = None
+        self._aggs = None
+        self._index = {kind: {} for kind in KINDS}
+        self._tombstones = 0
+        self._version = 0
+        self._day_id = None
+        self._journal_len = 0
+        self._journal_offset = 0
+        self._snapshot_sig = None
+        self._listeners = []
+        # (version, kind, id) of recent record changes; versions <= floor are unknown
+        self._change_log = deque()
+        self._change_floor = 0
+
+    # ---------- change notifications ----------
+    def add_listener(self, callback):
+        """callback(change) runs after every change applied in this process, including
+        writes made by other processes once refresh() picks them up. change is
+        {"op", "kind", "id", "record", "version", "totals"}; op "reset" means the
+        whole day was loaded for the first time or replaced. Called under the store
+        lock: keep it short."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, op, kind=None, record=None, record_id=None):
+        if not self._listeners:
+            return
+        if record is not None and kind:
+            record = dict(record)
+            record_id = record_id or record.get(ID_FIELDS[kind])
+        change = {"op": op, "kind": kind, "id": record_id, "record": record,
+                  "version": self._version, "totals": dict(self._aggs["totals"]) if self._aggs else {}}
+        for callback in list(self._listeners):
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"[DayStore] Change listener failed: {e}")
+
+    def _log_change(self, kind, record_id):
+        if kind not in KINDS or not record_id:
+            return
+        if len(self._change_log) >= CHANGE_LOG_SIZE:
+            self._change_floor = self._change_log.popleft()[0]
+        self._change_log.append((self._version, kind, record_id))
+
+    def _forget_changes(self):
+        self._change_log.clear()
+        self._change_floor = self._version
+
+    # ---------- loading ----------
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return empty_day()
+        with open(self.snapshot_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        day = empty_day()
+        day.update(data)
+        return day
+
+    def _read_journal_tail(self):
+        """Entries appended since the last read; stops before a half-written last line"""
+        entries = []
+        if not os.path.exists(self.journal_path):
+            return entries
+        with open(self.journal_path, "rb") as f:
+            f.seek(self._journal_offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        if not end:
+            return entries
+        self._journal_offset += end
+        for line in chunk[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                # A torn line from a crash mid-write; everything around it is intact
+                print(f"[DayStore] Skipping unreadable journal line in {self.journal_path}")
+        return entries
+
+    def _replay(self, entries, notify=True):
+        for entry in entries:
+            v = entry.get("v") or self._version + 1
+            if v <= self._version:
+                # Already folded into the snapshot we loaded
+                continue
+            result = self._apply(entry)
+            self._version = v
+            self._journal_len += 1
+            if result is not None and entry.get("op") in ("add", "update", "delete"):
+                self._log_change(entry.get("kind"), entry.get("id") or result.get(ID_FIELDS[entry["kind"]]))
+            if notify and entry.get("op") in ("add", "update", "delete") and result is not None:
+                self._notify(entry["op"], entry.get("kind"), result, entry.get("id"))
+
+    def _full_load(self):
+        with self._file_lock:
+            self._snapshot_sig = _file_signature(self.snapshot_path)
+            data = self._read_snapshot()
+            version = data.pop("version", 0)
+            day_id = data.pop("day_id", None)
+            saved_index = data.pop("index", None)
+            old_data = self._data
+            # Same day, only compacted by the other process: keep the change log
+            # and report what changed instead of a reset
+            same_day = old_data is not None and day_id == self._day_id and version >= self._version
+            self._version = version
+            self._day_id = day_id
+            if not same_day:
+                self._forget_changes()
+            self._data = data
+            self._load_index(saved_index)
+            self._reset_aggregates()
+            self._journal_offset = 0
+            self._journal_len = 0
+            if same_day:
+                self._diff(old_data)
+                self._replay(self._read_journal_tail())
+            else:
+                self._replay(self._read_journal_tail(), notify=False)
+                self._notify("reset")
+
+    def _diff(self, old_data):
+        """Log and notify the records that differ from `old_data`: changes the other
+        process folded into its snapshot before we read them from the journal"""
+        for kind in KINDS:
+            id_field = ID_FIELDS[kind]
+            old = {r.get(id_field): r for r in old_data.get(kind, []) if r is not None}
+            for record in self._data[kind]:
+                if record is None:
+                    continue
+                record_id = record.get(id_field)
+                previous = old.pop(record_id, None)
+                if previous != record:
+                    self._log_change(kind, record_id)
+                    self._notify("add" if previous is None else "update", kind, record, record_id)
+            for record_id, record in old.items():
+                self._log_change(kind, record_id)
+                self._notify("delete", kind, record, record_id)
+
+    def refresh(self):
+        """Catch up with writes made by other processes"""
+        with self._lock:
+            if self._data is None or _file_signature(self.snapshot_path) != self._snapshot_sig:
+                # First use, or another process compacted/reset the day
+                self._full_load()
+                return
+            sig = _file_signature(self.journal_path)
+            size = sig[1] if sig else 0
+            if size < self._journal_offset:
+                self._full_load()
+            elif size > self._journal_offset:
+                entries = self._read_journal_tail()
+                if _file_signature(self.snapshot_path) != self._snapshot_sig:
+                    # Compacted while we were reading; the tail may belong to the new journal
+                    self._full_load()
+                    return
+                self._replay(entries)
+
+    # ---------- applying changes ----------
+    def _rebuild_index(self):
+        self._index = {}
+        for kind in KINDS:
+            id_field = ID_FIELDS[kind]
+            self._index[kind] = {
+                r[id_field]: i for i, r in enumerate(self._data[kind]) if r is not None and r.get(id_field)
+            }
+
+    def _load_index(self, saved):
+        """Reuse the index stored with the snapshot when it still lines up with the records"""
+        self._tombstones = 0
+        if isinstance(saved, dict) and all(
+            isinstance(saved.get(kind), dict) and len(saved[kind]) == len(self._data[kind]) for kind in KINDS
+        ):
+            self._index = {kind: dict(saved[kind]) for kind in KINDS}
+        else:
+            self._rebuild_index()
+
+    def _find(self, kind, record_id):
+        i = self._index[kind].get(record_id)
+        if i is None:
+            return -1
+        record = self._data[kind][i] if i < len(self._data[kind]) else None
+        if record is None or record.get(ID_FIELDS[kind]) != record_id:
+            # Stale index (hand-edited snapshot?); rebuild once and retry
+            self._rebuild_index()
+            i = self._index[kind].get(record_id)
+            return -1 if i is None else i
+        return i
+
+    def _squeeze_tombstones(self):
+        for kind in KINDS:
+            self._data[kind] = [r for r in self._data[kind] if r is not None]
+        self._rebuild_index()
+        self._tombstones = 0
+
+    def _reset_aggregates(self):
+        self._aggs = compute_aggregates(self._data)
+        # The legacy "totals" key is the same dict, so it is always current
+        self._data["totals"] = self._aggs["totals"]
+
+    def _apply(self, entry):
+        op = entry.get("op")
+        kind = entry.get("kind")
+        if op == "add":
+            record = entry["record"]
+            self._data[kind].append(record)
+            record_id = record.get(ID_FIELDS[kind])
+            if record_id:
+                self._index[kind][record_id] = len(self._data[kind]) - 1
+            _account(self._aggs, kind, record, 1)
+            return record
+        elif op == "update":
+            i = self._find(kind, entry["id"])
+            if i < 0:
+                return None
+            record = self._data[kind][i]
+            _account(self._aggs, kind, record, -1)
+            record.update(entry["fields"])
+            _account(self._aggs, kind, record, 1)
+            return record
+        elif op == "delete":
+            i = self._find(kind, entry["id"])
+            if i < 0:
+                return None
+            removed = self._data[kind][i]
+            self._data[kind][i] = None
+            del self._index[kind][entry["id"]]
+            self._tombstones += 1
+            if self._tombstones >= TOMBSTONE_LIMIT:
+                self._squeeze_tombstones()
+            _account(self._aggs, kind, removed, -1)
+            return removed
+        elif op == "meta":
+            self._data[entry["key"]] = entry["value"]
+        return None
+
+    def _write(self, entry, expected_version=None):
+        return self._write_many([entry], expected_version)[0]
+
+    def _write_many(self, entries, expected_version=None):
+        """Apply entries under one lock and append them to the journal in one write.
+        Each entry keeps its own line and version, so replay is unchanged."""
+        with self._lock, self._file_lock:
+            self.refresh()
+            if expected_version is not None and expected_version != self._version:
+                raise VersionConflict(expected_version, self._version)
+            results, applied, lines = [], [], []
+            for entry in entries:
+                result = self._apply(entry)
+                if entry.get("op") in ("update", "delete") and result is None:
+                    # update/delete of an id that is not in today's ledger changes nothing
+                    results.append(None)
+                    continue
+                self._version += 1
+                entry["v"] = self._version
+                if entry.get("op") != "meta":
+                    self._log_change(entry.get("kind"), entry.get("id") or result.get(ID_FIELDS[entry["kind"]]))
+                lines.append(json.dumps(entry, default=str) + "\n")
+                applied.append((entry, result))
+                results.append(result)
+            if not lines:
+                return results
+            data = "".join(lines).encode("utf-8")
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+            self._journal_offset += len(data)
+            self._journal_len += len(lines)
+            for entry, result in applied:
+                if entry.get("op") != "meta":
+                    self._notify(entry["op"], entry.get("kind"), result, entry.get("id"))
+            if self._journal_len >= self.compact_every:
+                self.compact()
+            if VERIFY_AGGREGATES:
+                self.verify()
+            return results
+
+    # ---------- public API ----------
+    @property
+    def version(self):
+        """Monotonic counter bumped by every change, in any process"""
+        with self._lock:
+            self.refresh()
+            return self._version
+
+    def last_modified(self):
+        """UTC time of the last write to the day files (any process), or None"""
+        with self._lock:
+            self.refresh()
+            stamps = [sig[0] for sig in (self._snapshot_sig, _file_signature(self.journal_path)) if sig]
+            return datetime.fromtimestamp(max(stamps) / 1e9, timezone.utc) if stamps else None
+
+    def changes_since(self, since):
+        """Records added, edited or deleted after version `since`, one entry per record
+        with its current state: {"version", "reset", "changes": [{"kind", "id", "op", "record"}]}.
+        "reset" is True when `since` predates what this process remembers (day replaced
+        or too old); the caller should reload everything."""
+        with self._lock:
+            self.refresh()
+            result = {"version": self._version, "reset": False, "changes": []}
+            if since >= self._version:
+                return result
+            if since < self._change_floor:
+                result["reset"] = True
+                return result
+            touched = {}
+            for v, kind, record_id in self._change_log:
+                if v > since:
+                    touched[(kind, record_id)] = v
+            for (kind, record_id), v in sorted(touched.items(), key=lambda item: item[1]):
+                i = self._find(kind, record_id)
+                if i >= 0:
+                    result["changes"].append({"kind": kind, "id": record_id, "op": "upsert",
+                                              "record": dict(self._data[kind][i]), "version": v})
+                else:
+                    result["changes"].append({"kind": kind, "id": record_id, "op": "delete",
+                                              "record": None, "version": v})
+            return result
+
+    def totals(self):
+        with self._lock:
+            self.refresh()
+            return dict(self._aggs["totals"])
+
+    def aggregates(self):
+        """Running totals by category, staff, PC, service and period, plus record counts"""
+        with self._lock:
+            self.refresh()
+            aggs = copy.deepcopy(self._aggs)
+            aggs["version"] = self._version
+            return aggs
+
+    def verify(self, repair=False):
+        """Compare the running aggregates with a full recompute; returns the mismatching keys"""
+        with self._lock:
+            self.refresh()
+            expected = _prune(compute_aggregates(self._data))
+            actual = _prune(self._aggs)
+            mismatches = sorted(k for k in expected.keys() | actual.keys() if expected.get(k) != actual.get(k))
+            if mismatches:
+                print(f"[DayStore] Aggregates out of sync at version {self._version}: {', '.join(mismatches)}")
+                if repair:
+                    self._reset_aggregates()
+            return mismatches
+
+    def snapshot(self):
+        """Copy of the current day in the classic current_day.json layout"""
+        with self._lock:
+            self.refresh()
+            data = dict(self._data)
+            for kind in KINDS:
+                data[kind] = [dict(r) for r in self._data[kind] if r is not None]
+            data["totals"] = dict(self._data["totals"])
+            return data
+
+    def snapshot_versioned(self):
+        """(snapshot(), version) read together, for a later replace(..., expected_version=version)"""
+        with self._lock:
+            data = self.snapshot()
+            return data, self._version
+
+    def recent(self, kind, limit=5, staff=None):
+        """Last `limit` records of a kind (oldest first), optionally only one staff member's"""
+        with self._lock:
+            self.refresh()
+            found = []
+            for record in reversed(self._data[kind]):
+                if record is None:
+                    continue
+                if staff is None or record.get("staff") == staff:
+                    found.append(dict(record))
+                    if len(found) == limit:
+                        break
+            found.reverse()
+            return found
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            self.refresh()
+            return self._data.get(key, default)
+
+    def get(self, kind, record_id):
+        with self._lock:
+            self.refresh()
+            i = self._find(kind, record_id)
+            return dict(self._data[kind][i]) if i >= 0 else None
+
+    def _new_record(self, kind, record):
+        record = dict(record)
+        id_field = ID_FIELDS[kind]
+        if not record.get(id_field):
+            record[id_field] = str(uuid.uuid4())
+        if not record.get("period"):
+            # Being logged now, so an unreadable time means the current shift
+            record["period"] = record_period(record, period_at(datetime.now().time()))
+        return record
+
+    def add(self, kind, record, expected_version=None):
+        record = self._new_record(kind, record)
+        self._write({"op": "add", "kind": kind, "record": record}, expected_version)
+        return dict(record)
+
+    def add_many(self, kind, records, expected_version=None):
+        """add() for a batch: one lock, one version check and one journal write"""
+        records = [self._new_record(kind, record) for record in records]
+        self._write_many([{"op": "add", "kind": kind, "record": record} for record in records], expected_version)
+        return [dict(record) for record in records]
+
+    def update(self, kind, record_id, fields, expected_version=None):
+        updated = self._write({"op": "update", "kind": kind, "id": record_id, "fields": dict(fields)}, expected_version)
+        return dict(updated) if updated else None
+
+    def delete(self, kind, record_id, expected_version=None):
+        return self._write({"op": "delete", "kind": kind, "id": record_id}, expected_version) is not None
+
+    def set_meta(self, key, value):
+        with self._lock, self._file_lock:
+            self.refresh()
+            if self._data.get(key) == value:
+                return
+            self._write({"op": "meta", "key": key, "value": value})
+
+    def replace(self, data, expected_version=None):
+        """Overwrite the whole day (legacy save_data path) and start a fresh journal"""
+        with self._lock, self._file_lock:
+            self.refresh()
+            if expected_version is not None and expected_version != self._version:
+                raise VersionConflict(expected_version, self._version)
+            day = empty_day()
+            day.update({k: v for k, v in data.items() if k not in INTERNAL_KEYS})
+            self._data = day
+            self._rebuild_index()
+            self._tombstones = 0
+            self._reset_aggregates()
+            self._version += 1
+            self._day_id = uuid.uuid4().hex
+            self._forget_changes()
+            self.compact()
+            self._notify("reset")
+
+    def reset(self):
+        self.replace(empty_day())
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot"""
+        with self._lock, self._file_lock:
+            if self._data is None:
+                self._full_load()
+            if self._tombstones:
+                self._squeeze_tombstones()
+            doc = dict(self._data)
+            doc["version"] = self._version
+            doc["day_id"] = self._day_id
+            doc["index"] = self._index
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(doc, f, indent=4, default=str)
+            os.replace(tmp_path, self.snapshot_path)
+            # Snapshot is durable now, the journal can start over
+            open(self.journal_path, "w", encoding="utf-8").close()
+            self._snapshot_sig = _file_signature(self.snapshot_path)
+            self._journal_offset = 0
+            self._journal_len = 0
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DayStore()
+        return _store
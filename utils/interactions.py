@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Fast-ack pipeline for component / modal interactions.
+# Discord fails an interaction ("This interaction failed") unless it is answered
+# within 3 seconds, while logging a record waits on the day store, Mongo and the
+# log channel. fast_ack() defers right away, runs the work as a background task
+# and reports the outcome with a follow-up (valid for 15 minutes).
+# Each run records how long every stage took; stats() aggregates them per
+# pipeline and slow runs are printed.
+#   async def work(timings):
+#       with interactions.stage(timings, "mongo"):
+#           ...
+#       return {"embed": embed}  # follow-up message kwargs
+#   await interactions.fast_ack(interaction, "pc_log", work)
+ACK_WARN_SECONDS = 2.0  # Discord's hard limit is 3
+SLOW_RUN_SECONDS = 5.0
+SAMPLES = 200
+
+_stats = {}  # pipeline -> {"runs", "failures", "stages": {stage: deque of seconds}}
+_tasks = set()
+
+
+class Timings:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.monotonic()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.monotonic() - start
+
+    def total(self):
+        return time.monotonic() - self.started
+
+    def summary(self):
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.stages.items()]
+        return f"{self.name}: {', '.join(parts)} (total {self.total() * 1000:.0f}ms)"
+
+    def record(self, failed=False):
+        entry = _stats.setdefault(self.name, {"runs": 0, "failures": 0, "stages": {}})
+        entry["runs"] += 1
+        entry["failures"] += int(failed)
+        for name, seconds in list(self.stages.items()) + [("total", self.total())]:
+            entry["stages"].setdefault(name, deque(maxlen=SAMPLES)).append(seconds)
+        if self.total() > SLOW_RUN_SECONDS or self.stages.get("ack", 0) > ACK_WARN_SECONDS:
+            print(f"[Interactions] Slow {self.summary()}")
+
+
+def stage(timings, name):
+    """timings.stage(name), or a no-op when there are no timings to record"""
+    return timings.stage(name) if timings is not None else nullcontext()
+
+
+async def fast_ack(interaction, name, work, timings=None, ephemeral=True):
+    """Defer `interaction` now and follow up with the message work(timings) returns"""
+    timings = timings or Timings(name)
+    with timings.stage("ack"):
+        await interaction.response.defer(ephemeral=ephemeral, with_message=True)
+    task = asyncio.create_task(_finish(interaction, work, timings, ephemeral))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def _finish(interaction, work, timings, ephemeral):
+    failed = False
+    try:
+        message = await work(timings)
+    except Exception as e:
+        failed = True
+        print(f"[Interactions] {timings.name} failed: {e}")
+        message = {"content": f"❌ Something went wrong\nError: ```{e}```"}
+    try:
+        with timings.stage("followup"):
+            await interaction.followup.send(ephemeral=ephemeral, **(message or {"content": "✅ Done"}))
+    except Exception as e:
+        failed = True
+        print(f"[Interactions] {timings.name} follow-up failed: {e}")
+    timings.record(failed)
+
+
+def stats():
+    """{pipeline: {"runs", "failures", "stages": {stage: {"avg", "p95", "max"} in ms}}}"""
+    result = {}
+    for name, entry in list(_stats.items()):
+        stages = {}
+        for stage_name, samples in list(entry["stages"].items()):
+            ordered = sorted(samples)
+            stages[stage_name] = {
+                "avg": round(1000 * sum(ordered) / len(ordered)),
+                "p95": round(1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]),
+                "max": round(1000 * ordered[-1]),
+            }
+        result[name] = {"runs": entry["runs"], "failures": entry["failures"], "stages": stages}
+    return result
@@ -0,0 +1,198 @@
+import os
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from pymongo import ReturnDocument
+
+# Background jobs (day close archive, PDF reports, ...) kept in cyber.jobs.
+# A job is enqueued as "queued"; a worker thread in any process that has a
+# handler for its type claims it atomically (find_one_and_update) and holds a
+# lease while it runs. Failures are retried with exponential backoff up to
+# max_attempts; a job whose worker died is picked up again once its lease runs
+# out. Handlers must therefore be safe to run twice.
+# A job enqueued with held=True is not picked up until release(); discard()
+# drops it instead (e.g. when the state it captured turned out to be stale).
+#   job_id = jobs.enqueue("close_day", {...})
+#   jobs.get(job_id) -> {"status": "held|queued|running|done|failed", "progress": {...}, ...}
+JOB_WORKERS = int(os.getenv("CYBER_JOB_WORKERS", "2"))
+POLL_INTERVAL = 2
+LEASE_SECONDS = 600
+RETRY_BASE_SECONDS = 5
+DEFAULT_MAX_ATTEMPTS = 3
+
+STATUSES = ("held", "queued", "running", "done", "failed")
+
+_handlers = {}
+_wakeup = threading.Event()
+_workers = []
+_workers_lock = threading.Lock()
+_stopping = threading.Event()
+_owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _collection():
+    # Imported lazily: utils.database registers its handlers by importing this module
+    from utils.database import db
+    return db.cyber.jobs
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def register(job_type, handler):
+    """handler(payload, progress) -> result; progress(step, steps, message) records where it is"""
+    _handlers[job_type] = handler
+
+
+def enqueue(job_type, payload=None, max_attempts=DEFAULT_MAX_ATTEMPTS, held=False):
+    now = _now()
+    job_id = str(uuid.uuid4())
+    _collection().insert_one({
+        "_id": job_id,
+        "type": job_type,
+        "payload": payload or {},
+        "status": "held" if held else "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "progress": {"step": 0, "steps": 0, "message": "Queued"},
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "run_after": now,
+        "lease_until": None,
+        "owner": None,
+    })
+    if not held:
+        _wakeup.set()
+    return job_id
+
+
+def release(job_id):
+    """Let workers pick up a job enqueued with held=True"""
+    now = _now()
+    _collection().update_one(
+        {"_id": job_id, "status": "held"},
+        {"$set": {"status": "queued", "run_after": now, "updated_at": now}})
+    _wakeup.set()
+
+
+def discard(job_id):
+    """Delete a job that is still held"""
+    try:
+        _collection().delete_one({"_id": job_id, "status": "held"})
+    except Exception as e:
+        print(f"[Jobs] Error discarding job {job_id}: {e}")
+
+
+def get(job_id, include_payload=False):
+    projection = None if include_payload else {"payload": 0}
+    try:
+        return _collection().find_one({"_id": job_id}, projection)
+    except Exception as e:
+        print(f"[Jobs] Error fetching job {job_id}: {e}")
+        return None
+
+
+def _claim():
+    now = _now()
+    return _collection().find_one_and_update(
+        {
+            "type": {"$in": list(_handlers)},
+            "$or": [
+                {"status": "queued", "run_after": {"$lte": now}},
+                # A worker that died mid-job: its lease ran out
+                {"status": "running", "lease_until": {"$lt": now}},
+            ],
+        },
+        {
+            "$set": {"status": "running", "owner": _owner, "updated_at": now,
+                     "lease_until": now + timedelta(seconds=LEASE_SECONDS)},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+def _finish(job, fields):
+    fields["updated_at"] = _now()
+    _collection().update_one({"_id": job["_id"], "owner": _owner}, {"$set": fields})
+
+
+def _run(job):
+    def progress(step, steps, message=""):
+        _collection().update_one(
+            {"_id": job["_id"], "owner": _owner},
+            {"$set": {"progress": {"step": step, "steps": steps, "message": message},
+                      "updated_at": _now(),
+                      "lease_until": _now() + timedelta(seconds=LEASE_SECONDS)}})
+
+    try:
+        result = _handlers[job["type"]](job.get("payload") or {}, progress)
+        _finish(job, {"status": "done", "result": result, "error": None, "lease_until": None})
+    except Exception as e:
+        traceback.print_exc()
+        attempts = job.get("attempts", 1)
+        if attempts < job.get("max_attempts", DEFAULT_MAX_ATTEMPTS):
+            delay = RETRY_BASE_SECONDS * (2 ** (attempts - 1))
+            _finish(job, {"status": "queued", "error": str(e), "lease_until": None,
+                          "run_after": _now() + timedelta(seconds=delay)})
+        else:
+            _finish(job, {"status": "failed", "error": str(e), "lease_until": None})
+
+
+def _worker_loop():
+    while not _stopping.is_set():
+        try:
+            job = _claim() if _handlers else None
+        except Exception as e:
+            print(f"[Jobs] Error claiming job: {e}")
+            job = None
+        if job is None:
+            _wakeup.wait(POLL_INTERVAL)
+            _wakeup.clear()
+            continue
+        _run(job)
+
+
+def start(workers=None):
+    """Start the worker threads for this process (idempotent)"""
+    with _workers_lock:
+        if _workers:
+            return
+        _stopping.clear()
+        for i in range(workers or JOB_WORKERS):
+            thread = threading.Thread(target=_worker_loop, name=f"cyber-job-{i}", daemon=True)
+            thread.start()
+            _workers.append(thread)
+
+
+def stop(timeout=10):
+    """Let running jobs finish (up to `timeout` seconds each) and stop the workers"""
+    _stopping.set()
+    _wakeup.set()
+    with _workers_lock:
+        for thread in _workers:
+            thread.join(timeout)
+        _workers.clear()
+
+
+def public(job):
+    """JSON-friendly view of a job document"""
+    if not job:
+        return None
+    return {
+        "id": job["_id"],
+        "type": job.get("type"),
+        "status": job.get("status"),
+        "attempts": job.get("attempts", 0),
+        "max_attempts": job.get("max_attempts"),
+        "progress": job.get("progress") or {},
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
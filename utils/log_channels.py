@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime
+import nextcord
+
+# Today's "logs-YYYY-MM-DD" channel per guild.
+# The channel id is cached per guild, and guild.get_channel() on the bot's own
+# channel cache turns it back into a channel without scanning
+# guild.text_channels or calling the API. The scan (and a create, if needed)
+# happens once per guild per day, behind a per-guild asyncio lock, so two logs
+# racing at midnight cannot both create the channel. Deleting or renaming the
+# channel drops it from the cache (see attach()).
+CHANNEL_FORMAT = "logs-%Y-%m-%d"
+
+_cache = {}  # guild id -> (channel name, channel id)
+_locks = {}  # guild id -> asyncio.Lock
+
+
+def today_name():
+    return datetime.now().strftime(CHANNEL_FORMAT)
+
+
+def _cached(guild, name):
+    entry = _cache.get(guild.id)
+    if entry and entry[0] == name:
+        return guild.get_channel(entry[1])
+    return None
+
+
+async def resolve(guild: nextcord.Guild, name: str = None):
+    """Today's log channel for `guild`, created on first use"""
+    name = name or today_name()
+    channel = _cached(guild, name)
+    if channel is not None:
+        return channel
+    lock = _locks.setdefault(guild.id, asyncio.Lock())
+    async with lock:
+        # Whoever held the lock before us may have found or created it already
+        channel = _cached(guild, name)
+        if channel is None:
+            channel = nextcord.utils.get(guild.text_channels, name=name)
+            if channel is None:
+                channel = await guild.create_text_channel(name)
+            _cache[guild.id] = (name, channel.id)
+        return channel
+
+
+def invalidate(guild_id=None, channel_id=None):
+    """Forget the cached channel of one guild (only if it is `channel_id`, when
+    given) or of every guild"""
+    if guild_id is None:
+        _cache.clear()
+        return
+    entry = _cache.get(guild_id)
+    if entry and (channel_id is None or entry[1] == channel_id):
+        del _cache[guild_id]
+
+
+async def on_guild_channel_delete(channel):
+    invalidate(channel.guild.id, channel.id)
+
+
+async def on_guild_channel_update(before, after):
+    if before.name != after.name:
+        invalidate(after.guild.id, after.id)
+
+
+async def on_guild_remove(guild):
+    invalidate(guild.id)
+    _locks.pop(guild.id, None)
+
+
+def attach(bot):
+    """Register the cache invalidation listeners on the bot"""
+    bot.add_listener(on_guild_channel_delete)
+    bot.add_listener(on_guild_channel_update)
+    bot.add_listener(on_guild_remove)
@@ -0,0 +1,194 @@
+import asyncio
+import time
+import nextcord
+
+# Outbound queue for log embeds, one worker per channel.
+# Records that arrive while a send is being prepared or is in flight (or while
+# nextcord sleeps on the channel's rate-limit bucket) go out together in one
+# message of up to MAX_EMBEDS embeds, so a rush costs a few messages instead of
+# one per record. Only one send per channel is in flight at a time, so the
+# channel's bucket is never raced.
+# nextcord keeps the X-RateLimit-* bucket headers to itself and sleeps on them
+# inside channel.send; 429s and 5xx that still reach us are retried here with
+# exponential backoff.
+#   future = post(channel, embed, ("pcs", session_id), view_factory)
+#   stats() -> {channel_id: {"depth": .., "latency_ms": .., ...}}
+MAX_EMBEDS = 10
+BATCH_WINDOW = 0.5  # seconds to wait for more records after the first one
+IDLE_TIMEOUT = 300  # an idle worker exits and is restarted by the next post()
+MAX_RETRIES = 5
+RETRY_BASE_SECONDS = 1
+RETRY_MAX_SECONDS = 30
+LATENCY_SAMPLES = 200
+
+_queues = {}  # channel id -> ChannelQueue
+
+
+class ChannelQueue:
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue = asyncio.Queue()
+        self.worker = None
+        self.carry = None  # item taken off the queue that starts the next message
+        self.sent_messages = 0
+        self.sent_records = 0
+        self.failed_records = 0
+        self.retries = 0
+        self.last_error = None
+        self.latencies = []  # enqueue -> delivered, seconds
+        self.send_times = []  # channel.send duration, seconds
+
+    def ensure_worker(self):
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self._run())
+
+    async def _next_batch(self):
+        if self.carry is not None:
+            first, self.carry = self.carry, None
+        else:
+            first = await asyncio.wait_for(self.queue.get(), IDLE_TIMEOUT)
+        batch = [first]
+        if first["view"] is not None:
+            return batch  # a message with its own components goes out alone
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < MAX_EMBEDS:
+            if not self.queue.empty():
+                item = self.queue.get_nowait()
+            else:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item["view"] is not None or item["view_factory"] is not first["view_factory"]:
+                # Cannot share this message's buttons; it starts the next one
+                self.carry = item
+                break
+            batch.append(item)
+        return batch
+
+    async def _run(self):
+        while True:
+            try:
+                batch = await self._next_batch()
+            except asyncio.TimeoutError:
+                if self.queue.empty() and self.carry is None:
+                    return  # post() starts a new worker when needed
+                continue
+            try:
+                await self._send(batch)
+            except Exception as e:
+                print(f"[LogQueue] Error sending to #{self.channel}: {e}")
+                for item in batch:
+                    if not item["future"].done():
+                        item["future"].set_exception(e)
+
+    async def _send(self, batch):
+        embeds = number_embeds([item["embed"] for item in batch])
+        records = [item["record"] for item in batch]
+        view = batch[0]["view"]
+        if view is None and batch[0]["view_factory"]:
+            view = batch[0]["view_factory"](records)
+        for attempt in range(MAX_RETRIES + 1):
+            start = time.monotonic()
+            try:
+                message = await self.channel.send(embeds=embeds, view=view)
+                break
+            except nextcord.HTTPException as e:
+                # 429 that outlived nextcord's own retries, or a Discord-side error
+                retryable = e.status == 429 or e.status >= 500
+                error = e
+            except (OSError, asyncio.TimeoutError) as e:
+                retryable = True
+                error = e
+            self.last_error = f"{type(error).__name__}: {error}"
+            if not retryable or attempt == MAX_RETRIES:
+                print(f"[LogQueue] Dropping {len(batch)} log messages for #{self.channel}: {self.last_error}")
+                self.failed_records += len(batch)
+                for item in batch:
+                    if not item["future"].done():
+                        item["future"].set_exception(error)
+                return
+            self.retries += 1
+            await asyncio.sleep(min(RETRY_BASE_SECONDS * (2 ** attempt), RETRY_MAX_SECONDS))
+
+        now = time.monotonic()
+        _sample(self.send_times, now - start)
+        self.sent_messages += 1
+        self.sent_records += len(batch)
+        for item in batch:
+            _sample(self.latencies, now - item["queued_at"])
+            if not item["future"].done():
+                item["future"].set_result(message)
+
+    def stats(self):
+        return {
+            "channel": str(self.channel),
+            "depth": self.queue.qsize() + (self.carry is not None),
+            "sent_messages": self.sent_messages,
+            "sent_records": self.sent_records,
+            "failed_records": self.failed_records,
+            "retries": self.retries,
+            "records_per_message": round(self.sent_records / self.sent_messages, 2) if self.sent_messages else 0,
+            "latency_ms": _summary(self.latencies),
+            "send_ms": _summary(self.send_times),
+            "last_error": self.last_error,
+        }
+
+
+def _sample(samples, value):
+    samples.append(value)
+    if len(samples) > LATENCY_SAMPLES:
+        del samples[0]
+
+
+def _summary(samples):
+    if not samples:
+        return {"avg": 0, "p95": 0, "max": 0}
+    ordered = sorted(samples)
+    return {
+        "avg": round(1000 * sum(ordered) / len(ordered)),
+        "p95": round(1000 * ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]),
+        "max": round(1000 * ordered[-1]),
+    }
+
+
+def number_embeds(embeds):
+    """Suffix each embed's footer with its position ("| #2") when there are several"""
+    for i, embed in enumerate(embeds, start=1):
+        text = (embed.footer.text or "").rsplit(" | #", 1)[0]
+        embed.set_footer(text=f"{text} | #{i}" if len(embeds) > 1 else text)
+    return embeds
+
+
+def post(channel, embed, record, view_factory=None, view=None):
+    """Queue `embed` for `channel`. `record` identifies it to view_factory(records),
+    which builds the buttons for a batched message. With a ready-made `view` the
+    embed is sent as a message of its own. Returns a future resolving to the sent
+    message; callers need not await it."""
+    entry = _queues.get(channel.id)
+    if entry is None:
+        entry = _queues[channel.id] = ChannelQueue(channel)
+    future = asyncio.get_running_loop().create_future()
+    # Nobody may await it: mark failures as seen, the worker already logged them
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    entry.queue.put_nowait({
+        "embed": embed,
+        "record": record,
+        "view_factory": view_factory,
+        "view": view,
+        "future": future,
+        "queued_at": time.monotonic(),
+    })
+    entry.ensure_worker()
+    return future
+
+
+def stats():
+    return {channel_id: entry.stats() for channel_id, entry in list(_queues.items())}
+
+
+def depth():
+    return sum(entry.queue.qsize() + (entry.carry is not None) for entry in list(_queues.values()))
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Password hashing runs on a small bounded pool instead of the request thread.
+# hashlib releases the GIL while it hashes, so the pool uses real cores, and
+# at most HASH_WORKERS hashes run at once: a burst of logins at shift change
+# queues here rather than starving every other request of CPU.
+# The policy is werkzeug's default (scrypt) unless CYBER_PASSWORD_METHOD sets a
+# method string, e.g. "pbkdf2:sha256:600000" or "scrypt:32768:8:1". With a
+# configured policy, weaker stored hashes are upgraded on the next successful
+# login (see needs_rehash); a hash is never rewritten under a weaker scheme.
+HASH_METHOD = os.getenv("CYBER_PASSWORD_METHOD") or None
+HASH_WORKERS = int(os.getenv("CYBER_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_TIMEOUT = 30
+
+# Stronger schemes rank higher; hashes are never moved to a lower one
+SCHEME_RANK = {"pbkdf2": 0, "scrypt": 1}
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="cyber-hash")
+_policy_prefix = None
+
+
+def _method_of(password_hash):
+    return (password_hash or "").split("$", 1)[0]
+
+
+def _generate(password, method=None):
+    method = method or HASH_METHOD
+    # werkzeug picks its own default method when none is given
+    return generate_password_hash(password, method=method) if method else generate_password_hash(password)
+
+
+def _strength(method):
+    """(scheme rank, work factor) of a method string, or None when unknown"""
+    parts = method.split(":")
+    try:
+        if parts[0] == "pbkdf2":
+            return SCHEME_RANK["pbkdf2"], int(parts[2])
+        if parts[0] == "scrypt":
+            return SCHEME_RANK["scrypt"], int(parts[1]) * int(parts[2])
+    except (IndexError, ValueError):
+        pass
+    return None
+
+
+def policy_prefix():
+    """Method part of a hash made under the current policy (werkzeug fills in defaults)"""
+    global _policy_prefix
+    if _policy_prefix is None:
+        _policy_prefix = _method_of(_generate("policy"))
+    return _policy_prefix
+
+
+def hash_password(password, method=None):
+    future = _executor.submit(_generate, password, method)
+    return future.result(timeout=HASH_TIMEOUT)
+
+
+def verify_password(password_hash, password):
+    if not password_hash:
+        return False
+    future = _executor.submit(check_password_hash, password_hash, password)
+    return future.result(timeout=HASH_TIMEOUT)
+
+
+def needs_rehash(password_hash):
+    """True when an explicitly configured policy is stronger than the stored hash"""
+    if not HASH_METHOD:
+        return False
+    stored = _strength(_method_of(password_hash))
+    policy = _strength(policy_prefix())
+    return stored is not None and policy is not None and policy > stored
+
+
+# ==================== BENCHMARK ====================
+BENCHMARK_METHODS = (
+    "pbkdf2:sha256:100000",
+    "pbkdf2:sha256:260000",
+    "pbkdf2:sha256:600000",
+    "pbkdf2:sha256:1000000",
+    "scrypt:16384:8:1",
+    "scrypt:32768:8:1",
+)
+
+
+def benchmark(methods=BENCHMARK_METHODS, seconds=2.0):
+    """Hashes per second for each method, single thread and through the pool"""
+    results = []
+    for method in methods:
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            generate_password_hash("benchmark-password", method=method)
+            count += 1
+        single = count / (time.perf_counter() - start)
+
+        batch = max(HASH_WORKERS * 2, int(single * seconds))
+        start = time.perf_counter()
+        futures = [_executor.submit(generate_password_hash, "benchmark-password", method=method)
+                   for _ in range(batch)]
+        for f in futures:
+            f.result()
+        pooled = batch / (time.perf_counter() - start)
+        results.append({"method": method, "single": single, "pool": pooled,
+                        "latency_ms": 1000 / single if single else 0})
+    return results
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        print(f"Current policy: {policy_prefix()} ({HASH_WORKERS} workers)")
+        print(f"{'method':<24}{'hash/s':>10}{'pool hash/s':>14}{'ms/hash':>10}")
+        for row in benchmark():
+            print(f"{row['method']:<24}{row['single']:>10.1f}{row['pool']:>14.1f}{row['latency_ms']:>10.1f}")
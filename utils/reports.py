@@ -0,0 +1,350 @@
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+# PDF rendering for the daily and range reports.
+# Styles are built once per process and shared by every report. Record sections
+# are emitted as LongTables of CHUNK_ROWS rows, each repeating its header row on
+# every page: a single Table of thousands of rows is re-split on every page
+# break, which is what made big days slow and memory-hungry. Reports are written
+# to a temp file in the reports folder and swapped in with os.replace, so a
+# download never sees a half-written PDF.
+CHUNK_ROWS = 200
+COL_WIDTHS = [1.5 * inch] * 4
+
+# section key -> (heading, header row, name field, header colour)
+SECTIONS = (
+    ("pcs", "PC Sessions", ["PC", "Amount", "Staff", "Time"], "pc", colors.lightblue),
+    ("services", "Services", ["Service", "Amount", "Staff", "Time"], "service", colors.orange),
+    ("expenses", "Expenses", ["Expense", "Amount", "Staff", "Time"], "name", colors.red),
+)
+
+_styles = None
+
+
+def _build_styles():
+    sample = getSampleStyleSheet()
+    styles = {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1,  # Center alignment
+            textColor=colors.darkblue
+        ),
+        "heading": sample['Heading2'],
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=sample['Normal'],
+            fontSize=10,
+            alignment=1,
+            textColor=colors.grey
+        ),
+        "summary": TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 14),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+    }
+    for key, _, _, _, header_colour in SECTIONS:
+        styles[key] = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header_colour),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+    return styles
+
+
+def styles():
+    global _styles
+    if _styles is None:
+        _styles = _build_styles()
+    return _styles
+
+
+def reports_dir():
+    """reports/ next to the executable (frozen build) or the project root"""
+    if getattr(sys, 'frozen', False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, "reports")
+
+
+def daily_report_path(date_str):
+    return os.path.join(reports_dir(), f"daily_report_{date_str}.pdf")
+
+
+def range_report_path(date_from, date_to):
+    return os.path.join(reports_dir(), f"report_{date_from}_{date_to}.pdf")
+
+
+def _section_chunks(key, header, name_field, records):
+    """LongTables of at most CHUNK_ROWS records, each with a repeating header row"""
+    style = styles()[key]
+    for start in range(0, len(records), CHUNK_ROWS):
+        rows = [header]
+        for record in records[start:start + CHUNK_ROWS]:
+            rows.append([
+                record.get(name_field, 'N/A'),
+                f"{record.get('amount', 0):,} EGP",
+                record.get('staff', 'N/A'),
+                record.get('time', 'N/A')
+            ])
+        table = LongTable(rows, colWidths=COL_WIDTHS, repeatRows=1)
+        table.setStyle(style)
+        yield table
+
+
+def build_story(data, date_str):
+    s = styles()
+    story = [Paragraph(f"Daily Report - {date_str}", s["title"]), Spacer(1, 20)]
+
+    # Summary section
+    totals = data.get("totals", {})
+    summary_table = Table([
+        ['Category', 'Amount (EGP)'],
+        ['PC Sessions', f"{totals.get('pcs', 0):,}"],
+        ['Services', f"{totals.get('services', 0):,}"],
+        ['Expenses', f"{totals.get('expenses', 0):,}"],
+        ['Total Income', f"{totals.get('all', 0):,}"]
+    ], colWidths=[2*inch, 1.5*inch])
+    summary_table.setStyle(s["summary"])
+    story += [Paragraph("Daily Summary", s["heading"]), summary_table, Spacer(1, 20)]
+
+    # Record sections
+    for key, heading, header, name_field, _ in SECTIONS:
+        records = [r for r in data.get(key, []) if r]
+        if not records:
+            continue
+        story.append(Paragraph(heading, s["heading"]))
+        story.extend(_section_chunks(key, header, name_field, records))
+        story.append(Spacer(1, 20))
+
+    # Footer
+    story.append(Spacer(1, 10))
+    story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", s["footer"]))
+    return story
+
+
+def render_pdf(story, filename):
+    """Build `story` into `filename` via a temp file in the same folder + atomic swap"""
+    folder = os.path.dirname(filename)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".tmp_", suffix=".pdf")
+    os.close(fd)
+    try:
+        SimpleDocTemplate(tmp_path, pagesize=A4).build(story)
+        os.replace(tmp_path, filename)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return filename
+
+
+def generate_daily_pdf_report(data, filename=None):
+    try:
+        date_str = data.get("date", datetime.now().strftime("%Y-%m-%d"))
+        filename = filename or daily_report_path(date_str)
+        render_pdf(build_story(data, date_str), filename)
+        print(f"PDF report generated: {filename}")
+        return filename
+    except Exception as e:
+        print(f"Error generating PDF report: {e}")
+        return None
+
+
+# ==================== RANGE REPORTS ====================
+# Weekly / monthly / arbitrary-range reports are rendered from a rollup report
+# (utils.database.rollup_report): totals and breakdowns only, never raw records.
+def _breakdown_rows(values, label):
+    rows = [[label, "Amount (EGP)"]]
+    for name, amount in sorted(values.items(), key=lambda item: item[1], reverse=True):
+        rows.append([name, f"{amount:,}"])
+    return rows
+
+
+def _staff_rows(by_staff):
+    rows = [["Staff", "PCs", "Services", "Expenses", "Net"]]
+    for name, bucket in sorted(by_staff.items(), key=lambda item: item[1].get("all", 0), reverse=True):
+        rows.append([name] + [f"{bucket.get(k, 0):,}" for k in ("pcs", "services", "expenses", "all")])
+    return rows
+
+
+def _period_rows(periods):
+    rows = [["Period", "Days", "PCs", "Services", "Expenses", "Net"]]
+    for entry in periods:
+        totals = entry.get("totals", {})
+        rows.append([entry.get("start"), entry.get("days", 0)]
+                    + [f"{totals.get(k, 0):,}" for k in ("pcs", "services", "expenses", "all")])
+    return rows
+
+
+def _chunked_table(rows, style, col_widths=None):
+    """Tables with at most CHUNK_ROWS body rows, each repeating the header"""
+    header, body = rows[0], rows[1:]
+    for start in range(0, max(len(body), 1), CHUNK_ROWS):
+        table = LongTable([header] + body[start:start + CHUNK_ROWS], colWidths=col_widths, repeatRows=1)
+        table.setStyle(style)
+        yield table
+
+
+def build_range_story(report):
+    s = styles()
+    totals = report.get("totals", {})
+    counts = report.get("counts", {})
+    title = f"Report {report.get('from')} to {report.get('to')}"
+    story = [Paragraph(title, s["title"]), Spacer(1, 20)]
+
+    summary_table = Table([
+        ['Category', 'Records', 'Amount (EGP)'],
+        ['PC Sessions', f"{counts.get('pcs', 0):,}", f"{totals.get('pcs', 0):,}"],
+        ['Services', f"{counts.get('services', 0):,}", f"{totals.get('services', 0):,}"],
+        ['Expenses', f"{counts.get('expenses', 0):,}", f"{totals.get('expenses', 0):,}"],
+        ['Total Income', '', f"{totals.get('all', 0):,}"]
+    ], colWidths=[2*inch, 1.2*inch, 1.5*inch])
+    summary_table.setStyle(s["summary"])
+    story += [Paragraph(f"Summary ({report.get('days', 0)} days closed)", s["heading"]),
+              summary_table, Spacer(1, 20)]
+
+    sections = (
+        ("Breakdown", _period_rows(report.get("periods", [])), "summary"),
+        ("Staff", _staff_rows(report.get("by_staff", {})), "summary"),
+        ("PCs", _breakdown_rows(report.get("by_pc", {}), "PC"), "pcs"),
+        ("Services", _breakdown_rows(report.get("by_service", {}), "Service"), "services"),
+    )
+    for heading, rows, style_key in sections:
+        if len(rows) < 2:
+            continue
+        story.append(Paragraph(heading, s["heading"]))
+        story.extend(_chunked_table(rows, s[style_key]))
+        story.append(Spacer(1, 20))
+
+    story.append(Spacer(1, 10))
+    story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", s["footer"]))
+    return story
+
+
+def generate_range_pdf_report(report, filename=None):
+    try:
+        filename = filename or range_report_path(report["from"], report["to"])
+        render_pdf(build_range_story(report), filename)
+        return filename
+    except Exception as e:
+        print(f"Error generating range PDF report: {e}")
+        return None
+
+
+# ==================== BENCHMARK ====================
+BENCHMARK_SIZES = (1_000, 10_000, 100_000)
+BENCHMARK_TIMEOUT = 900  # seconds per size
+
+
+def synthetic_day(rows):
+    """A day with `rows` records split 60/30/10 between PCs, services and expenses"""
+    pcs = [{"pc": f"PC {i % 14 + 1}", "amount": 10 + i % 50, "staff": f"staff{i % 5}",
+            "time": "18 Oct 2026 06:30 PM"} for i in range(rows * 6 // 10)]
+    services = [{"service": f"Service {i % 30}", "amount": 5 + i % 20, "staff": f"staff{i % 5}",
+                 "time": "18 Oct 2026 06:30 PM"} for i in range(rows * 3 // 10)]
+    expenses = [{"name": f"Expense {i % 40}", "amount": 1 + i % 10, "staff": f"staff{i % 5}",
+                 "time": "18 Oct 2026 06:30 PM"} for i in range(rows - len(pcs) - len(services))]
+    totals = {"pcs": sum(r["amount"] for r in pcs), "services": sum(r["amount"] for r in services),
+              "expenses": sum(r["amount"] for r in expenses)}
+    totals["all"] = totals["pcs"] + totals["services"] - totals["expenses"]
+    return {"date": "benchmark", "pcs": pcs, "services": services, "expenses": expenses, "totals": totals}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+        except ImportError:
+            return None
+
+
+def _benchmark_one(rows, out_dir, queue):
+    data = synthetic_day(rows)
+    start = time.perf_counter()
+    filename = generate_daily_pdf_report(data, os.path.join(out_dir, f"benchmark_{rows}.pdf"))
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(filename) if filename else 0
+    queue.put((seconds, _peak_rss_mb(), size))
+
+
+def _wait_result(proc, queue, timeout):
+    """The child's result, or None when it died (e.g. OOM-killed) or ran out of time"""
+    import queue as queue_module
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            return queue.get(timeout=1)
+        except queue_module.Empty:
+            if not proc.is_alive():
+                # It may have put its result just before exiting
+                try:
+                    return queue.get(timeout=1)
+                except queue_module.Empty:
+                    return None
+    return None
+
+
+def benchmark(sizes=BENCHMARK_SIZES, timeout=BENCHMARK_TIMEOUT):
+    """Render synthetic days in fresh processes (so peak RSS is per size). A size whose
+    process dies or exceeds `timeout` seconds is reported with an "error" instead."""
+    import multiprocessing
+    results = []
+    with tempfile.TemporaryDirectory() as out_dir:
+        for rows in sizes:
+            queue = multiprocessing.Queue()
+            proc = multiprocessing.Process(target=_benchmark_one, args=(rows, out_dir, queue))
+            proc.start()
+            result = _wait_result(proc, queue, timeout)
+            timed_out = result is None and proc.is_alive()
+            if timed_out:
+                proc.terminate()
+            proc.join()
+            if result is None:
+                error = f"timed out after {timeout}s" if timed_out else f"exited with code {proc.exitcode}"
+                results.append({"rows": rows, "error": error})
+                continue
+            seconds, peak_mb, size = result
+            results.append({"rows": rows, "seconds": seconds, "peak_rss_mb": peak_mb, "pdf_kb": size / 1024})
+    return results
+
+
+if __name__ == "__main__":
+    # python -m utils.reports --benchmark
+    if "--benchmark" in sys.argv:
+        print(f"{'rows':>8}{'seconds':>10}{'peak RSS MB':>14}{'PDF KB':>10}")
+        for row in benchmark():
+            if row.get('error'):
+                print(f"{row['rows']:>8}  failed: {row['error']}")
+                continue
+            peak = f"{row['peak_rss_mb']:.1f}" if row['peak_rss_mb'] is not None else "n/a"
+            print(f"{row['rows']:>8}{row['seconds']:>10.2f}{peak:>14}{row['pdf_kb']:>10.0f}")
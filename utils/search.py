@@ -0,0 +1,123 @@
+import re
+from datetime import datetime
+import utils.database as db
+from utils import day_store
+
+# Search across today's ledger and the archived collections.
+# Every query token must prefix-match a word of the record's name/PC/service or
+# staff (answered by the "search_terms" index), or the whole query is a number
+# equal to the amount (answered by the "amount" index). Each source returns at
+# most MAX_CANDIDATES newest matches, so latency does not grow with history;
+# a page that needed more than that is flagged "truncated".
+DEFAULT_LIMIT = 20
+MAX_CANDIDATES = 500
+
+# record type -> (day store kind, collection, id field, name field)
+SEARCH_TYPES = {
+    "pc_session": ("pcs", "pc_sessions", "session_id", "pc"),
+    "service_log": ("services", "service_logs", "log_id", "service"),
+    "expense_log": ("expenses", "expense_logs", "log_id", "name"),
+}
+
+
+def _tokens(text):
+    return str(text or "").lower().split()
+
+
+def _parse_amount(term):
+    term = term.strip()
+    return int(term) if term.isdigit() else None
+
+
+def _mongo_query(tokens, amount, staff=None):
+    clauses = []
+    if tokens:
+        clauses.append({"$and": [{"search_terms": {"$regex": "^" + re.escape(t)}} for t in tokens]})
+    if amount is not None:
+        clauses.append({"amount": amount})
+    query = {"$or": clauses}
+    if staff:
+        query = {"$and": [query, {"staff": staff}]}
+    return query
+
+
+def _score(record, name_field, tokens, amount):
+    """0 means no match; otherwise higher is better (exact word > prefix, name > staff)"""
+    score = 0
+    if amount is not None and record.get("amount") == amount:
+        score += 3
+    name_terms = _tokens(record.get(name_field))
+    staff_terms = _tokens(record.get("staff"))
+    token_score = 0
+    for token in tokens:
+        if token in name_terms:
+            token_score += 3
+        elif any(t.startswith(token) for t in name_terms):
+            token_score += 2
+        elif token in staff_terms:
+            token_score += 2
+        elif any(t.startswith(token) for t in staff_terms):
+            token_score += 1
+        else:
+            token_score = 0
+            break
+    return score + token_score
+
+
+def _archived_candidates(collection_name, query, limit):
+    try:
+        cursor = (db.db.cyber[collection_name]
+                  .find(query, {"_id": 0, "search_terms": 0})
+                  .sort([("timestamp", -1), ("_id", -1)])
+                  .limit(limit))
+        return list(cursor)
+    except Exception as e:
+        print(f"[Search] Error searching {collection_name}: {e}")
+        return []
+
+
+def search(term, limit=DEFAULT_LIMIT, offset=0, staff=None):
+    """Ranked matches for `term`.
+    Returns {"hits": [{"type", "record", "score", "today"}...] (this page only),
+             "pcs"/"services"/"expenses": records of this page by type, "has_more": bool,
+             "truncated": True when older matches were cut off by MAX_CANDIDATES}"""
+    tokens = _tokens(term)
+    amount = _parse_amount(term)
+    page = {"hits": [], "pcs": [], "services": [], "expenses": [], "has_more": False, "truncated": False}
+    if not tokens:
+        return page
+
+    wanted = min(offset + limit + 1, MAX_CANDIDATES)
+    query = _mongo_query(tokens, amount, staff)
+    today = day_store.get_store().snapshot()
+    now = datetime.now()
+    hits = []
+    for record_type, (kind, collection_name, id_field, name_field) in SEARCH_TYPES.items():
+        seen = set()
+        for record in today.get(kind, []):
+            if staff and record.get("staff") != staff:
+                continue
+            score = _score(record, name_field, tokens, amount)
+            if score:
+                seen.add(record.get(id_field))
+                hits.append({"type": record_type, "record": record, "score": score, "today": True, "ts": now})
+        candidates = _archived_candidates(collection_name, query, wanted)
+        if wanted == MAX_CANDIDATES and len(candidates) == MAX_CANDIDATES:
+            page["truncated"] = True
+        for record in candidates:
+            if record.get(id_field) in seen:
+                # Today's copy is the live one
+                continue
+            score = _score(record, name_field, tokens, amount)
+            if score:
+                ts = record.get("timestamp")
+                hits.append({"type": record_type, "record": record, "score": score, "today": False,
+                             "ts": ts if isinstance(ts, datetime) else datetime.min})
+
+    hits.sort(key=lambda h: (h["score"], h["today"], h["ts"]), reverse=True)
+    page["has_more"] = len(hits) > offset + limit
+    for hit in hits[offset:offset + limit]:
+        hit.pop("ts")
+        page["hits"].append(hit)
+        page[SEARCH_TYPES[hit["type"]][0]].append(hit["record"])
+    return page
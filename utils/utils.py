@@ -1,28 +1,17 @@
-from nextcord import Button, ButtonStyle, SelectOption,Interaction,Embed,TextInputStyle
+from nextcord import ButtonStyle, SelectOption,Interaction,Embed,TextInputStyle
 import nextcord
-from datetime import datetime, time
-import os, json
-import utils.database as db
+from datetime import datetime
+from utils import day_store, async_db, log_channels, log_queue, interactions
 from nextcord.ui import Select,View,Modal,TextInput
 import uuid
 
-DATA_FILE = "current_day.json"
+DATA_FILE = day_store.SNAPSHOT_FILE
 
 def load_data():
-    if not os.path.exists(DATA_FILE):
-        return {
-            "pcs": [],
-            "services": [],
-            "expenses":[],
-            "totals": {"pcs": 0, "services": 0,"expenses":0, "all": 0},
-            "log_channel_id": None,
-        }
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return day_store.get_store().snapshot()
 
 def save_data(data):
-    with open(DATA_FILE, 'w',encoding='utf-8') as f:
-        json.dump(data, f, indent=4)
+    day_store.get_store().replace(data)
 
 class LogEdit(Modal):
     def __init__(self,msg,log_id,log_type,cost,edit_type):
@@ -40,31 +29,22 @@ class LogEdit(Modal):
         cost = self.children[0].value
         if self.log_type == 'pcs':
             try:
-                embed = self.msg.embeds[0]
-                embed.set_field_at(0, name="🖥️ PC", value=self.edit_type, inline=True)         
-                embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
-                embed.set_field_at(2, name='⏳ Time Equivalent',value=cost_to_time(int(cost)),inline=True)
-
-                await self.msg.edit(embed=embed)
+                def apply(embed):
+                    embed.set_field_at(0, name="🖥️ PC", value=self.edit_type, inline=True)
+                    embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
+                    embed.set_field_at(2, name='⏳ Time Equivalent',value=cost_to_time(int(cost)),inline=True)
 
                 # Update MongoDB
                 update_data = {
                     "pc": self.edit_type,
                     "amount": int(cost)
                 }
-                db.update_pc_session(self.log_id, update_data)
+                await async_db.db.update_pc_session(self.log_id, update_data)
 
                 # Update JSON
-                data = load_data()
-                for i, pc in enumerate(data['pcs']):
-                    if pc.get('session_id') == self.log_id:
-                        data['pcs'][i]['pc'] = self.edit_type
-                        data['pcs'][i]['amount'] = int(cost)
-                        break
-                save_data(data)
+                await async_db.store.update('pcs', self.log_id, update_data)
 
-                data['totals']['pcs'], data['totals']['services'],data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-                save_data(data)
+                await update_record_embed(self.msg, self.log_id, apply)
 
                 await interaction.followup.send('Pc Session Edited ✅',ephemeral=True)
             except Exception as e:
@@ -73,30 +53,21 @@ class LogEdit(Modal):
             
         if self.log_type == 'services':
             try:
-                embed = self.msg.embeds[0]
-                embed.set_field_at(0, name="📦 Service", value=self.edit_type, inline=True)         
-                embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
-
-                await self.msg.edit(embed=embed)
+                def apply(embed):
+                    embed.set_field_at(0, name="📦 Service", value=self.edit_type, inline=True)
+                    embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
 
                 # Update MongoDB
                 update_data = {
                     "service": self.edit_type,
                     "amount": int(cost)
                 }
-                db.update_service_log(self.log_id, update_data)
+                await async_db.db.update_service_log(self.log_id, update_data)
 
                 # Update JSON
-                data = load_data()
-                for i, service in enumerate(data['services']):
-                    if service.get('log_id') == self.log_id:
-                        data['services'][i]['service'] = self.edit_type
-                        data['services'][i]['amount'] = int(cost)
-                        break
-                save_data(data)
+                await async_db.store.update('services', self.log_id, update_data)
 
-                data['totals']['pcs'], data['totals']['services'],data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-                save_data(data)
+                await update_record_embed(self.msg, self.log_id, apply)
 
                 await interaction.followup.send('Service Edited ✅',ephemeral=True)
             except Exception as e:
@@ -120,13 +91,12 @@ class PcEdit(Select):
         await interaction.response.send_modal(LogEdit(self.msg,self.log_id,self.log_type,self.cost,pc))
 
 class ServiceEdit(Select):
-    def __init__(self,msg,log_id,log_type,cost):
+    def __init__(self,msg,log_id,log_type,cost,services):
         self.msg = msg
         self.log_id = log_id
         self.log_type = log_type
         self.cost = cost
         
-        services = db.load_services()
         options = []
         for service in services:
             name = service['name']
@@ -170,146 +140,300 @@ class ExpenseEdit(Modal):
             expense = self.children[0].value
             cost = self.children[1].value
 
-            embed = self.msg.embeds[0]
-            embed.set_field_at(0, name="🛍️ Expense", value=expense, inline=True)         
-            embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
-
-            await self.msg.edit(embed=embed)
+            def apply(embed):
+                embed.set_field_at(0, name="🛍️ Expense", value=expense, inline=True)
+                embed.set_field_at(1, name="💰 Amount Paid", value=f"💷 {cost} EGP", inline=True)
 
             # Update MongoDB
             update_data = {
                 "name": expense,
                 "amount": int(cost)
             }
-            db.update_expense_log(self.log_id, update_data)
+            await async_db.db.update_expense_log(self.log_id, update_data)
 
             # Update JSON
-            data = load_data()
-            for i, exp in enumerate(data['expenses']):
-                if exp.get('log_id') == self.log_id:
-                    data['expenses'][i]['name'] = expense
-                    data['expenses'][i]['amount'] = int(cost)
-                    break
-            save_data(data)
-
-            data['totals']['pcs'], data['totals']['services'],data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-            save_data(data)
+            await async_db.store.update('expenses', self.log_id, update_data)
+
+            await update_record_embed(self.msg, self.log_id, apply)
             await interaction.followup.send('Expense Edited ✅',ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"Editing ur message has failed\nError: ```{e}```")
         
-class Edit(View):
-    def __init__(self,log_id,log_type):
+# A log message carries up to log_queue.MAX_EMBEDS records, one embed each,
+# with an Edit / Delete button pair per record. Buttons hold no state: the
+# custom_id "log:<e|d>:<p|s|x>:<uuid hex>" names the action and the record, and
+# on_record_button routes every click from it. No View is kept per message, so
+# bot memory does not grow with the number of logs and old buttons keep
+# working after a restart.
+RECORD_CODES = {'pcs': 'p', 'services': 's', 'expenses': 'x'}
+_CODE_TYPES = {code: log_type for log_type, code in RECORD_CODES.items()}
+# Day store kind -> archive record type (utils.database.RECORD_TYPES)
+ARCHIVE_TYPES = {'pcs': 'pc_session', 'services': 'service_log', 'expenses': 'expense_log'}
+
+# Batch summaries (several PCs in one embed) pick the record from a menu instead:
+# the menu's custom_id is "log:pick:<e|d>" and each option value "<p|s|x>:<uuid hex>"
+PICK_EDIT_ID = "log:pick:e"
+PICK_DELETE_ID = "log:pick:d"
+
+def record_custom_id(action, log_type, log_id):
+    try:
+        log_id = uuid.UUID(log_id).hex
+    except ValueError:
+        pass
+    return f"log:{action}:{RECORD_CODES[log_type]}:{log_id}"
+
+def parse_custom_id(custom_id):
+    """(action, log_type, log_id) of a record button, or None"""
+    parts = (custom_id or "").split(":")
+    if len(parts) != 4 or parts[0] != "log" or parts[1] not in ('e', 'd'):
+        return None
+    _, action, code, log_id = parts
+    # Also accepts the longer "log:e:pcs:<uuid>" ids of earlier messages
+    log_type = _CODE_TYPES.get(code) or (code if code in RECORD_CODES else None)
+    if log_type is None:
+        return None
+    if len(log_id) == 32:
+        try:
+            log_id = str(uuid.UUID(log_id))
+        except ValueError:
+            pass
+    return action, log_type, log_id
+
+def message_records(message):
+    """[(log_type, log_id)] of a log message, in embed order (or menu order for a
+    batch summary)"""
+    records = []
+    for row in message.components:
+        for component in getattr(row, "children", []):
+            custom_id = getattr(component, "custom_id", None) or ""
+            if custom_id == PICK_EDIT_ID:
+                for option in component.options:
+                    parsed = parse_custom_id(f"log:e:{option.value}")
+                    if parsed:
+                        records.append(parsed[1:])
+                continue
+            parsed = parse_custom_id(custom_id)
+            if parsed and parsed[0] == 'e':
+                records.append(parsed[1:])
+    return records
+
+def _is_summary(message):
+    return any(getattr(component, "custom_id", None) == PICK_EDIT_ID
+               for row in message.components for component in getattr(row, "children", []))
+
+def _embed_index(message, log_id):
+    ids = [record_id for _, record_id in message_records(message)]
+    # Messages sent before batching hold a single embed
+    return ids.index(log_id) if log_id in ids else 0
+
+async def resolve_record(log_type, log_id):
+    """The record behind a log button: today's day state first, then the archive"""
+    record = await async_db.store.get(log_type, log_id)
+    if record is None:
+        record = await async_db.db.get_record(ARCHIVE_TYPES[log_type], log_id)
+    return record
+
+async def update_record_embed(msg, log_id, apply):
+    """Run apply(embed) on the record's embed and save the message"""
+    # Re-read it: other records of the same message may have been edited meanwhile
+    msg = await msg.channel.fetch_message(msg.id)
+    if _is_summary(msg):
+        return await refresh_summary(msg)
+    embeds = msg.embeds
+    apply(embeds[_embed_index(msg, log_id)])
+    await msg.edit(embeds=embeds)
+
+async def remove_record_embed(msg, log_id):
+    """Drop the record's embed and buttons; delete the message with its last record"""
+    msg = await msg.channel.fetch_message(msg.id)
+    if _is_summary(msg):
+        return await refresh_summary(msg)
+    records = message_records(msg)
+    if len(records) <= 1:
+        await msg.delete()
+        return
+    index = _embed_index(msg, log_id)
+    embeds = msg.embeds
+    del embeds[index]
+    del records[index]
+    await msg.edit(embeds=log_queue.number_embeds(embeds), view=record_buttons(records))
+
+class RecordButtons(View):
+    def __init__(self, records):
         super().__init__(timeout=None)
-        self.log_id = log_id
-        self.log_type = log_type
-    
-    @nextcord.ui.button(
-        label = 'Edit',
-        custom_id='edit',
-        style=nextcord.ButtonStyle.gray,
-        emoji='✏️'
+        numbered = len(records) > 1
+        # Edit buttons on rows 0-1, Delete buttons on rows 2-3 (5 per row)
+        for action, first_row in (('e', 0), ('d', 2)):
+            for i, (log_type, log_id) in enumerate(records):
+                edit = action == 'e'
+                self.add_item(nextcord.ui.Button(
+                    label=('Edit' if edit else 'Delete') + (f' #{i + 1}' if numbered else ''),
+                    style=ButtonStyle.gray if edit else ButtonStyle.red,
+                    emoji='✏️' if edit else '🗑️',
+                    custom_id=record_custom_id(action, log_type, log_id),
+                    row=first_row + i // 5 if numbered else None
+                ))
+
+def record_buttons(records):
+    """Components for a log message. The view is stopped before it is sent, so
+    nextcord drops it from its view store; clicks go to on_record_button."""
+    view = RecordButtons(records)
+    view.stop()
+    return view
+
+def pc_batch_embed(sessions):
+    """One embed summarising PC sessions logged together"""
+    first = sessions[0]
+    total = sum(int(session.get('amount') or 0) for session in sessions)
+    embed = nextcord.Embed(
+        title=f"💻 {len(sessions)} PC Sessions Logged",
+        description="A batch of sessions has been recorded successfully.",
+        color=nextcord.Color.green()
     )
-    async def edit(self,button : Button,interaction: Interaction):
-        msg = interaction.message
-        cost = msg.embeds[0].fields[1].value
-        try:
-            cost = int(cost[1:(len(cost)-3)])
-        except ValueError as e:
-            print(f'Value Error: {e}')
-
-        if self.log_type == 'pcs':
-            pc_dropdown = View()
-            pc_dropdown.add_item(PcEdit(msg,self.log_id,self.log_type,cost))
-            embed = Embed(
-                title='Pc Session Edit',
-                description='Choose which pc you want to edit the current session',
-                color=0x001DA3
+    for session in sessions:
+        amount = int(session.get('amount') or 0)
+        embed.add_field(name=f"🖥️ {session.get('pc')}", value=f"💷 {amount} EGP\n⏳ {cost_to_time(amount)}", inline=True)
+    embed.add_field(name="💰 Total", value=f"💷 {total} EGP", inline=False)
+    embed.add_field(name="📅 Date", value=first.get('time'), inline=True)
+    if first.get('notes'):
+        embed.add_field(name="📝 Notes", value=first['notes'], inline=True)
+    embed.set_footer(text=f"Logged by: {first.get('staff')} | Leader")
+    return embed
+
+def pc_batch_view(sessions):
+    """Edit / Delete menus for a batch summary (stopped, like record_buttons)"""
+    view = View(timeout=None)
+    for custom_id, placeholder in ((PICK_EDIT_ID, '✏️ Edit a session...'), (PICK_DELETE_ID, '🗑️ Delete a session...')):
+        options = [
+            SelectOption(
+                label=f"{session.get('pc')} · {session.get('amount')} EGP",
+                value=record_custom_id('e', 'pcs', session['session_id']).split(':', 2)[2]
             )
-            for i in range(1,15):
-                embed.add_field(
-                    name=f'💻 PC {i}',
-                    value = ' '
-                )
-            await interaction.response.send_message(embed=embed,view = pc_dropdown,ephemeral=True)
-
-        if self.log_type == 'services':
-            service_dropdown = View()
-            service_dropdown.add_item(ServiceEdit(msg,self.log_id,self.log_type,cost))
-            embed = Embed(
-                title='Service Edit',
-                description='Choose a service to edit for',
-                color=0xFFA500
+            for session in sessions
+        ]
+        view.add_item(Select(custom_id=custom_id, placeholder=placeholder, min_values=1, max_values=1, options=options))
+    view.stop()
+    return view
+
+async def refresh_summary(msg):
+    """Re-render a batch summary from the records it still has"""
+    sessions = []
+    for log_type, log_id in message_records(msg):
+        record = await resolve_record(log_type, log_id)
+        if record is not None:
+            sessions.append(record)
+    if not sessions:
+        await msg.delete()
+        return
+    await msg.edit(embed=pc_batch_embed(sessions), view=pc_batch_view(sessions))
+
+async def on_record_button(interaction: Interaction):
+    """on_interaction listener for the Edit / Delete buttons and menus of log messages"""
+    if interaction.type != nextcord.InteractionType.component:
+        return
+    custom_id = (interaction.data or {}).get("custom_id")
+    if custom_id == 'edit':
+        # Buttons of messages sent before they carried the record id
+        return await interaction.response.send_message("This log is too old to edit from Discord, use the web dashboard ✏️", ephemeral=True)
+    if custom_id in (PICK_EDIT_ID, PICK_DELETE_ID):
+        values = (interaction.data or {}).get("values") or []
+        custom_id = f"log:{custom_id[-1]}:{values[0]}" if values else None
+    parsed = parse_custom_id(custom_id)
+    if parsed is None:
+        return
+    action, log_type, log_id = parsed
+    if action == 'e':
+        await edit_record(interaction, log_type, log_id)
+    else:
+        await delete_record(interaction, log_type, log_id)
+
+async def edit_record(interaction: Interaction, log_type, log_id):
+    msg = interaction.message
+    record = await resolve_record(log_type, log_id)
+    if record is None:
+        return await interaction.response.send_message("This record no longer exists ❌", ephemeral=True)
+    cost = record.get('amount', 0)
+
+    if log_type == 'pcs':
+        pc_dropdown = View()
+        pc_dropdown.add_item(PcEdit(msg,log_id,log_type,cost))
+        embed = Embed(
+            title='Pc Session Edit',
+            description='Choose which pc you want to edit the current session',
+            color=0x001DA3
+        )
+        for i in range(1,15):
+            embed.add_field(
+                name=f'💻 PC {i}',
+                value = ' '
             )
-            await interaction.response.send_message(embed=embed,view=service_dropdown,ephemeral=True)
-
-        if self.log_type == 'expenses':
-            await interaction.response.send_modal(ExpenseEdit(msg,self.log_id,self.log_type))
-
-
-    @nextcord.ui.button(
-        label = "Delete",
-        style = ButtonStyle.red,
-        emoji='🗑️'
-    )
-    async def delete(self,button: Button, interaction: Interaction):
-        await interaction.response.send_message(f"Deleting ur message... 🔃",ephemeral=True)
-        data = load_data()
-        
-        if self.log_type == 'pcs':
-            try:
-                # Delete from MongoDB
-                db.delete_pc_session(self.log_id)
-                
-                # Remove from JSON and update totals
-                data['pcs'] = [pc for pc in data['pcs'] if pc.get('session_id') != self.log_id]
-                data['totals']['pcs'], data['totals']['services'],data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-                save_data(data)
-                
-                await interaction.message.delete()
-                await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
-            except Exception as e:
-                await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
+        await interaction.response.send_message(embed=embed,view = pc_dropdown,ephemeral=True)
+
+    if log_type == 'services':
+        services = await async_db.db.load_services()
+        service_dropdown = View()
+        service_dropdown.add_item(ServiceEdit(msg,log_id,log_type,cost,services))
+        embed = Embed(
+            title='Service Edit',
+            description='Choose a service to edit for',
+            color=0xFFA500
+        )
+        await interaction.response.send_message(embed=embed,view=service_dropdown,ephemeral=True)
+
+    if log_type == 'expenses':
+        await interaction.response.send_modal(ExpenseEdit(msg,log_id,log_type))
+
+async def delete_record(interaction: Interaction, log_type, log_id):
+    await interaction.response.send_message(f"Deleting ur message... 🔃",ephemeral=True)
+    store = async_db.store
+    
+    if log_type == 'pcs':
+        try:
+            # Delete from MongoDB
+            await async_db.db.delete_pc_session(log_id)
+            
+            # Remove from JSON and update totals
+            await store.delete('pcs', log_id)
+            
+            await remove_record_embed(interaction.message, log_id)
+            await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
 
-        if self.log_type == 'services':
-            try:
-                # Delete from MongoDB
-                db.delete_service_log(self.log_id)
-                
-                # Remove from JSON and update totals
-                data['services'] = [s for s in data['services'] if s.get('log_id') != self.log_id]
-                data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-                save_data(data)
-                
-                await interaction.message.delete()
-                await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
-            except Exception as e:
-                await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
-        
-        if self.log_type == 'expenses':
-            try:
-                # Delete from MongoDB
-                db.delete_expense_log(self.log_id)
-                
-                # Remove from JSON and update totals
-                data['expenses'] = [e for e in data['expenses'] if e.get('log_id') != self.log_id]
-                data['totals']['pcs'], data['totals']['services'], data['totals']['expenses'], data['totals']['all'] = calc_totals(data)
-                save_data(data)
-                
-                await interaction.message.delete()
-                await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
-            except Exception as e:
-                await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
+    if log_type == 'services':
+        try:
+            # Delete from MongoDB
+            await async_db.db.delete_service_log(log_id)
+            
+            # Remove from JSON and update totals
+            await store.delete('services', log_id)
+            
+            await remove_record_embed(interaction.message, log_id)
+            await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
+    
+    if log_type == 'expenses':
+        try:
+            # Delete from MongoDB
+            await async_db.db.delete_expense_log(log_id)
+            
+            # Remove from JSON and update totals
+            await store.delete('expenses', log_id)
+            
+            await remove_record_embed(interaction.message, log_id)
+            await interaction.followup.send("Message deleted 🗑️",ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Failed to delete the message\nError: ```{e}```",ephemeral=True)
 
-async def log_session(guild: nextcord.Guild, amount_paid: int, pc_name: str, staff: str = "Yousef",notes: str = None):
+async def log_session(guild: nextcord.Guild, amount_paid: int, pc_name: str, staff: str = "Yousef",notes: str = None, timings=None):
     amount_paid = int(amount_paid)
     today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
-    today_channel = datetime.now().strftime("logs-%Y-%m-%d")
     session_time  = cost_to_time(amount_paid)
     session_id = str(uuid.uuid4())
 
     # Save to JSON (for current day)
-    data = load_data()
+    store = async_db.store
     session_data = {
         "pc": pc_name, 
         "amount": amount_paid, 
@@ -318,9 +442,8 @@ async def log_session(guild: nextcord.Guild, amount_paid: int, pc_name: str, sta
         "notes": notes,
         "session_id": session_id
     }
-    data["pcs"].append(session_data)
-    data["totals"]["pcs"] += amount_paid
-    data["totals"]["all"] = data["totals"]["pcs"] + data["totals"]["services"] - data['totals']['expenses']
+    with interactions.stage(timings, "store"):
+        await store.add("pcs", session_data)
 
     # Save to MongoDB
     mongo_data = {
@@ -334,15 +457,13 @@ async def log_session(guild: nextcord.Guild, amount_paid: int, pc_name: str, sta
         "timestamp": datetime.now(),
         "guild_id": guild.id
     }
-    db.save_pc_session(mongo_data)
+    with interactions.stage(timings, "mongo"):
+        await async_db.db.save_pc_session(mongo_data)
 
     # Find or create the log channel
-    channel = nextcord.utils.get(guild.text_channels, name=today_channel)
-    if channel is None:
-        channel = await guild.create_text_channel(today_channel)
-    data["log_channel_id"] = channel.id
-
-    save_data(data)
+    with interactions.stage(timings, "channel"):
+        channel = await log_channels.resolve(guild)
+        await store.set_meta("log_channel_id", channel.id)
 
     # Embed
     embed = nextcord.Embed(
@@ -358,16 +479,55 @@ async def log_session(guild: nextcord.Guild, amount_paid: int, pc_name: str, sta
         embed.add_field(name="📝 Notes",value=notes,inline=True)
     embed.set_footer(text=f"Logged by: {staff} | Leader")
 
-    await channel.send(embed=embed,view=Edit(session_id, 'pcs'))
+    # Queued: batched with other records and sent in the background
+    log_queue.post(channel, embed, ('pcs', session_id), record_buttons)
 
-async def log_service(guild: nextcord.Guild, amount_paid: int, service_name: str,emoji: str, staff: str = "Yousef"):
+async def log_sessions(guild: nextcord.Guild, amount_paid: int, pc_names: list, staff: str = "Yousef", notes: str = None, timings=None):
+    """log_session() for several PCs at once: one day-state write, one bulk insert
+    and one summary message"""
+    amount_paid = int(amount_paid)
+    now = datetime.now()
+    today_full = now.strftime("%d %b %Y %I:%M %p")
+
+    # Save to JSON (for current day)
+    store = async_db.store
+    sessions = [
+        {
+            "pc": pc_name,
+            "amount": amount_paid,
+            "staff": staff,
+            "time": today_full,
+            "notes": notes,
+            "session_id": str(uuid.uuid4())
+        }
+        for pc_name in pc_names
+    ]
+    with interactions.stage(timings, "store"):
+        await store.add_many("pcs", sessions)
+
+    # Save to MongoDB
+    mongo_data = [
+        dict(session, date=now.strftime("%Y-%m-%d"), timestamp=now, guild_id=guild.id)
+        for session in sessions
+    ]
+    with interactions.stage(timings, "mongo"):
+        await async_db.db.save_pc_sessions(mongo_data)
+
+    with interactions.stage(timings, "channel"):
+        channel = await log_channels.resolve(guild)
+        await store.set_meta("log_channel_id", channel.id)
+
+    # Queued as a message of its own (it carries its own menus)
+    log_queue.post(channel, pc_batch_embed(sessions), None, view=pc_batch_view(sessions))
+    return sessions
+
+async def log_service(guild: nextcord.Guild, amount_paid: int, service_name: str,emoji: str, staff: str = "Yousef", timings=None):
     amount_paid = int(amount_paid)
     today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
-    today_channel = datetime.now().strftime("logs-%Y-%m-%d")
     log_id = str(uuid.uuid4())
 
     # Save to JSON (for current day)
-    data = load_data()
+    store = async_db.store
     service_data = {
         "service": service_name, 
         "amount": amount_paid, 
@@ -375,9 +535,8 @@ async def log_service(guild: nextcord.Guild, amount_paid: int, service_name: str
         "time": today_full,
         "log_id": log_id
     }
-    data["services"].append(service_data)
-    data["totals"]["services"] += amount_paid
-    data["totals"]["all"] = data["totals"]["pcs"] + data["totals"]["services"] - data['totals']['expenses']
+    with interactions.stage(timings, "store"):
+        await store.add("services", service_data)
 
     # Save to MongoDB
     mongo_data = {
@@ -391,15 +550,13 @@ async def log_service(guild: nextcord.Guild, amount_paid: int, service_name: str
         "timestamp": datetime.now(),
         "guild_id": guild.id
     }
-    db.save_service_log(mongo_data)
+    with interactions.stage(timings, "mongo"):
+        await async_db.db.save_service_log(mongo_data)
 
     # Find or create the log channel
-    channel = nextcord.utils.get(guild.text_channels, name=today_channel)
-    if channel is None:
-        channel = await guild.create_text_channel(today_channel)
-    data["log_channel_id"] = channel.id
-
-    save_data(data)
+    with interactions.stage(timings, "channel"):
+        channel = await log_channels.resolve(guild)
+        await store.set_meta("log_channel_id", channel.id)
 
     # Embed
     embed = nextcord.Embed(
@@ -412,16 +569,16 @@ async def log_service(guild: nextcord.Guild, amount_paid: int, service_name: str
     embed.add_field(name="📅 Date", value=today_full, inline=True)
     embed.set_footer(text=f"Logged by: {staff} | Leader")
 
-    await channel.send(embed=embed,view=Edit(log_id,'services'))
+    # Queued: batched with other records and sent in the background
+    log_queue.post(channel, embed, ('services', log_id), record_buttons)
 
-async def log_expense(guild: nextcord.Guild, amount: int, expense_name: str,staff: str = "Yousef"):
+async def log_expense(guild: nextcord.Guild, amount: int, expense_name: str,staff: str = "Yousef", timings=None):
     amount = int(amount)
     today_full = datetime.now().strftime("%d %b %Y %I:%M %p")
-    today_channel = datetime.now().strftime("logs-%Y-%m-%d")
     log_id = str(uuid.uuid4())
     
     # Save to JSON (for current day)
-    data = load_data()
+    store = async_db.store
     expense_data = {
         "name": expense_name,
         "amount": amount,
@@ -429,9 +586,8 @@ async def log_expense(guild: nextcord.Guild, amount: int, expense_name: str,staf
         "time": today_full,
         "log_id": log_id
     }
-    data['expenses'].append(expense_data)
-    data['totals']['expenses'] += amount
-    data['totals']['all'] = data['totals']['pcs'] + data['totals']['services'] - data['totals']['expenses']
+    with interactions.stage(timings, "store"):
+        await store.add("expenses", expense_data)
 
     # Save to MongoDB
     mongo_data = {
@@ -444,15 +600,13 @@ async def log_expense(guild: nextcord.Guild, amount: int, expense_name: str,staf
         "timestamp": datetime.now(),
         "guild_id": guild.id
     }
-    db.save_expense_log(mongo_data)
+    with interactions.stage(timings, "mongo"):
+        await async_db.db.save_expense_log(mongo_data)
 
     # Find or create the log channel
-    channel = nextcord.utils.get(guild.text_channels, name=today_channel)
-    if channel is None:
-        channel = await guild.create_text_channel(today_channel)
-    data["log_channel_id"] = channel.id
-
-    save_data(data)
+    with interactions.stage(timings, "channel"):
+        channel = await log_channels.resolve(guild)
+        await store.set_meta("log_channel_id", channel.id)
 
     # Embed
     embed = nextcord.Embed(
@@ -465,14 +619,15 @@ async def log_expense(guild: nextcord.Guild, amount: int, expense_name: str,staf
     embed.add_field(name="📅 Date", value=today_full, inline=True)
     embed.set_footer(text=f"Logged by: {staff} | Leader")
 
-    await channel.send(embed=embed,view=Edit(log_id,'expenses'))
+    # Queued: batched with other records and sent in the background
+    log_queue.post(channel, embed, ('expenses', log_id), record_buttons)
     
 def get_summary():
-    data = load_data()
+    totals = day_store.get_store().totals()
     return (
-        data["totals"]["pcs"],
-        data["totals"]["services"],
-        data["totals"]["all"]
+        totals["pcs"],
+        totals["services"],
+        totals["all"]
     )
 
 def cost_to_time(cost: int):
@@ -495,12 +650,5 @@ def calc_totals(data):
     return total_pc,total_service,total_expense,(total_pc + total_service - total_expense)
 
 def get_current_period():
-    now = datetime.now().time()
-    morning_start = time(8, 0)
-    evening_start = time(16, 0)
-    midnight = time(0, 0)
-    # Morning: 08:00 <= now < 16:00
-    if morning_start <= now < evening_start:
-        return 'morning'
-    # Evening: 16:00 <= now <= 23:59:59
-    return 'evening'
+    # Morning: 08:00 <= now < 16:00, Evening: 16:00 <= now <= 23:59:59
+    return day_store.period_at(datetime.now().time())